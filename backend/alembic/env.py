@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 from logging.config import fileConfig
 
@@ -23,6 +24,14 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# partitions of a partitioned model table (user_card_progress_p0, ...) are created
+# with it and are not in the metadata: autogenerate must not drop them
+PARTITION_RE = re.compile(r"^user_card_progress_p\d+$")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    return not (type_ == "table" and PARTITION_RE.match(name or ""))
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -32,6 +41,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -50,6 +60,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,47 @@
+"""add local example corpus tables
+
+Revision ID: 3c5e1f7a9b21
+Revises: 0a234b21e55b
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e1f7a9b21'
+down_revision: Union[str, Sequence[str], None] = '0a234b21e55b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('corpus_sentences',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('lang', sa.String(length=8), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_corpus_sentences_text_tsv',
+        'corpus_sentences',
+        [sa.text("to_tsvector('simple', text)")],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.create_table('corpus_links',
+    sa.Column('sentence_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('translation_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.PrimaryKeyConstraint('sentence_id', 'translation_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('corpus_links')
+    op.drop_index('ix_corpus_sentences_text_tsv', table_name='corpus_sentences', postgresql_using='gin')
+    op.drop_table('corpus_sentences')
@@ -0,0 +1,81 @@
+"""partial indexes over active refresh tokens
+
+Revision ID: 5d2e8c1b7a40
+Revises: 3c5e1f7a9b21
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8c1b7a40'
+down_revision: Union[str, Sequence[str], None] = '3c5e1f7a9b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("revoked_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: refresh_tokens is written on every login, do not block it
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_refresh_tokens_active_token_hash',
+            'refresh_tokens',
+            ['token_hash'],
+            unique=False,
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_refresh_tokens_active_user_created',
+            'refresh_tokens',
+            ['user_id', 'created_at'],
+            unique=False,
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_token_hash',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_user_revoked',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_refresh_tokens_user_revoked',
+            'refresh_tokens',
+            ['user_id', 'revoked_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_refresh_tokens_token_hash',
+            'refresh_tokens',
+            ['token_hash'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_active_user_created',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_refresh_tokens_active_token_hash',
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,93 @@
+"""hash-partition user_card_progress by user_id
+
+Revision ID: 8f3a6c2d9e14
+Revises: 5d2e8c1b7a40
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a6c2d9e14'
+down_revision: Union[str, Sequence[str], None] = '5d2e8c1b7a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# models.USER_CARD_PROGRESS_PARTITIONS at the time of this revision
+PARTITIONS = 16
+COLUMNS = "id, user_id, card_id, times_seen, times_correct, last_review, status, stage, due_at"
+
+
+def _create_table(name: str, **kw) -> None:
+    op.create_table(
+        name,
+        sa.Column(
+            'id',
+            sa.Integer(),
+            server_default=sa.text("nextval('user_card_progress_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('card_id', sa.Integer(), nullable=False),
+        sa.Column('times_seen', sa.Integer(), nullable=True),
+        sa.Column('times_correct', sa.Integer(), nullable=True),
+        sa.Column('last_review', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.Enum('new', 'learning', 'mastered', name='progressstatus', native_enum=False), nullable=False),
+        sa.Column('stage', sa.Integer(), nullable=True),
+        sa.Column('due_at', sa.DateTime(), nullable=True),
+        **kw,
+    )
+
+
+def _swap(build_new, primary_key: list[str]) -> None:
+    """Rebuild user_card_progress as ``build_new()`` creates it and copy the rows over.
+
+    The table is locked for the copy, so run this in a maintenance window
+    (``python -m benchmarks.partitioning`` measures it). The rows go in before the
+    indexes and constraints, which are then built once per partition.
+    """
+    op.execute("SET LOCAL maintenance_work_mem = '256MB'")
+    op.rename_table('user_card_progress', 'user_card_progress_old')
+    build_new()
+    op.execute(
+        f"INSERT INTO user_card_progress ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM user_card_progress_old"
+    )
+    # the sequence would be dropped with the table that owns it
+    op.execute("ALTER SEQUENCE user_card_progress_id_seq OWNED BY user_card_progress.id")
+    # frees the index and constraint names
+    op.drop_table('user_card_progress_old')
+
+    op.create_primary_key('user_card_progress_pkey', 'user_card_progress', primary_key)
+    op.create_unique_constraint('uq_user_card_progress_user_card', 'user_card_progress', ['user_id', 'card_id'])
+    op.create_foreign_key('user_card_progress_card_id_fkey', 'user_card_progress', 'cards', ['card_id'], ['id'])
+    op.create_foreign_key('user_card_progress_user_id_fkey', 'user_card_progress', 'users', ['user_id'], ['id'])
+    op.create_index(op.f('ix_user_card_progress_card_id'), 'user_card_progress', ['card_id'], unique=False)
+    op.create_index(op.f('ix_user_card_progress_due_at'), 'user_card_progress', ['due_at'], unique=False)
+    op.create_index(op.f('ix_user_card_progress_id'), 'user_card_progress', ['id'], unique=False)
+    op.create_index('ix_user_card_progress_user_due_at', 'user_card_progress', ['user_id', 'due_at'], unique=False)
+    op.create_index(op.f('ix_user_card_progress_user_id'), 'user_card_progress', ['user_id'], unique=False)
+    op.execute("ANALYZE user_card_progress")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    def build_new() -> None:
+        _create_table('user_card_progress', postgresql_partition_by='HASH (user_id)')
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE user_card_progress_p{remainder} PARTITION OF user_card_progress "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+            )
+
+    # the primary key of a partitioned table must include the partition key
+    _swap(build_new, ['id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap(lambda: _create_table('user_card_progress'), ['id'])
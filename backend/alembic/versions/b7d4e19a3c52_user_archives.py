@@ -0,0 +1,37 @@
+"""user_archives for dormant users' study rows
+
+Revision ID: b7d4e19a3c52
+Revises: 8f3a6c2d9e14
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e19a3c52'
+down_revision: Union[str, Sequence[str], None] = '8f3a6c2d9e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('archived_at', sa.DateTime(), nullable=True))
+    op.create_table('user_archives',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_archives')
+    op.drop_column('users', 'archived_at')
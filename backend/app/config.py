@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     debug: bool = True
 
     database_url: str | None = None
+    # optional streaming replica for read endpoints (deps get_read_db/get_async_read_db)
+    database_replica_url: str | None = None
 
     secret_key: str = "dev-secret-key-change-me"
     refresh_secret_key: str = "dev-refresh-secret-key-change-me"
@@ -21,6 +23,98 @@ class Settings(BaseSettings):
     allowed_hosts: str = "localhost,127.0.0.1,testserver"
     render_external_url: str | None = None
 
+    # connection pools; the sync and the async engine each get one of this size,
+    # per process: size them against the threadpool (40) and Postgres max_connections
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800  # -1 = never
+    # ping on every checkout (one extra round trip); off relies on pool_recycle and
+    # on SQLAlchemy invalidating the pool when a dead connection raises
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 = no limit
+    # after a user's successful write, their reads stay on the primary this long so
+    # they see it despite replica lag; keep it above the lag you expect
+    db_read_your_writes_seconds: float = 5.0
+
+    # rate limiting (slowapi/limits); see core/rate_limit.py
+    rate_limit_storage_uri: str = "memory://"  # e.g. redis://localhost:6379/0 when scaled out
+    # while a shared store is unreachable, count in each process (limits then apply per
+    # worker; logged and counted in rate_limit_storage_fallbacks) instead of failing requests
+    rate_limit_memory_fallback: bool = True
+    rate_limit_strategy: str = "moving-window"
+    rate_limit_auth: str = "1000/minute"  # per IP
+    rate_limit_auto_preview: str = "120/minute"  # per user
+    rate_limit_auto_preview_batch: str = "20/minute"  # per user
+    rate_limit_inbox_bulk: str = "20/minute"  # per user
+
+    # refresh_tokens housekeeping
+    refresh_token_max_active_per_user: int = 10  # older active tokens get revoked; 0 = no cap
+    refresh_token_cleanup_interval_seconds: int = 3600  # 0 = no cleanup loop
+    refresh_token_cleanup_batch_size: int = 1000
+    refresh_token_revoked_retention_days: int = 7  # reuse of these still reads as "revoked"
+
+    # bcrypt cost; stored hashes with another cost are rehashed on the next login
+    password_hash_rounds: int = 12
+    # processes that run bcrypt off the request threads; 0 = hash in the calling thread
+    password_hash_workers: int = 2
+
+    # Prometheus scrape endpoint (GET /metrics); when a token is set, scrapers must
+    # send it as "Authorization: Bearer <token>"
+    metrics_enabled: bool = True
+    metrics_bearer_token: str | None = None
+    # warn when one request runs the same statement (modulo parameters) this often; 0 = off
+    sql_repeated_statement_threshold: int = 10
+    # keep the slowest statements over this many ms for GET /admin/db/slow-queries; 0 = off
+    slow_query_threshold_ms: float = 0
+    slow_query_log_size: int = 50  # distinct statements (fingerprints) kept
+    # also capture EXPLAIN (ANALYZE off) once per fingerprint, on the same connection
+    slow_query_explain: bool = False
+
+    # in-process cache of authenticated users (deps.get_current_user). Changes are dropped
+    # from the cache of the worker that made them only: other workers and nodes may keep
+    # serving a renamed, retargeted or deleted user for up to this long. 0 = off
+    identity_cache_ttl_seconds: int = 15
+    identity_cache_max_entries: int = 10000
+
+    # in-process tier in front of translation_cache / example_sentence_cache
+    content_cache_max_entries: int = 10000
+    content_cache_ttl_seconds: int = 3600
+    content_cache_negative_ttl_seconds: int = 300
+    # write-behind hit counting and pruning of the cache tables
+    content_cache_maintenance_enabled: bool = True
+    content_cache_hit_flush_seconds: int = 30
+    content_cache_prune_interval_seconds: int = 3600
+    content_cache_max_rows: int = 200000  # per table; 0 = unbounded
+    content_cache_max_bytes: int = 0  # per table, live row data; 0 = unbounded
+
+    # external content providers (MyMemory, Tatoeba)
+    mymemory_api_url: str = "https://api.mymemory.translated.net/get"
+    tatoeba_api_url: str = "https://tatoeba.org/en/api_v0/search"
+    content_provider_timeout_seconds: float = 4.0  # one HTTP call
+    content_provider_budget_seconds: float = 6.0  # all provider calls of one request
+    provider_breaker_window: int = 20
+    provider_breaker_min_calls: int = 5
+    provider_breaker_failure_ratio: float = 0.5
+    provider_breaker_slow_call_seconds: float = 2.5
+    provider_breaker_slow_ratio: float = 0.8
+    provider_breaker_open_seconds: float = 30.0
+    # where examples come from: "remote" (Tatoeba API), "prefer_local" (local corpus,
+    # then the API), "local_only" (never call the API)
+    example_corpus_mode: str = "remote"
+    # directory with <src>-<tgt>.fcdict files (app.tools.build_dictionary); consulted
+    # before MyMemory when a file for the pair exists
+    dictionary_dir: str | None = None
+
+    # POST /auto/preview/batch
+    auto_preview_batch_max_items: int = 200
+    auto_preview_batch_concurrency: int = 8
+    auto_preview_batch_deadline_seconds: float = 10.0
+
+    # pre-warming the content caches for library deck fronts
+    library_warmup_concurrency: int = 4
+    library_warmup_on_change: bool = True  # after admins add or edit library cards
+
     model_config = SettingsConfigDict(
         env_file=(".env", ".env.local"),
         case_sensitive=False,
@@ -35,6 +129,29 @@ class Settings(BaseSettings):
             raise ValueError(f"app_env must be one of: {', '.join(sorted(allowed))}")
         return v
 
+    @field_validator("password_hash_rounds")
+    @classmethod
+    def validate_password_hash_rounds(cls, v: int) -> int:
+        if not 4 <= v <= 31:
+            raise ValueError("password_hash_rounds must be between 4 and 31")
+        return v
+
+    @field_validator("rate_limit_strategy")
+    @classmethod
+    def validate_rate_limit_strategy(cls, v: str) -> str:
+        allowed = {"fixed-window", "moving-window", "sliding-window-counter"}
+        if v not in allowed:
+            raise ValueError(f"rate_limit_strategy must be one of: {', '.join(sorted(allowed))}")
+        return v
+
+    @field_validator("example_corpus_mode")
+    @classmethod
+    def validate_example_corpus_mode(cls, v: str) -> str:
+        allowed = {"remote", "prefer_local", "local_only"}
+        if v not in allowed:
+            raise ValueError(f"example_corpus_mode must be one of: {', '.join(sorted(allowed))}")
+        return v
+
     @property
     def cors_origins_list(self) -> list[str]:
         return [x.strip() for x in self.backend_cors_origins.split(",") if x.strip()]
@@ -73,6 +190,28 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL is required")
         return self.normalize_database_url(self.database_url)
 
+    @property
+    def async_database_url(self) -> str:
+        """``resolved_database_url`` for the asyncpg driver."""
+        return self.to_async_url(self.resolved_database_url)
+
+    @property
+    def resolved_replica_url(self) -> str | None:
+        if not self.database_replica_url:
+            return None
+        return self.normalize_database_url(self.database_replica_url)
+
+    @property
+    def async_replica_url(self) -> str | None:
+        url = self.resolved_replica_url
+        return self.to_async_url(url) if url else None
+
+    @staticmethod
+    def to_async_url(url: str) -> str:
+        """``url`` for the asyncpg driver (libpq's sslmode becomes ssl)."""
+        scheme, rest = url.split("://", 1)
+        return f"{scheme.split('+', 1)[0]}+asyncpg://{rest.replace('sslmode=', 'ssl=')}"
+
     @staticmethod
     def normalize_database_url(url: str) -> str:
         if url.startswith("postgres://"):
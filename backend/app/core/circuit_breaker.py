@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for one upstream dependency.
+
+    The last ``window_size`` calls are kept with their outcome and latency. Once
+    at least ``min_calls`` are recorded, the circuit opens when the share of
+    failures reaches ``failure_ratio`` or the share of calls slower than
+    ``slow_call_seconds`` reaches ``slow_ratio``. While open, ``allow()`` is
+    False, so callers fail fast instead of waiting for a timeout. After
+    ``open_seconds`` one probe call is let through (half-open): success closes
+    the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        slow_call_seconds: float = 2.0,
+        slow_ratio: float = 0.8,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_ratio = slow_ratio
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window: deque[tuple[bool, float]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        self._record(True, latency)
+
+    def record_failure(self, latency: float) -> None:
+        self._record(False, latency)
+
+    def release(self) -> None:
+        """The allowed call was abandoned without an outcome (cancelled, cut short)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _record(self, ok: bool, latency: float) -> None:
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            self.calls += 1
+            self.failures += 0 if ok else 1
+            self.slow_calls += 1 if slow else 0
+
+            if self._current_state() == HALF_OPEN:
+                if ok and not slow:
+                    self._state = CLOSED
+                    self._window.clear()
+                else:
+                    self._open()
+                self._probe_in_flight = False
+                return
+
+            self._window.append((ok, latency))
+            if self._state == CLOSED and self._should_open():
+                self._open()
+
+    def _should_open(self) -> bool:
+        n = len(self._window)
+        if n < self.min_calls:
+            return False
+        failed = sum(1 for ok, _ in self._window if not ok)
+        slow = sum(1 for _, latency in self._window if latency >= self.slow_call_seconds)
+        return failed / n >= self.failure_ratio or slow / n >= self.slow_ratio
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._window.clear()
+            self._state = CLOSED
+            self._probe_in_flight = False
+            self.calls = 0
+            self.failures = 0
+            self.slow_calls = 0
+            self.short_circuited = 0
+            self.times_opened = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(latency for _, latency in self._window)
+            n = len(self._window)
+            failed = sum(1 for ok, _ in self._window if not ok)
+            return {
+                "name": self.name,
+                "state": self._current_state(),
+                "calls": self.calls,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "short_circuited": self.short_circuited,
+                "times_opened": self.times_opened,
+                "window_calls": n,
+                "window_error_ratio": (failed / n) if n else 0.0,
+                "window_latency_p50": _percentile(latencies, 0.50),
+                "window_latency_p95": _percentile(latencies, 0.95),
+            }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Hashable
+
+
+class HitCounter:
+    """Write-behind hit accounting.
+
+    Hits are aggregated per key in memory and handed out in one batch by
+    ``drain()``, so the database sees one ``hits = hits + n`` per key per flush
+    instead of one UPDATE per lookup. Lifetime lookup/hit totals feed the
+    hit ratio reported to admins.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self.lookups = 0
+        self.hits = 0
+
+    def record_hit(self, key: Hashable, n: int = 1) -> None:
+        with self._lock:
+            self._pending[key] += n
+            self.lookups += n
+            self.hits += n
+
+    def record_miss(self, n: int = 1) -> None:
+        with self._lock:
+            self.lookups += n
+
+    def drain(self) -> dict[Hashable, int]:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        return dict(pending)
+
+    def restore(self, pending: dict[Hashable, int]) -> None:
+        """Put back hits from a flush that failed, so they are not lost."""
+        with self._lock:
+            self._pending.update(pending)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self.lookups = 0
+            self.hits = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_ratio": (self.hits / self.lookups) if self.lookups else 0.0,
+                "pending_keys": len(self._pending),
+            }
@@ -0,0 +1,199 @@
+"""Prometheus metrics (served on ``/metrics``, see routers/metrics.py).
+
+Requests are labelled by route template (``/api/v1/decks/{deck_id}/cards``), never
+by raw path, so label cardinality stays bounded. Values live in the process: with
+several workers, each one is its own scrape target.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from anyio import to_thread
+from fastapi import Request
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from ..config import settings
+from . import query_recorder
+from .pool_metrics import pool_stats
+from .query_recorder import QueryRecorder
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float("inf")),
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds",
+    "Time spent in SQL statements per request.",
+    ["method", "route"],
+)
+REQUEST_REPEATED_SQL = Counter(
+    "http_request_repeated_sql",
+    "Requests that ran one statement fingerprint at least "
+    "SQL_REPEATED_STATEMENT_THRESHOLD times (likely N+1).",
+    ["method", "route"],
+)
+SQL_STATEMENTS = Counter("db_statements", "SQL statements executed (in and outside requests).")
+SQL_SECONDS = Counter("db_statement_seconds", "Time spent in SQL statements.")
+PROVIDER_SECONDS = Histogram(
+    "content_provider_request_duration_seconds",
+    "External content provider calls (MyMemory, Tatoeba).",
+    ["provider", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 2.5, 4.0, 6.0, 10.0, float("inf")),
+)
+PROVIDER_SHORT_CIRCUITED = Counter(
+    "content_provider_short_circuited",
+    "Provider calls refused by an open circuit breaker.",
+    ["provider"],
+)
+RATE_LIMIT_STORAGE_FALLBACKS = Counter(
+    "rate_limit_storage_fallbacks",
+    "Times the shared rate limit store failed and limits fell back to this process.",
+)
+
+
+# ==============================
+# Requests and SQL
+# ==============================
+
+
+@query_recorder.on_statement
+def _count_statement(conn, statement, parameters, executemany, seconds: float) -> None:
+    SQL_STATEMENTS.inc()
+    SQL_SECONDS.inc(seconds)
+
+
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _flag_repeated_statements(method: str, route: str, recorder: QueryRecorder) -> None:
+    threshold = settings.sql_repeated_statement_threshold
+    if threshold <= 0:
+        return
+    repeated = recorder.repeated(threshold)
+    if not repeated:
+        return
+    REQUEST_REPEATED_SQL.labels(method, route).inc()
+    fp, n = next(iter(repeated.items()))
+    logger.warning(
+        "Possible N+1 in %s %s: %d statements, %d x %.300s", method, route, recorder.count, n, fp
+    )
+
+
+async def record_request_metrics(request: Request, call_next):
+    recorder = QueryRecorder(request)
+    started = time.perf_counter()
+    status = 500
+    try:
+        # the threadpool (sync handlers) and SQLAlchemy's greenlets (async sessions)
+        # run with copies of this context, so they report to the same recorder
+        with query_recorder.recording(recorder):
+            response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = route_template(request)
+        REQUEST_SECONDS.labels(request.method, route, str(status)).observe(
+            time.perf_counter() - started
+        )
+        REQUEST_SQL_STATEMENTS.labels(request.method, route).observe(recorder.count)
+        REQUEST_SQL_SECONDS.labels(request.method, route).observe(recorder.seconds)
+        _flag_repeated_statements(request.method, route, recorder)
+
+
+# ==============================
+# Content providers
+# ==============================
+
+
+def observe_provider_call(provider: str, seconds: float, *, ok: bool) -> None:
+    PROVIDER_SECONDS.labels(provider, "ok" if ok else "error").observe(seconds)
+
+
+def count_short_circuit(provider: str) -> None:
+    PROVIDER_SHORT_CIRCUITED.labels(provider).inc()
+
+
+# ==============================
+# Scrape-time gauges
+# ==============================
+
+
+class _RuntimeCollector:
+    """Connection pools and the threadpool, read when scraped."""
+
+    def describe(self):
+        # keeps register() from calling collect() at import time
+        return []
+
+    def collect(self):
+        from ..database import async_engine, async_replica_engine, engine, replica_engine
+
+        engines = {"primary": engine, "async": async_engine}
+        if replica_engine is not None:
+            engines["replica"] = replica_engine
+        if async_replica_engine is not None:
+            engines["async_replica"] = async_replica_engine
+
+        gauges = {
+            "size": GaugeMetricFamily("db_pool_size", "Pool size.", labels=["pool"]),
+            "checked_out": GaugeMetricFamily(
+                "db_pool_checked_out", "Connections in use.", labels=["pool"]
+            ),
+            "overflow": GaugeMetricFamily(
+                "db_pool_overflow", "Connections open beyond the pool size.", labels=["pool"]
+            ),
+        }
+        counters = {
+            "checkouts": CounterMetricFamily(
+                "db_pool_checkouts", "Connection checkouts.", labels=["pool"]
+            ),
+            "timeouts": CounterMetricFamily(
+                "db_pool_checkout_timeouts", "Checkouts that timed out.", labels=["pool"]
+            ),
+            "wait_seconds_total": CounterMetricFamily(
+                "db_pool_checkout_wait_seconds", "Time spent waiting for a connection.",
+                labels=["pool"],
+            ),
+        }
+        for name, eng in engines.items():
+            stats = pool_stats(eng)
+            for key, family in (*gauges.items(), *counters.items()):
+                if key in stats:
+                    family.add_metric([name], stats[key])
+        yield from gauges.values()
+        yield from counters.values()
+
+        try:
+            # per event loop: only available when scraped from the loop thread
+            limiter = to_thread.current_default_thread_limiter()
+        except Exception:  # anyio's NoCurrentAsyncBackend, "not in event loop thread"
+            return
+        stats = limiter.statistics()
+        yield GaugeMetricFamily(
+            "threadpool_size", "Threads available to sync handlers.", value=limiter.total_tokens
+        )
+        yield GaugeMetricFamily(
+            "threadpool_busy", "Threads running sync handlers.", value=stats.borrowed_tokens
+        )
+        yield GaugeMetricFamily(
+            "threadpool_queue_depth", "Calls waiting for a free thread.", value=stats.tasks_waiting
+        )
+
+
+REGISTRY.register(_RuntimeCollector())
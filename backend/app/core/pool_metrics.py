@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolWaitStats:
+    """How long checkouts waited for a connection: lifetime totals plus
+    percentiles over the last ``window_size`` checkouts."""
+
+    def __init__(self, window_size: int = 1000):
+        self._lock = threading.Lock()
+        self._window: deque[float] = deque(maxlen=window_size)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self._window.append(seconds)
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            window = sorted(self._window)
+            out = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+        def pct(p: float) -> float:
+            return window[min(len(window) - 1, int(len(window) * p))] if window else 0.0
+
+        out.update(wait_p50=pct(0.50), wait_p95=pct(0.95), wait_p99=pct(0.99))
+        return out
+
+
+# pool logging name -> stats; kept outside the pool so engine.dispose() (which
+# replaces the pool object) does not reset them
+_wait_stats: dict[str, PoolWaitStats] = {}
+_wait_stats_lock = threading.Lock()
+
+
+def wait_stats_for(name: str) -> PoolWaitStats:
+    with _wait_stats_lock:
+        return _wait_stats.setdefault(name, PoolWaitStats())
+
+
+class _TimedPoolMixin:
+    """Times ``_do_get``: the part of a checkout that waits for a free connection
+    (or opens an overflow one)."""
+
+    def _do_get(self):
+        stats = wait_stats_for(self.logging_name or "default")
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        stats.record(time.perf_counter() - started)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> dict:
+    """Live occupancy of ``engine``'s pool plus its checkout wait times."""
+    pool = engine.pool
+    out = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        out.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # negative while fewer than ``size`` connections have been opened
+            overflow=max(0, pool.overflow()),
+        )
+    if isinstance(pool, _TimedPoolMixin):
+        out.update(wait_stats_for(pool.logging_name or "default").stats())
+    return out
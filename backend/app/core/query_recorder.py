@@ -0,0 +1,136 @@
+"""Records the SQL statements a unit of work runs (normally one request).
+
+Statements are grouped by fingerprint (literals and bind parameters replaced by
+``?``), so the same query run once per item of a list shows up as one fingerprint
+with a high count: the N+1 pattern.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|\b\d+(?:\.\d+)?\b")
+_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    fp = _STRING_RE.sub("?", statement)
+    fp = _PARAM_RE.sub("?", fp)
+    fp = _LIST_RE.sub("?, ...", fp)
+    return _SPACE_RE.sub(" ", fp).strip()
+
+
+class QueryRecorder:
+    def __init__(self, request=None):
+        self.request = request  # the request being recorded, if any
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        fp = fingerprint(statement)
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.fingerprints[fp] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Fingerprints run at least ``threshold`` times, most frequent first."""
+        with self._lock:
+            return {fp: n for fp, n in self.fingerprints.most_common() if n >= threshold}
+
+    def report(self) -> str:
+        with self._lock:
+            lines = [f"{self.count} statements, {self.seconds * 1000:.1f} ms"]
+            lines += [f"{n:4d}x {fp}" for fp, n in self.fingerprints.most_common()]
+        return "\n".join(lines)
+
+
+# the recorder of the current request (set by core.metrics.record_request_metrics)
+_current: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+# recorders that see every statement in the process, whatever context it runs in
+# (tests: the app runs on TestClient's own thread and event loop)
+_global: list[QueryRecorder] = []
+_global_lock = threading.Lock()
+
+
+def current() -> Optional[QueryRecorder]:
+    return _current.get()
+
+
+@contextmanager
+def recording(recorder: QueryRecorder) -> Iterator[QueryRecorder]:
+    """Record the statements of this context (and of threads/greenlets it spawns)."""
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def capture() -> Iterator[QueryRecorder]:
+    """Record every statement the process runs while the block is active."""
+    recorder = QueryRecorder()
+    with _global_lock:
+        _global.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _global_lock:
+            _global.remove(recorder)
+
+
+# listeners run for every engine: the sync pools, and the async ones through
+# their sync_engine
+_observers = []
+
+
+def on_statement(observer):
+    """Also call ``observer(conn, statement, parameters, executemany, seconds)`` for
+    every finished statement."""
+    _observers.append(observer)
+    return observer
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.record(statement, elapsed)
+    if _global:
+        with _global_lock:
+            recorders = list(_global)
+        for recorder in recorders:
+            recorder.record(statement, elapsed)
+    for observer in _observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
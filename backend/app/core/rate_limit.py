@@ -1,8 +1,14 @@
+import logging
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.config import settings
+from app.core import metrics
+from app.services.security import bearer_user_id
 import uuid
 
+logger = logging.getLogger(__name__)
+
 
 def key_func(request):
     if settings.app_env == "test":
@@ -10,4 +16,57 @@ def key_func(request):
     return get_remote_address(request)
 
 
-limiter = Limiter(key_func=key_func)
\ No newline at end of file
+def user_key(request):
+    """Per-user key for expensive endpoints (many users can share one IP).
+
+    Read straight from the bearer token's ``uid`` claim, before (and without)
+    the user lookup; requests without a valid token fall back to the IP.
+    """
+    if settings.app_env == "test":
+        return str(uuid.uuid4())
+    user_id = bearer_user_id(request.headers.get("authorization", ""))
+    if user_id is not None:
+        return f"user:{user_id}"
+    return get_remote_address(request)
+
+
+class AppLimiter(Limiter):
+    """slowapi's Limiter, reporting when the shared store goes away and comes back.
+
+    slowapi flips ``_storage_dead`` when the store raises (and, with the in-memory
+    fallback, retries against a per-process store) and clears it once the store
+    answers again; both only reach slowapi's own logger.
+    """
+
+    def _check_request_limit(self, request, endpoint_func, in_middleware=True):
+        was_dead = self._storage_dead
+        try:
+            super()._check_request_limit(request, endpoint_func, in_middleware)
+        finally:
+            if self._storage_dead and not was_dead:
+                metrics.RATE_LIMIT_STORAGE_FALLBACKS.inc()
+                logger.error("Rate limit storage unreachable; limits are per process for now")
+            elif was_dead and not self._storage_dead:
+                logger.warning("Rate limit storage recovered")
+
+
+def build_limiter(
+    storage_uri: str, *, strategy: str, memory_fallback: bool = True
+) -> AppLimiter:
+    return AppLimiter(
+        key_func=key_func,
+        storage_uri=storage_uri,
+        strategy=strategy,
+        in_memory_fallback_enabled=memory_fallback and not storage_uri.startswith("memory://"),
+    )
+
+
+# Counters live in RATE_LIMIT_STORAGE_URI: "memory://" is per process, so with
+# several workers or nodes use a shared store, e.g. "redis://host:6379/0". If that
+# store is unreachable, limits fall back to memory (RATE_LIMIT_MEMORY_FALLBACK) and
+# the switch is logged and counted; without the fallback, limited routes fail.
+limiter = build_limiter(
+    settings.rate_limit_storage_uri,
+    strategy=settings.rate_limit_strategy,
+    memory_fallback=settings.rate_limit_memory_fallback,
+)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Request
+
+from ..config import settings
+from ..services.security import bearer_user_id
+from .ttl_cache import MISSING, TTLCache
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# user id -> True while their reads must stay on the primary. Per process: with
+# several workers a user's next read can land on a worker that did not see the
+# write and go to the replica, so this narrows (does not close) the lag window
+# unless requests are pinned to workers.
+_recent_writers = TTLCache(
+    max_size=100_000,
+    ttl_seconds=settings.db_read_your_writes_seconds,
+)
+
+
+def note_write(user_id: int) -> None:
+    _recent_writers.set(user_id, True)
+
+
+def wrote_recently(user_id: Optional[int]) -> bool:
+    return user_id is not None and _recent_writers.peek(user_id) is not MISSING
+
+
+def reset() -> None:
+    _recent_writers.clear()
+
+
+def request_user_id(request: Request) -> Optional[int]:
+    return bearer_user_id(request.headers.get("authorization", ""))
+
+
+def use_replica(request: Request) -> bool:
+    """Whether this request's read session may go to the replica."""
+    return bool(settings.database_replica_url) and not wrote_recently(request_user_id(request))
+
+
+async def track_writes(request: Request, call_next):
+    """Remember who just wrote, so ``use_replica`` keeps them on the primary."""
+    response = await call_next(request)
+    if (
+        settings.database_replica_url
+        and request.method not in SAFE_METHODS
+        and response.status_code < 400
+    ):
+        user_id = request_user_id(request)
+        if user_id is not None:
+            note_write(user_id)
+    return response
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls coming from different threads.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in flight
+    wait and receive the same result (or exception). Nothing is cached afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of ``SingleFlight`` (one event loop per key)."""
+
+    def __init__(self):
+        self._futures: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = self._futures.get(key)
+        if fut is not None and fut.get_loop() is loop:
+            try:
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise
+                # the leader was cancelled, not us: try again
+                return await self.do(key, fn)
+
+        fut = loop.create_future()
+        self._futures[key] = fut
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved: there may be no waiters
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            if self._futures.get(key) is fut:
+                del self._futures[key]
+
+    def in_flight(self) -> int:
+        return len(self._futures)
@@ -0,0 +1,152 @@
+"""The slowest SQL statements of this process (GET /api/v1/admin/db/slow-queries).
+
+Opt-in: statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are grouped by
+fingerprint, and the log keeps the ``SLOW_QUERY_LOG_SIZE`` fingerprints whose
+slowest run was slowest, each with the route and parameters of that run. With
+``SLOW_QUERY_EXPLAIN``, the first slow run of a fingerprint is also planned with
+``EXPLAIN (ANALYZE off)`` on the statement's connection, inside a savepoint, so
+the request's transaction is unaffected even if planning fails.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from ..config import settings
+from . import query_recorder
+from .metrics import route_template
+from .query_recorder import fingerprint
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_CHARS = 4000
+MAX_PARAMETERS_CHARS = 1000
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+# bound parameters whose names contain these are not kept
+SENSITIVE_PARAMETERS = ("password", "token", "secret")
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    parameters: str
+    route: Optional[str]
+    count: int
+    max_ms: float
+    total_ms: float
+    last_seen_at: datetime
+    plan: Any = None
+
+
+class SlowQueryLog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, SlowQuery] = {}
+
+    def record(
+        self, statement: str, parameters: str, route: Optional[str], ms: float
+    ) -> Optional[SlowQuery]:
+        """Count a slow run; returns its entry unless the log is full of slower ones."""
+        fp = fingerprint(statement)
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._entries.get(fp)
+            if entry is None:
+                if len(self._entries) >= settings.slow_query_log_size:
+                    fastest = min(self._entries.values(), key=lambda e: e.max_ms, default=None)
+                    if fastest is None or fastest.max_ms >= ms:
+                        return None
+                    del self._entries[fastest.fingerprint]
+                entry = self._entries[fp] = SlowQuery(
+                    fingerprint=fp,
+                    statement=statement[:MAX_STATEMENT_CHARS],
+                    parameters=parameters,
+                    route=route,
+                    count=0,
+                    max_ms=0.0,
+                    total_ms=0.0,
+                    last_seen_at=now,
+                )
+            entry.count += 1
+            entry.total_ms += ms
+            entry.last_seen_at = now
+            if ms > entry.max_ms:
+                entry.max_ms = ms
+                entry.statement = statement[:MAX_STATEMENT_CHARS]
+                entry.parameters = parameters
+                entry.route = route
+            return entry
+
+    def entries(self) -> list[SlowQuery]:
+        """Snapshot, slowest first."""
+        with self._lock:
+            entries = [replace(e) for e in self._entries.values()]
+        return sorted(entries, key=lambda e: e.max_ms, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _format_parameters(parameters) -> str:
+    if isinstance(parameters, dict):
+        parameters = {
+            k: "***" if any(s in k.lower() for s in SENSITIVE_PARAMETERS) else v
+            for k, v in parameters.items()
+        }
+    return repr(parameters)[:MAX_PARAMETERS_CHARS]
+
+
+def _current_route() -> Optional[str]:
+    recorder = query_recorder.current()
+    if recorder is None or recorder.request is None:
+        return None  # outside a request: startup, background jobs
+    return f"{recorder.request.method} {route_template(recorder.request)}"
+
+
+def _explain(conn, statement: str, parameters) -> Any:
+    if not statement.lstrip().lower().startswith(EXPLAINABLE):
+        return None
+    # a raw DBAPI cursor, so neither the request's recorder nor this hook sees it;
+    # the parameters are already in the driver's format
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0]
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    except Exception:
+        logger.warning("EXPLAIN of a slow query failed", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+    # psycopg2 decodes json columns, asyncpg returns text
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+@query_recorder.on_statement
+def _record_slow_statement(conn, statement, parameters, executemany, seconds: float) -> None:
+    threshold = settings.slow_query_threshold_ms
+    ms = seconds * 1000
+    if threshold <= 0 or ms < threshold:
+        return
+    route = _current_route()
+    entry = slow_query_log.record(statement, _format_parameters(parameters), route, ms)
+    if entry is None:
+        return
+    logger.info("Slow query (%.0f ms) in %s: %.300s", ms, route or "-", entry.fingerprint)
+    if settings.slow_query_explain and entry.plan is None and not executemany:
+        entry.plan = _explain(conn, statement, parameters)
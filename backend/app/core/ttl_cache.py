@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+# Returned by TTLCache.get when nothing (not even a negative entry) is stored.
+MISSING = object()
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache with per-entry expiry.
+
+    A stored ``None`` is a negative entry: "we already asked and there is no value".
+    Negative entries use their own (usually much shorter) TTL.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = (
+            ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        )
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+
+            self._data.move_to_end(key)
+            if value is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return value
+
+    def peek(self, key: Hashable) -> Any:
+        """Like ``get`` but without touching counters or LRU order."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                return MISSING
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = self.negative_ttl_seconds if value is None else self.ttl_seconds
+        if ttl_seconds <= 0:
+            return
+
+        expires_at = self._clock() + ttl_seconds
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def set_negative(self, key: Hashable) -> None:
+        self.set(key, None)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.negative_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": ((self.hits + self.negative_hits) / lookups) if lookups else 0.0,
+            }
@@ -6,10 +6,10 @@ from datetime import date, datetime, timedelta
 from typing import List, Optional
 
 from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.utils.time import bishkek_day_bounds, bishkek_today
-from .deps import is_admin_username
+from app.utils.time import bishkek_day_bounds_utc, bishkek_today
+from . import deps
 
 from . import models, schemas
 
@@ -82,20 +82,20 @@ def generate_unique_username(db: Session, email: str) -> str:
         if not get_user_by_username(db, candidate):
             return candidate
 
+def _owned_pair(db: Session, user_id: int, pair_id: int) -> models.UserLearningPair | None:
+    # by primary key: served from the session's identity map when this request
+    # already loaded the pair, as most progress/study paths do several times
+    pair = db.get(models.UserLearningPair, pair_id)
+    return pair if pair is not None and pair.user_id == user_id else None
+
+
 def get_user_learning_pair(
     db: Session,
     user_id: int,
     pair_id: int | None = None,
 ) -> models.UserLearningPair:
     if pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.id == pair_id,
-                models.UserLearningPair.user_id == user_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             raise ValueError("Learning pair not found")
         return pair
@@ -378,6 +378,25 @@ def get_card_for_library_import(db: Session, library_card_id: int) -> models.Car
         .first()
     )
 
+
+def get_cards_for_library_import(
+    db: Session, library_card_ids: list[int]
+) -> dict[int, models.Card]:
+    """``get_card_for_library_import`` for many ids at once, keyed by id."""
+    if not library_card_ids:
+        return {}
+    cards = (
+        db.query(models.Card)
+        .join(models.Deck, models.Deck.id == models.Card.deck_id)
+        .options(selectinload(models.Card.reading_source))
+        .filter(
+            models.Card.id.in_(set(library_card_ids)),
+            models.Deck.deck_type == models.DeckType.LIBRARY,
+        )
+        .all()
+    )
+    return {card.id: card for card in cards}
+
 def list_library_deck_cards(
     db: Session,
     deck_id: int,
@@ -734,12 +753,31 @@ def card_exists_in_deck(db: Session, deck_id: int, front: str) -> bool:
     )
 
 
+def existing_fronts_in_deck(db: Session, deck_id: int, fronts_norm) -> set[str]:
+    """The normalized fronts among ``fronts_norm`` that ``deck_id`` already has."""
+    fronts_norm = set(fronts_norm)
+    if not fronts_norm:
+        return set()
+    rows = (
+        db.query(models.Card.front_norm)
+        .filter(models.Card.deck_id == deck_id, models.Card.front_norm.in_(fronts_norm))
+        .all()
+    )
+    return {front_norm for (front_norm,) in rows}
+
+
 # ----------------- Cards -----------------
 
 
 def normalize_front(text: str) -> str:
-    # lower, trim, collapse spaces
-    return re.sub(r"\s+", " ", (text or "").strip()).lower()
+    # lower, trim, collapse spaces (str.split() splits on the same whitespace as \s+,
+    # about 3x faster than the regex)
+    return " ".join((text or "").split()).lower()
+
+
+def normalize_fronts(texts) -> list[str]:
+    """``normalize_front`` of each of ``texts``, in order, without a call per text."""
+    return [" ".join((text or "").split()).lower() for text in texts]
 
 
 from app.services import auto_content
@@ -810,11 +848,11 @@ def create_card(
     if access.role not in (models.DeckRole.OWNER, models.DeckRole.EDITOR):
         raise PermissionError("No permission to edit deck")
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    is_admin = user is not None and is_admin_username(user.username)
-
-    if deck.deck_type == models.DeckType.LIBRARY and not is_admin:
-        raise PermissionError("Library decks are read only")
+    if deck.deck_type == models.DeckType.LIBRARY:
+        # identity map: one query per session, not per card
+        user = db.get(models.User, user_id)
+        if user is None or not deps.is_admin_username(user.username):
+            raise PermissionError("Library decks are read only")
     reading_source = _resolve_reading_source_for_deck(
         db,
         user_id=user_id,
@@ -857,22 +895,24 @@ def create_card(
 
     # Auto-fill ONLY if allowed
     if auto_fill:
-        if not (back or "").strip():
-            src_lang = deck.source_language
-            tgt_lang = deck.target_language
-            back = (
-                auto_content.get_translation_with_cache(
-                    db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front_clean
+        # both lookups share one latency budget; an unavailable provider just leaves the field empty
+        with auto_content.provider_budget():
+            if not (back or "").strip():
+                src_lang = deck.source_language
+                tgt_lang = deck.target_language
+                back = (
+                    auto_content.get_translation_with_cache(
+                        db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front_clean
+                    )
+                    or ""
                 )
-                or ""
-            )
 
-        if not (example_sentence or "").strip():
-            src_lang = deck.source_language
-            tgt_lang = deck.target_language
-            example_sentence = auto_content.get_example_with_cache(
-                db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front_clean
-            )
+            if not (example_sentence or "").strip():
+                src_lang = deck.source_language
+                tgt_lang = deck.target_language
+                example_sentence = auto_content.get_example_with_cache(
+                    db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front_clean
+                )
     back_clean = auto_content.clean_text(back)
     example_clean = auto_content.clean_example(example_sentence)
     source_title_clean = auto_content.clean_text(source_title)
@@ -946,7 +986,7 @@ def update_card(
         raise PermissionError("No permission to edit deck")
     
     user = db.query(models.User).filter(models.User.id == user_id).first()
-    is_admin = user is not None and is_admin_username(user.username)
+    is_admin = user is not None and deps.is_admin_username(user.username)
 
     if deck.deck_type == models.DeckType.LIBRARY and not is_admin:
         raise PermissionError('Library decks are read-only')
@@ -1055,7 +1095,7 @@ def delete_card(db: Session, deck_id: int, card_id: int, user_id: int) -> bool:
         raise PermissionError("No permission to edit deck")
     
     user = db.query(models.User).filter(models.User.id == user_id).first()
-    is_admin = user is not None and is_admin_username(user.username)
+    is_admin = user is not None and deps.is_admin_username(user.username)
 
     if deck.deck_type == models.DeckType.LIBRARY and not is_admin:
         raise PermissionError('Library decks are read-only')
@@ -1291,7 +1331,9 @@ def get_due_reviews(
         base_q = base_q.filter(models.Card.reading_source_id == reading_source_id)
 
     total = base_q.count()
-    items = base_q.offset(offset).limit(limit).all()
+    items = (
+        base_q.options(selectinload(models.Card.reading_source)).offset(offset).limit(limit).all()
+    )
 
     return items, total
 
@@ -1342,7 +1384,9 @@ def get_new_cards(
     base_q = base_q.order_by(models.Card.id.asc())
 
     total = base_q.count()
-    items = base_q.offset(offset).limit(limit).all()
+    items = (
+        base_q.options(selectinload(models.Card.reading_source)).offset(offset).limit(limit).all()
+    )
 
     return items, total
 
@@ -1371,7 +1415,7 @@ def count_cards_created_on_day(
     deck_id: int | None = None,
     pair_id: int | None = None,
 ) -> int:
-    start, end = bishkek_day_bounds(d)
+    start, end = bishkek_day_bounds_utc(d)
 
     q = (
         db.query(models.Card)
@@ -1388,14 +1432,7 @@ def count_cards_created_on_day(
         require_deck_access(db, user_id, deck_id)
         q = q.filter(models.Card.deck_id == deck_id)
     elif pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.user_id == user_id,
-                models.UserLearningPair.id == pair_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             return 0
 
@@ -1414,7 +1451,7 @@ def list_cards_created_on_day(
     deck_id: int | None = None,
     limit: int = 50,
 ):
-    start, end = bishkek_day_bounds(d)
+    start, end = bishkek_day_bounds_utc(d)
 
     q = (
         db.query(models.Card)
@@ -1588,14 +1625,7 @@ def count_due_reviews(
     if deck_id is not None:
         q = q.filter(models.Card.deck_id == deck_id)
     elif pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.user_id == user_id,
-                models.UserLearningPair.id == pair_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             return 0
 
@@ -1648,14 +1678,7 @@ def count_new_available(
     if deck_id is not None:
         q = q.filter(models.Card.deck_id == deck_id)
     elif pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.user_id == user_id,
-                models.UserLearningPair.id == pair_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             return 0
 
@@ -1693,14 +1716,7 @@ def get_next_due_at(
     if deck_id is not None:
         q = q.filter(models.Card.deck_id == deck_id)
     elif pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.user_id == user_id,
-                models.UserLearningPair.id == pair_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             return None
 
@@ -1804,14 +1820,7 @@ def count_total_cards(
     if deck_id is not None:
         q = q.filter(models.Card.deck_id == deck_id)
     elif pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.user_id == user_id,
-                models.UserLearningPair.id == pair_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             return 0
 
@@ -1830,23 +1839,22 @@ def count_progress_statuses(
 ) -> dict:
     pair = None
     if deck_id is None and pair_id is not None:
-        pair = (
-            db.query(models.UserLearningPair)
-            .filter(
-                models.UserLearningPair.user_id == user_id,
-                models.UserLearningPair.id == pair_id,
-            )
-            .first()
-        )
+        pair = _owned_pair(db, user_id, pair_id)
         if not pair:
             return {"mastered": 0, "learning": 0, "new": 0}
 
-    # mastered + learning from progress rows
+    # mastered + learning from progress rows. Progress only exists for cards of
+    # accessible decks; joining deck_access says so and keeps the pair variant from
+    # hashing every card of every deck with that language pair.
     q = (
         db.query(models.UserCardProgress.status, func.count(models.UserCardProgress.id))
         .join(models.Card, models.Card.id == models.UserCardProgress.card_id)
         .join(models.Deck, models.Deck.id == models.Card.deck_id)
-        .filter(models.UserCardProgress.user_id == user_id)
+        .join(models.DeckAccess, models.DeckAccess.deck_id == models.Card.deck_id)
+        .filter(
+            models.DeckAccess.user_id == user_id,
+            models.UserCardProgress.user_id == user_id,
+        )
     )
 
     if deck_id is not None:
@@ -1,15 +1,51 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .config import settings
+from .core import read_routing
+from .core.pool_metrics import TimedAsyncQueuePool, TimedQueuePool
 
 DATABASE_URL = settings.resolved_database_url
 
 
-def create_db_engine():
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def create_db_engine(url: str = DATABASE_URL, *, logging_name: str = "primary"):
+    connect_args = {}
+    if settings.db_statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
     return create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,
+        url,
+        poolclass=TimedQueuePool,
+        pool_logging_name=logging_name,
+        connect_args=connect_args,
+        **_pool_options(),
+    )
+
+
+def create_async_db_engine(url: str | None = None, *, logging_name: str = "async", **kwargs):
+    connect_args = {}
+    if settings.db_statement_timeout_ms > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    if "poolclass" not in kwargs:
+        kwargs = {
+            "poolclass": TimedAsyncQueuePool,
+            "pool_logging_name": logging_name,
+            **_pool_options(),
+            **kwargs,
+        }
+    return create_async_engine(
+        url or settings.async_database_url, connect_args=connect_args, **kwargs
     )
 
 
@@ -17,6 +53,44 @@ engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Read-heavy endpoints wait on Postgres without holding a threadpool thread. The
+# services are shared with the sync stack: handlers call them through
+# ``AsyncSession.run_sync``, which runs the sync ORM code on the asyncpg
+# connection (greenlet), not in a thread.
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read endpoints take READ ONLY transactions (a stray write fails instead of
+# going unnoticed) and, when DATABASE_REPLICA_URL is set, run on the replica
+# unless the caller wrote recently (core/read_routing.py). Without a replica
+# they share the primary pools.
+replica_engine = (
+    create_db_engine(settings.resolved_replica_url, logging_name="replica")
+    if settings.resolved_replica_url
+    else None
+)
+async_replica_engine = (
+    create_async_db_engine(settings.async_replica_url, logging_name="async_replica")
+    if settings.async_replica_url
+    else None
+)
+
+
+def _read_only(bind):
+    return bind.execution_options(postgresql_readonly=True)
+
+
+ReadSessionLocal = sessionmaker(autoflush=False, bind=_read_only(engine))
+ReplicaSessionLocal = sessionmaker(
+    autoflush=False, bind=_read_only(replica_engine or engine)
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    _read_only(async_engine), autoflush=False, expire_on_commit=False
+)
+AsyncReplicaSessionLocal = async_sessionmaker(
+    _read_only(async_replica_engine or async_engine), autoflush=False, expire_on_commit=False
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -24,3 +98,25 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: Request):
+    factory = ReplicaSessionLocal if read_routing.use_replica(request) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    factory = (
+        AsyncReplicaSessionLocal if read_routing.use_replica(request) else AsyncReadSessionLocal
+    )
+    async with factory() as db:
+        yield db
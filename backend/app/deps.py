@@ -2,36 +2,56 @@ import os
 
 from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from . import crud
-from .database import get_db
-from .services.security import decode_token
+from .database import get_async_db, get_db
+from .services.identity import CurrentUser, cached_current_user, load_current_user
+from .services.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    username = decode_token(token)
-    if not username:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
-    user = crud.get_user_by_username(db, username)
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> CurrentUser:
+    """The caller as a CurrentUser. Served from the identity cache when possible,
+    so most authenticated requests do not query ``users`` at all."""
+    claims = decode_access_token(token)
+    if not claims:
+        raise _unauthorized("Invalid token")
+
+    user = cached_current_user(claims) or load_current_user(db, claims)
+    if not user:
+        raise _unauthorized("User not found")
+
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> CurrentUser:
+    """``get_current_user`` for handlers on the async session (no threadpool hop)."""
+    claims = decode_access_token(token)
+    if not claims:
+        raise _unauthorized("Invalid token")
+
+    user = cached_current_user(claims) or await db.run_sync(load_current_user, claims)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("User not found")
 
     return user
 
 
-def require_admin(current_user=Depends(get_current_user)):
+def require_admin(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """Very small admin gate.
 
     Set env ADMIN_USERNAMES="admin,alice" (comma-separated).
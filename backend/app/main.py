@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -11,10 +12,19 @@ from slowapi import _rate_limit_exceeded_handler
 from .config import settings
 from .core.exceptions import register_exception_handlers
 from .core.logging_config import setup_logging
+from .core.metrics import record_request_metrics
 from .core.rate_limit import limiter
+from .core.read_routing import track_writes
 from .core.request_logging import log_requests
+from .database import SessionLocal
+from .services import password_hashing
+from .services.cache_maintenance import run_cache_maintenance
+from .services.refresh_tokens import run_refresh_token_cleanup
 from .routers import (
+    admin_cache,
+    admin_db,
     admin_languages,
+    admin_providers,
     auth,
     auto,
     decks,
@@ -22,6 +32,7 @@ from .routers import (
     inbox,
     languages,
     library,
+    metrics,
     progress,
     reading_sources,
     study,
@@ -35,8 +46,20 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Application starting in %s mode", settings.app_env)
+
+    stop = asyncio.Event()
+    background = []
+    if settings.content_cache_maintenance_enabled and not settings.is_test:
+        background.append(asyncio.create_task(run_cache_maintenance(SessionLocal, stop)))
+    if settings.refresh_token_cleanup_interval_seconds > 0 and not settings.is_test:
+        background.append(asyncio.create_task(run_refresh_token_cleanup(SessionLocal, stop)))
+
     yield
+
     logger.info("Application shutting down")
+    stop.set()
+    await asyncio.gather(*background)
+    password_hashing.shutdown_pool()
 
 
 app = FastAPI(title="Flashcards API", lifespan=lifespan)
@@ -60,13 +83,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(record_request_metrics)
+app.middleware("http")(track_writes)
 app.middleware("http")(log_requests)
 
 API_V1_PREFIX = "/api/v1"
 
+if settings.metrics_enabled:
+    # at the root, where scrapers look by default
+    app.include_router(metrics.router)
+
 app.include_router(health.router, prefix=API_V1_PREFIX)
 app.include_router(auth.router, prefix=API_V1_PREFIX)
 app.include_router(admin_languages.router, prefix=API_V1_PREFIX)
+app.include_router(admin_cache.router, prefix=API_V1_PREFIX)
+app.include_router(admin_db.router, prefix=API_V1_PREFIX)
+app.include_router(admin_providers.router, prefix=API_V1_PREFIX)
 app.include_router(users.router, prefix=API_V1_PREFIX)
 app.include_router(languages.router, prefix=API_V1_PREFIX)
 app.include_router(inbox.router, prefix=API_V1_PREFIX)
@@ -12,10 +12,13 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
+    literal_column,
 )
 from sqlalchemy.orm import relationship
 
@@ -32,6 +35,8 @@ class User(Base):
     google_sub = Column(String, unique=True, index=True, nullable=True)
     email_verified = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # set while the user's study rows are in user_archives (services.user_archive)
+    archived_at = Column(DateTime, nullable=True)
 
     # user goals
     daily_card_target = Column(Integer, default=20, nullable=False)
@@ -84,7 +89,7 @@ class RefreshToken(Base):
     jti = Column(String(36), nullable=False, unique=True, index=True)
 
     # store only hash of refresh token (never store raw token)
-    token_hash = Column(String(64), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -93,7 +98,19 @@ class RefreshToken(Base):
     user = relationship("User", backref="refresh_tokens")
 
 
-Index("ix_refresh_tokens_user_revoked", RefreshToken.user_id, RefreshToken.revoked_at)
+# Only active tokens are ever looked up by hash (logout) or per user (the
+# active-token cap); expired/revoked rows stay out of both indexes.
+Index(
+    "ix_refresh_tokens_active_token_hash",
+    RefreshToken.token_hash,
+    postgresql_where=RefreshToken.revoked_at.is_(None),
+)
+Index(
+    "ix_refresh_tokens_active_user_created",
+    RefreshToken.user_id,
+    RefreshToken.created_at,
+    postgresql_where=RefreshToken.revoked_at.is_(None),
+)
 
 
 class Language(Base):
@@ -267,11 +284,18 @@ class ProgressStatus(enum.Enum):
     MASTERED = "mastered"
 
 
+# user_card_progress is hash-partitioned by user_id into this many tables
+# (user_card_progress_p0 ...). Every SRS query filters by user_id, so each one reads
+# a single partition and its indexes. Changing the count means rebuilding the table.
+USER_CARD_PROGRESS_PARTITIONS = 16
+
+
 class UserCardProgress(Base):
     __tablename__ = "user_card_progress"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # part of the primary key: a partitioned table's unique keys must include user_id
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, index=True)
     card_id = Column(Integer, ForeignKey("cards.id"), nullable=False, index=True)
     times_seen = Column(Integer, default=0)
     times_correct = Column(Integer, default=0)
@@ -293,9 +317,20 @@ class UserCardProgress(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "card_id", name="uq_user_card_progress_user_card"),
         Index("ix_user_card_progress_user_due_at", "user_id", "due_at"),
+        {"postgresql_partition_by": "HASH (user_id)"},
     )
 
 
+@event.listens_for(UserCardProgress.__table__, "after_create")
+def _create_user_card_progress_partitions(table, connection, **kw):
+    # indexes and constraints of the parent are created on every partition
+    for remainder in range(USER_CARD_PROGRESS_PARTITIONS):
+        connection.exec_driver_sql(
+            f"CREATE TABLE {table.name}_p{remainder} PARTITION OF {table.name} "
+            f"FOR VALUES WITH (MODULUS {USER_CARD_PROGRESS_PARTITIONS}, REMAINDER {remainder})"
+        )
+
+
 class DailyProgress(Base):
     __tablename__ = "daily_progress"
 
@@ -324,6 +359,19 @@ class DailyProgress(Base):
     )
 
 
+class UserArchive(Base):
+    """A dormant user's progress, daily-progress and refresh-token rows, moved out of
+    the hot tables as one compressed blob. Restored on the user's next request."""
+
+    __tablename__ = "user_archives"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # {table: {"columns": [...], "rows": [[...], ...]}} as zlib-compressed JSON
+    payload = Column(LargeBinary, nullable=False)
+    row_count = Column(Integer, nullable=False)
+
+
 # Translation
 class TranslationCache(Base):
     __tablename__ = "translation_cache"
@@ -394,3 +442,29 @@ class ExampleSentenceCache(Base):
             "query_text_norm",
         ),
     )
+
+
+# Offline Tatoeba corpus (loaded by app.tools.load_tatoeba)
+class CorpusSentence(Base):
+    __tablename__ = "corpus_sentences"
+
+    # Tatoeba sentence id
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    lang = Column(String(8), nullable=False)
+    text = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_corpus_sentences_text_tsv",
+            func.to_tsvector(literal_column("'simple'"), text),
+            postgresql_using="gin",
+        ),
+    )
+
+
+class CorpusLink(Base):
+    __tablename__ = "corpus_links"
+
+    # "sentence_id is translated by translation_id"; both ids refer to corpus_sentences
+    sentence_id = Column(Integer, primary_key=True, autoincrement=False)
+    translation_id = Column(Integer, primary_key=True, autoincrement=False)
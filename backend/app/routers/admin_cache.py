@@ -0,0 +1,49 @@
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..database import SessionLocal, get_read_db
+from ..deps import require_admin
+from ..services import cache_maintenance, cache_warmup
+
+router = APIRouter(prefix="/admin/cache", tags=["admin"])
+
+
+@router.get("/stats", response_model=schemas.ContentCacheStatsOut)
+def content_cache_stats(db: Session = Depends(get_read_db), _admin=Depends(require_admin)):
+    return cache_maintenance.content_cache_stats(db)
+
+
+@router.get("/library/coverage", response_model=schemas.LibraryCacheCoverageOut)
+def library_cache_coverage(
+    deck_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    _admin=Depends(require_admin),
+):
+    return cache_warmup.library_cache_coverage(db, deck_id=deck_id)
+
+
+@router.post(
+    "/library/warm",
+    response_model=schemas.LibraryWarmupQueuedOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def warm_library_caches(
+    background_tasks: BackgroundTasks,
+    deck_id: Optional[int] = None,
+    concurrency: Optional[int] = Query(default=None, ge=1, le=32),
+    db: Session = Depends(get_read_db),
+    _admin=Depends(require_admin),
+):
+    """Queue a fill of the translation/example caches for library card fronts that miss
+    them. Progress shows in /library/coverage; the final report goes to the log."""
+    queued = cache_warmup.queue_library_warmup(
+        background_tasks, SessionLocal, deck_id=deck_id, concurrency=concurrency
+    )
+    return {
+        "deck_id": deck_id,
+        "queued": queued,
+        "before": cache_warmup.library_cache_coverage(db, deck_id=deck_id),
+    }
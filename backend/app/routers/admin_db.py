@@ -0,0 +1,47 @@
+from anyio import to_thread
+from fastapi import APIRouter, Depends, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import schemas
+from ..core.pool_metrics import pool_stats
+from ..core.slow_queries import slow_query_log
+from ..database import (
+    async_engine,
+    async_replica_engine,
+    engine,
+    get_async_db,
+    replica_engine,
+)
+from ..deps import require_admin
+
+router = APIRouter(prefix="/admin/db", tags=["admin"])
+
+
+@router.get("/pool", response_model=schemas.DbPoolStatsOut)
+async def db_pool_stats(
+    db: AsyncSession = Depends(get_async_db), _admin=Depends(require_admin)
+):
+    """Pool occupancy and checkout waits, next to what the pools compete with."""
+    pools = {"primary": pool_stats(engine), "async": pool_stats(async_engine)}
+    if replica_engine is not None:
+        pools["replica"] = pool_stats(replica_engine)
+    if async_replica_engine is not None:
+        pools["async_replica"] = pool_stats(async_replica_engine)
+    return {
+        "pools": pools,
+        # on the event loop: the limiter is per loop
+        "threadpool_size": int(to_thread.current_default_thread_limiter().total_tokens),
+        "max_connections": int(await db.scalar(text("SHOW max_connections"))),
+    }
+
+
+@router.get("/slow-queries", response_model=list[schemas.SlowQueryOut])
+def slow_queries(_admin=Depends(require_admin)):
+    """The slowest statements this process ran (SLOW_QUERY_THRESHOLD_MS), worst first."""
+    return slow_query_log.entries()
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(_admin=Depends(require_admin)):
+    slow_query_log.clear()
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/languages", tags=["languages"])
@@ -16,7 +16,7 @@ def create_language(
 
 
 @router.get("", response_model=list[schemas.LanguageOut])
-def get_languages(db: Session = Depends(get_db), user=Depends(get_current_user)):
+def get_languages(db: Session = Depends(get_read_db), user=Depends(get_current_user)):
     return crud.get_languages(db, user.id)
 
 
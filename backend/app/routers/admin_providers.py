@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+
+from .. import schemas
+from ..deps import require_admin
+from ..services import auto_content
+
+router = APIRouter(prefix="/admin/providers", tags=["admin"])
+
+
+@router.get("/stats", response_model=dict[str, schemas.ProviderStatsOut])
+def provider_stats(_admin=Depends(require_admin)):
+    return auto_content.provider_stats()
@@ -17,17 +17,25 @@ from ..services.security import (
     create_refresh_token,
     hash_password,
     hash_token,
-    verify_password,
+    verify_and_update_password,
 )
 from ..services.google_auth import verify_google_id_token
+from ..services import user_archive
+from ..services.refresh_tokens import revoke_excess_tokens
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 def _authenticate_user(db: Session, *, username: str, password: str):
     user = crud.get_user_by_username(db, username=username)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect username or password")
+    ok, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not ok:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
+    if new_hash:
+        # PASSWORD_HASH_ROUNDS changed since this hash was made; committed with the login
+        user.hashed_password = new_hash
     return user
 
 
@@ -58,7 +66,9 @@ def _commit_or_rollback(db: Session) -> None:
 
 
 def _issue_tokens_for_user(db: Session, *, user) -> schemas.TokenOut:
-    access = create_access_token(subject=user.username)
+    if user.archived_at is not None:
+        user_archive.restore_user(db, user.id)
+    access = create_access_token(subject=user.username, user_id=user.id)
     refresh, jti, exp = create_refresh_token(subject=user.username)
     _persist_refresh_token(
         db,
@@ -67,11 +77,18 @@ def _issue_tokens_for_user(db: Session, *, user) -> schemas.TokenOut:
         jti=jti,
         expires_at=exp,
     )
+    _cap_active_tokens(db, user_id=user.id)
     return schemas.TokenOut(access_token=access, refresh_token=refresh)
 
 
+def _cap_active_tokens(db: Session, *, user_id: int) -> None:
+    # every login adds a session; keep the table proportional to live ones
+    db.flush()
+    revoke_excess_tokens(db, user_id=user_id, keep=settings.refresh_token_max_active_per_user)
+
+
 @router.post("/register", response_model=schemas.TokenOut, status_code=201)
-@limiter.limit("1000/minute")
+@limiter.limit(lambda: settings.rate_limit_auth)
 def register(
     request: Request,
     payload: schemas.RegisterIn,
@@ -91,7 +108,7 @@ def register(
 
 
 @router.post("/login-json", response_model=schemas.TokenOut)
-@limiter.limit("1000/minute")
+@limiter.limit(lambda: settings.rate_limit_auth)
 def login_json(request: Request, payload: schemas.LoginIn, db: Session = Depends(get_db)):
     user = _authenticate_user(db, username=payload.username, password=payload.password)
     tokens = _issue_tokens_for_user(db, user=user)
@@ -100,7 +117,7 @@ def login_json(request: Request, payload: schemas.LoginIn, db: Session = Depends
 
 
 @router.post("/login", response_model=schemas.TokenOut)
-@limiter.limit("1000/minute")
+@limiter.limit(lambda: settings.rate_limit_auth)
 def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     user = _authenticate_user(db, username=form_data.username, password=form_data.password)
     tokens = _issue_tokens_for_user(db, user=user)
@@ -109,7 +126,7 @@ def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db
 
 
 @router.post("/google", response_model=schemas.TokenOut)
-@limiter.limit("1000/minute")
+@limiter.limit(lambda: settings.rate_limit_auth)
 def google_sign_in(
     request: Request,
     payload: schemas.GoogleAuthIn,
@@ -150,7 +167,7 @@ def google_sign_in(
 
 
 @router.post("/refresh", response_model=schemas.TokenOut)
-@limiter.limit("1000/minute")
+@limiter.limit(lambda: settings.rate_limit_auth)
 def refresh_tokens(request: Request, payload: schemas.RefreshIn, db: Session = Depends(get_db)):
     token = payload.refresh_token
 
@@ -170,6 +187,10 @@ def refresh_tokens(request: Request, payload: schemas.RefreshIn, db: Session = D
     user = crud.get_user_by_username(db, username)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    if user.archived_at is not None:
+        # the token may be in the archive; kept even if the token turns out stale
+        user_archive.restore_user(db, user.id)
+        _commit_or_rollback(db)
 
     db_token = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
     if not db_token:
@@ -199,7 +220,7 @@ def refresh_tokens(request: Request, payload: schemas.RefreshIn, db: Session = D
     db_token.revoked_at = now
 
     # issue new pair
-    access = create_access_token(subject=user.username)
+    access = create_access_token(subject=user.username, user_id=user.id)
     new_refresh, new_jti, new_exp = create_refresh_token(subject=user.username)
 
     _persist_refresh_token(
@@ -209,6 +230,7 @@ def refresh_tokens(request: Request, payload: schemas.RefreshIn, db: Session = D
         jti=new_jti,
         expires_at=new_exp,
     )
+    _cap_active_tokens(db, user_id=user.id)
     _commit_or_rollback(db)
 
     return schemas.TokenOut(access_token=access, refresh_token=new_refresh)
@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app import crud, models, schemas
 from app.database import get_db
 from app.deps import get_current_user
-from app.services.auto_content import get_preview_no_save_async
+from app.config import settings
+from app.core.rate_limit import limiter, user_key
+from app.services.auto_content import (
+    get_preview_batch_no_save_async,
+    get_preview_no_save_async,
+    norm,
+)
 from app.services.pair_service import resolve_pair_for_user
 
 router = APIRouter(prefix="/auto", tags=["auto"])
 
 
-@router.post("/preview", response_model=schemas.AutoPreviewOut)
-async def preview_auto(
-    payload: schemas.AutoPreviewIn,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
+def _resolve_languages(db: Session, current_user, payload):
+    # blocking DB work; async handlers call this through run_in_threadpool
     if payload.deck_id is not None:
         if not crud.user_has_access_to_deck(db, current_user.id, payload.deck_id):
             raise HTTPException(status_code=403, detail="No access to deck")
@@ -29,10 +32,6 @@ async def preview_auto(
         use_default_if_missing=True,
     )
 
-    front = (payload.front or "").strip()
-    if not front:
-        raise HTTPException(status_code=422, detail="front is required")
-
     # load Language objects
     src_lang = (
         db.query(models.Language)
@@ -46,21 +45,77 @@ async def preview_auto(
     )
     if not src_lang or not tgt_lang:
         raise HTTPException(status_code=422, detail="Invalid language ids")
+    return src_lang, tgt_lang
 
-    tr, ex, tr_cached, ex_cached = await get_preview_no_save_async(
-        db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front
-    )
 
+def _preview_out(front: str, r: dict) -> dict:
     return {
         "front": front,
-        "suggested_back": tr,
-        "suggested_example_sentence": ex,
+        "suggested_back": r["translation"],
+        "suggested_example_sentence": r["example"],
         "provider": {
-            "translation": "mymemory" if tr else None,
-            "example": "tatoeba" if ex else None,
+            "translation": r["translation_provider"],
+            "example": r["example_provider"],
         },
         "cached": {
-            "translation": tr_cached,
-            "example": ex_cached,
+            "translation": r["translation_cached"],
+            "example": r["example_cached"],
         },
     }
+
+
+@router.post("/preview", response_model=schemas.AutoPreviewOut)
+@limiter.limit(lambda: settings.rate_limit_auto_preview, key_func=user_key)
+async def preview_auto(
+    request: Request,
+    payload: schemas.AutoPreviewIn,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    src_lang, tgt_lang = await run_in_threadpool(_resolve_languages, db, current_user, payload)
+
+    front = (payload.front or "").strip()
+    if not front:
+        raise HTTPException(status_code=422, detail="front is required")
+
+    result = await get_preview_no_save_async(
+        db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front
+    )
+    return _preview_out(front, result)
+
+
+@router.post("/preview/batch", response_model=schemas.AutoPreviewBatchOut)
+@limiter.limit(lambda: settings.rate_limit_auto_preview_batch, key_func=user_key)
+async def preview_auto_batch(
+    request: Request,
+    payload: schemas.AutoPreviewBatchIn,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    fronts = [f.strip() for f in payload.fronts if f and f.strip()]
+    if not fronts:
+        raise HTTPException(status_code=422, detail="fronts is required")
+    if len(fronts) > settings.auto_preview_batch_max_items:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many fronts (max {settings.auto_preview_batch_max_items})",
+        )
+
+    src_lang, tgt_lang = await run_in_threadpool(_resolve_languages, db, current_user, payload)
+
+    results, timed_out = await get_preview_batch_no_save_async(
+        db,
+        src_lang=src_lang,
+        tgt_lang=tgt_lang,
+        texts=fronts,
+        concurrency=settings.auto_preview_batch_concurrency,
+        deadline_seconds=settings.auto_preview_batch_deadline_seconds,
+    )
+
+    items = []
+    for front in fronts:
+        r = results[norm(front)]
+        item = _preview_out(front, r)
+        item["complete"] = r["complete"]
+        items.append(item)
+    return {"items": items, "timed_out": timed_out}
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, models
-from ..database import get_db
-from ..deps import get_current_user
+from ..config import settings
+from ..database import SessionLocal, get_async_read_db, get_db, get_read_db
+from ..deps import get_current_user, get_current_user_async
+from ..services import cache_warmup
 from app.services.deck_service import require_readable_deck, require_users_deck
 from app.services.pair_service import resolve_user_pair_by_payload
 
@@ -14,38 +17,55 @@ from app.services.pair_service import resolve_user_pair_by_payload
 router = APIRouter(prefix="/decks", tags=["decks"])
 
 
+def _warm_if_library(background_tasks: BackgroundTasks, card: models.Card) -> None:
+    # library fronts are previewed/imported by many users: cache them before they ask
+    if settings.library_warmup_on_change and card.deck.deck_type == models.DeckType.LIBRARY:
+        # only the written front: a deck-wide run per card would rescan the whole deck
+        background_tasks.add_task(
+            cache_warmup.warm_library_caches,
+            SessionLocal,
+            deck_id=card.deck_id,
+            front_norm=card.front_norm,
+        )
+
+
 @router.get("", response_model=schemas.Page[schemas.DeckOut])
-def list_my_decks(
+async def list_my_decks(
     limit: int = 20,
     offset: int = 0,
     pair_id: int | None = None,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    user=Depends(get_current_user_async),
 ):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
 
-    try:
+    def load(sync_db: Session):
         items, total = crud.get_user_decks(
-            db,
+            sync_db,
             user.id,
             limit=limit,
             offset=offset,
             pair_id=pair_id,
         )
+        # serialize here, where lazy loads can still reach the database
+        return schemas.Page[schemas.DeckOut].model_validate(
+            {
+                "items": items,
+                "meta": {
+                    "limit": limit,
+                    "offset": offset,
+                    "total": total,
+                    "has_more": offset + len(items) < total,
+                },
+            }
+        )
+
+    try:
+        return await db.run_sync(load)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    return {
-        "items": items,
-        "meta": {
-            "limit": limit,
-            "offset": offset,
-            "total": total,
-            "has_more": offset + len(items) < total,
-        },
-    }
-
 
 @router.post("", response_model=schemas.DeckOut, status_code=201)
 def create_user_deck(
@@ -83,7 +103,7 @@ def create_user_deck(
 
 
 @router.get("/{deck_id}", response_model=schemas.DeckOut)
-def get_deck(deck_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def get_deck(deck_id: int, db: Session = Depends(get_read_db), user=Depends(get_current_user)):
     try:
         return require_readable_deck(
             db,
@@ -166,40 +186,46 @@ def delete_deck(deck_id: int, db: Session = Depends(get_db), user=Depends(get_cu
 
 
 @router.get("/{deck_id}/cards", response_model=schemas.Page[schemas.CardWithStatusOut])
-def list_cards(
+async def list_cards(
     deck_id: int,
     limit: int = 50,
     offset: int = 0,
     reading_source_id: int | None = None,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    user=Depends(get_current_user_async),
 ):
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
-    try:
+
+    def load(sync_db: Session):
         items, total = crud.list_deck_cards(
-            db,
+            sync_db,
             deck_id,
             user.id,
             limit=limit,
             offset=offset,
             reading_source_id=reading_source_id,
         )
+        return schemas.Page[schemas.CardWithStatusOut].model_validate(
+            {
+                "items": items,
+                "meta": {
+                    "limit": limit,
+                    "offset": offset,
+                    "total": total,
+                    "has_more": offset + len(items) < total,
+                },
+            }
+        )
+
+    try:
+        return await db.run_sync(load)
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except LookupError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return {
-        "items": items,
-        "meta": {
-            "limit": limit,
-            "offset": offset,
-            "total": total,
-            "has_more": offset + len(items) < total,
-        },
-    }
 
 
 @router.post(
@@ -208,6 +234,7 @@ def list_cards(
 def create_card(
     deck_id: int,
     payload: schemas.CardCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -230,6 +257,7 @@ def create_card(
             context_note=payload.context_note,
         )
         db.commit()
+        _warm_if_library(background_tasks, card)
         return card
     except IntegrityError:
         db.rollback()
@@ -252,6 +280,7 @@ def update_card(
     deck_id: int,
     card_id: int,
     payload: schemas.CardUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -275,6 +304,8 @@ def update_card(
             context_note=payload.context_note,
         )
         db.commit()
+        if payload.front is not None:
+            _warm_if_library(background_tasks, card)
         return card
     except IntegrityError:
         db.rollback()
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from .. import schemas
+from ..config import settings
+from ..core.rate_limit import limiter, user_key
 from ..database import get_db
 from ..deps import get_current_user
 from ..services import inbox_service
@@ -30,7 +32,9 @@ def quick_add_word(
 
 
 @router.post("/bulk", response_model=schemas.InboxBulkOut, status_code=status.HTTP_201_CREATED)
+@limiter.limit(lambda: settings.rate_limit_inbox_bulk, key_func=user_key)
 def bulk_import(
+    request: Request,
     payload: schemas.InboxBulkIn,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
@@ -1,81 +1,92 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import schemas
-from ..database import get_db
-from ..deps import get_current_user, require_admin
+from ..database import get_async_read_db, get_db
+from ..deps import get_current_user, get_current_user_async, require_admin
 from app.services import library_service
 
 router = APIRouter(prefix="/library", tags=["library"])
 
 
 @router.get("/decks", response_model=schemas.Page[schemas.DeckOut])
-def list_library_decks(
+async def list_library_decks(
     limit: int = 20,
     offset: int = 0,
     pair_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
 ):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
 
-    try:
+    def load(sync_db: Session):
         items, total = library_service.list_library_decks_for_user(
-            db,
+            sync_db,
             user_id=current_user.id,
             limit=limit,
             offset=offset,
             pair_id=pair_id,
         )
+        # serialize here, where lazy loads can still reach the database
+        return schemas.Page[schemas.DeckOut].model_validate(
+            {
+                "items": items,
+                "meta": {
+                    "limit": limit,
+                    "offset": offset,
+                    "total": total,
+                    "has_more": offset + len(items) < total,
+                },
+            }
+        )
+
+    try:
+        return await db.run_sync(load)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    return {
-        "items": items,
-        "meta": {
-            "limit": limit,
-            "offset": offset,
-            "total": total,
-            "has_more": offset + len(items) < total,
-        },
-    }
 
 @router.get("/decks/{deck_id}/cards", response_model=schemas.Page[schemas.CardOut])
-def library_deck_cards(
+async def library_deck_cards(
     deck_id: int,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     reading_source_id: int | None = Query(default=None, ge=1),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
 ):
-    try:
+    def load(sync_db: Session):
         items, total = library_service.list_library_cards_for_deck(
-            db,
+            sync_db,
             user_id=current_user.id,
             deck_id=deck_id,
             limit=limit,
             offset=offset,
             reading_source_id=reading_source_id,
         )
+        return schemas.Page[schemas.CardOut].model_validate(
+            {
+                "items": items,
+                "meta": {
+                    "limit": limit,
+                    "offset": offset,
+                    "total": total,
+                    "has_more": (offset + limit) < total,
+                },
+            }
+        )
+
+    try:
+        return await db.run_sync(load)
     except LookupError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    return {
-        "items": items,
-        "meta": {
-            "limit": limit,
-            "offset": offset,
-            "total": total,
-            "has_more": (offset + limit) < total,
-        },
-    }
-
 
 @router.post("/cards/{card_id}/import", response_model=schemas.ImportCardOut)
 def import_library_card(
@@ -0,0 +1,21 @@
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from ..config import settings
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", include_in_schema=False)
+async def metrics(authorization: str = Header(default="")):
+    # async: the threadpool gauges can only be read on the event loop
+    expected = settings.metrics_bearer_token
+    if expected and not secrets.compare_digest(authorization, f"Bearer {expected}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -3,11 +3,12 @@ from __future__ import annotations
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import schemas
-from ..database import get_db
-from ..deps import get_current_user
+from ..database import get_async_read_db, get_db, get_read_db
+from ..deps import get_current_user, get_current_user_async
 from app.services.errors import NotFoundError, ValidationError
 from app.services.progress_service import (
     build_progress_summary,
@@ -27,7 +28,7 @@ def daily_progress_range(
     to_date: date,
     pair_id: int | None = Query(default=None),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         return daily_progress_range_service(
@@ -47,7 +48,7 @@ def today_added(
     pair_id: int | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         return today_added_for_user(
@@ -67,7 +68,7 @@ def streak(
     threshold: int = Query(default=10, ge=1, le=1000),
     pair_id: int | None = Query(default=None),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         return streak_for_user(
@@ -86,7 +87,7 @@ def monthly_progress(
     month: int = Query(..., ge=1, le=12),
     pair_id: int | None = Query(default=None),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         return monthly_progress_range_service(
@@ -100,15 +101,15 @@ def monthly_progress(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/summary", response_model=schemas.ProgressSummaryOut)
-def progress_summary(
+async def progress_summary(
     deck_id: int | None = Query(default=None),
     streak_threshold: int = Query(default=10, ge=1, le=1000),
     pair_id: int | None = Query(default=None),
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return build_progress_summary(
-        db,
+    return await db.run_sync(
+        build_progress_summary,
         current_user,
         deck_id=deck_id,
         pair_id=pair_id,
@@ -5,7 +5,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.deps import get_current_user
 from app.services import pair_service
 from app.services.srs import _normalize_status
@@ -41,7 +41,7 @@ def list_reading_sources(
     include_stats: bool = False,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     if pair_id is not None and not pair_service.get_user_pair_by_id(
@@ -107,7 +107,7 @@ def create_source(
 @router.get("/{source_id}", response_model=schemas.ReadingSourceOut)
 def get_source(
     source_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     try:
@@ -178,7 +178,7 @@ def get_source_detail(
     source_id: int,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     try:
@@ -247,7 +247,7 @@ def get_source_cards(
     source_id: int,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     detail = get_source_detail(source_id, limit=limit, offset=offset, db=db, user=user)
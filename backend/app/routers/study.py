@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import schemas
-from ..database import get_db
-from ..deps import get_current_user
+from ..database import get_async_read_db, get_db, get_read_db
+from ..deps import get_current_user, get_current_user_async
 from ..services.study_service import next_study_for_main_deck, status_for_main_deck, study_card
 
 router = APIRouter(prefix="/study", tags=["study"])
@@ -40,7 +41,7 @@ def next_study_for_deck(
     max_reviews_per_day: int = Query(100, ge=0, le=5000),
     reading_source_id: int | None = Query(default=None, ge=1),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         return next_study_for_main_deck(
@@ -60,17 +61,17 @@ def next_study_for_deck(
 
 
 @router.get("/decks/{deck_id}/status", response_model=schemas.StudyStatusOut)
-def study_status_for_deck(
+async def study_status_for_deck(
     deck_id: int,
     max_new_per_day: int = Query(10, ge=0, le=1000),
     max_reviews_per_day: int = Query(100, ge=0, le=5000),
     reading_source_id: int | None = Query(default=None, ge=1),
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     try:
-        return status_for_main_deck(
-            db,
+        return await db.run_sync(
+            status_for_main_deck,
             user_id=current_user.id,
             deck_id=deck_id,
             max_new_per_day=max_new_per_day,
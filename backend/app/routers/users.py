@@ -2,15 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 
 from .. import crud, models, schemas
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=schemas.UserOut)
-def me(current_user=Depends(get_current_user)):
-    return current_user
+def me(current_user=Depends(get_current_user), db: Session = Depends(get_read_db)):
+    # CurrentUser carries only the identity; the profile needs the row
+    user = db.get(models.User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 @router.put("/me/languages", response_model=schemas.UserOut)
@@ -58,7 +62,7 @@ def set_default_languages(
 @router.get("/me/learning-pairs", response_model=list[schemas.UserLearningPairOut])
 def my_learning_pairs(
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     return crud.list_learning_pairs(db, current_user.id)
 
@@ -152,7 +156,7 @@ def update_my_goals(
 @router.get("/me/default-learning-pair", response_model=schemas.UserLearningPairOut)
 def get_default_pair(
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     pair = crud.get_default_learning_pair(db, current_user.id)
     if not pair:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -484,3 +484,119 @@ class AutoPreviewOut(BaseModel):
     suggested_example_sentence: Optional[str] = None
     provider: AutoProvidersOut
     cached: AutoCachedOut
+
+
+class AutoPreviewBatchIn(BaseModel):
+    fronts: List[str]
+    deck_id: Optional[int] = None
+    source_language_id: Optional[int] = None
+    target_language_id: Optional[int] = None
+
+
+class AutoPreviewBatchItemOut(AutoPreviewOut):
+    # False when the batch deadline hit before the providers answered for this front
+    complete: bool = True
+
+
+class AutoPreviewBatchOut(BaseModel):
+    items: List[AutoPreviewBatchItemOut]
+    timed_out: bool = False
+
+
+class CacheLookupStatsOut(BaseModel):
+    lookups: int
+    hits: int
+    hit_ratio: float
+    pending_keys: int
+
+
+class MemoryCacheStatsOut(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
+class ContentCacheTableStatsOut(BaseModel):
+    rows: int
+    total_bytes: int
+    stored_hits: int
+    max_rows: int
+    lookups: CacheLookupStatsOut
+    memory: MemoryCacheStatsOut
+
+
+class ContentCacheStatsOut(BaseModel):
+    translation: ContentCacheTableStatsOut
+    example: ContentCacheTableStatsOut
+
+
+class CacheCoverageOut(BaseModel):
+    cached: int
+    ratio: float
+
+
+class LibraryCacheCoverageOut(BaseModel):
+    fronts: int
+    pairs: int
+    translation: CacheCoverageOut
+    example: CacheCoverageOut
+
+
+class LibraryWarmupQueuedOut(BaseModel):
+    deck_id: Optional[int] = None
+    queued: bool  # False: a warm-up for this scope is already queued or running
+    before: LibraryCacheCoverageOut
+
+
+class PoolStatsOut(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    wait_p50: float = 0.0
+    wait_p95: float = 0.0
+    wait_p99: float = 0.0
+
+
+class DbPoolStatsOut(BaseModel):
+    pools: dict[str, PoolStatsOut]
+    threadpool_size: int
+    max_connections: int
+
+
+class SlowQueryOut(BaseModel):
+    fingerprint: str
+    # statement, parameters and route of the slowest run
+    statement: str
+    parameters: str
+    route: Optional[str] = None
+    count: int
+    max_ms: float
+    total_ms: float
+    last_seen_at: datetime
+    plan: Optional[Any] = None  # EXPLAIN (FORMAT JSON) output, with SLOW_QUERY_EXPLAIN
+
+
+class ProviderStatsOut(BaseModel):
+    name: str
+    state: str
+    calls: int
+    failures: int
+    slow_calls: int
+    short_circuited: int
+    times_opened: int
+    window_calls: int
+    window_error_ratio: float
+    window_latency_p50: float
+    window_latency_p95: float
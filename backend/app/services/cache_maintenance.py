@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import bindparam, func, select, text, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from . import auto_content
+
+logger = logging.getLogger(__name__)
+
+# (HitCounter, model, normalized-text column name)
+_CACHES = {
+    "translation": (auto_content.translation_hits, models.TranslationCache, "source_text_norm"),
+    "example": (auto_content.example_hits, models.ExampleSentenceCache, "query_text_norm"),
+}
+
+
+# ==============================
+# Write-behind hit counting
+# ==============================
+
+
+def flush_cache_hits(db: Session) -> int:
+    """Apply aggregated hits as batched ``hits = hits + n`` updates. Returns rows touched."""
+    touched = 0
+    for counter, model, norm_col in _CACHES.values():
+        pending = counter.drain()
+        if not pending:
+            continue
+
+        table = model.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.src_language_id == bindparam("b_src"),
+                table.c.tgt_language_id == bindparam("b_tgt"),
+                table.c[norm_col] == bindparam("b_norm"),
+            )
+            .values(hits=table.c.hits + bindparam("b_n"), updated_at=func.now())
+        )
+        params = [
+            {"b_src": src, "b_tgt": tgt, "b_norm": text_norm, "b_n": n}
+            for (src, tgt, text_norm), n in pending.items()
+        ]
+        try:
+            db.execute(stmt, params)
+            db.commit()
+        except Exception:
+            db.rollback()
+            counter.restore(pending)
+            raise
+        touched += len(params)
+    return touched
+
+
+# ==============================
+# Pruning
+# ==============================
+
+
+def _table_bytes(db: Session, table_name: str) -> int:
+    return int(db.execute(text("SELECT pg_total_relation_size(:t)"), {"t": table_name}).scalar())
+
+
+def _coldest_first(model):
+    return model.hits.asc(), model.updated_at.asc(), model.id.asc()
+
+
+def prune_cache_table(db: Session, model, *, max_rows: int, max_bytes: int = 0) -> int:
+    """Evict the coldest rows (fewest hits, then least recently used) over budget.
+
+    ``max_rows`` caps the row count; ``max_bytes`` (0 = off) caps the size of the
+    live rows (``pg_column_size``). The relation size is not used: it does not
+    shrink after DELETE, so a budget on it would evict more on every run.
+    """
+    deleted = 0
+    rows = db.query(func.count(model.id)).scalar() or 0
+    excess = max(0, rows - max_rows) if max_rows > 0 else 0
+    if excess > 0:
+        coldest = select(model.id).order_by(*_coldest_first(model)).limit(excess).scalar_subquery()
+        deleted += db.query(model).filter(model.id.in_(coldest)).delete(synchronize_session=False)
+
+    if max_bytes > 0:
+        # keep the hottest rows whose running live size fits, drop the rest
+        table = model.__table__
+        running = (
+            func.sum(func.pg_column_size(table.table_valued()))
+            .over(order_by=[c.desc() for c in (model.hits, model.updated_at, model.id)])
+            .label("running")
+        )
+        ranked = select(model.id.label("id"), running).subquery()
+        over_budget = select(ranked.c.id).where(ranked.c.running > max_bytes).scalar_subquery()
+        deleted += db.query(model).filter(model.id.in_(over_budget)).delete(
+            synchronize_session=False
+        )
+
+    if deleted:
+        db.commit()
+    return deleted
+
+
+def prune_content_caches(db: Session) -> dict[str, int]:
+    # pending hits first, so recently used rows are not mistaken for cold ones
+    flush_cache_hits(db)
+    return {
+        name: prune_cache_table(
+            db,
+            model,
+            max_rows=settings.content_cache_max_rows,
+            max_bytes=settings.content_cache_max_bytes,
+        )
+        for name, (_, model, _) in _CACHES.items()
+    }
+
+
+# ==============================
+# Stats
+# ==============================
+
+
+def content_cache_stats(db: Session) -> dict:
+    memory = auto_content.memory_cache_stats()
+    out = {}
+    for name, (counter, model, _) in _CACHES.items():
+        rows, total_hits = db.query(
+            func.count(model.id), func.coalesce(func.sum(model.hits), 0)
+        ).one()
+        out[name] = {
+            "rows": rows,
+            "total_bytes": _table_bytes(db, model.__tablename__),
+            "stored_hits": int(total_hits),
+            "max_rows": settings.content_cache_max_rows,
+            "lookups": counter.stats(),
+            "memory": memory[name],
+        }
+    return out
+
+
+# ==============================
+# Background loop
+# ==============================
+
+
+async def run_cache_maintenance(session_factory, stop: asyncio.Event) -> None:
+    """Flush hits every few seconds and prune on a slower schedule until ``stop`` is set."""
+    flush_every = max(1, settings.content_cache_hit_flush_seconds)
+    prune_every = settings.content_cache_prune_interval_seconds
+    next_prune = time.monotonic() + prune_every if prune_every > 0 else None
+
+    def _run(job):
+        db = session_factory()
+        try:
+            return job(db)
+        finally:
+            db.close()
+
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=flush_every)
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            if next_prune is not None and time.monotonic() >= next_prune:
+                deleted = await asyncio.to_thread(_run, prune_content_caches)
+                next_prune = time.monotonic() + prune_every
+                if any(deleted.values()):
+                    logger.info("Pruned content caches: %s", deleted)
+            else:
+                await asyncio.to_thread(_run, flush_cache_hits)
+        except Exception:
+            logger.exception("Content cache maintenance failed")
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from . import auto_content
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Library fronts and coverage
+# ==============================
+
+
+@dataclass(frozen=True)
+class LibraryFront:
+    src_language_id: int
+    tgt_language_id: int
+    front: str
+    translation_cached: bool
+    example_cached: bool
+
+
+def _cached_in(model, norm_col):
+    return exists().where(
+        model.src_language_id == models.Deck.source_language_id,
+        model.tgt_language_id == models.Deck.target_language_id,
+        norm_col == models.Card.front_norm,
+    )
+
+
+def library_fronts(
+    db: Session, *, deck_id: Optional[int] = None, front_norm: Optional[str] = None
+) -> list[LibraryFront]:
+    """Distinct fronts of library cards per language pair, with their cache state.
+
+    Card.front_norm uses the same normalization as the cache keys, so one
+    correlated EXISTS per cache answers "already cached" for every front.
+    """
+    q = (
+        db.query(
+            models.Deck.source_language_id,
+            models.Deck.target_language_id,
+            func.min(models.Card.front),
+            _cached_in(models.TranslationCache, models.TranslationCache.source_text_norm),
+            _cached_in(models.ExampleSentenceCache, models.ExampleSentenceCache.query_text_norm),
+        )
+        .join(models.Card, models.Card.deck_id == models.Deck.id)
+        .filter(models.Deck.deck_type == models.DeckType.LIBRARY, models.Card.front_norm != "")
+        .group_by(
+            models.Deck.source_language_id, models.Deck.target_language_id, models.Card.front_norm
+        )
+    )
+    if deck_id is not None:
+        q = q.filter(models.Deck.id == deck_id)
+    if front_norm is not None:
+        q = q.filter(models.Card.front_norm == front_norm)
+    return [LibraryFront(*row) for row in q.all()]
+
+
+def _coverage(fronts: list[LibraryFront]) -> dict:
+    total = len(fronts)
+    out = {"fronts": total, "pairs": len({(f.src_language_id, f.tgt_language_id) for f in fronts})}
+    for name in ("translation", "example"):
+        cached = sum(1 for f in fronts if getattr(f, f"{name}_cached"))
+        out[name] = {"cached": cached, "ratio": round(cached / total, 4) if total else 1.0}
+    return out
+
+
+def library_cache_coverage(db: Session, *, deck_id: Optional[int] = None) -> dict:
+    return _coverage(library_fronts(db, deck_id=deck_id))
+
+
+# ==============================
+# Warm-up
+# ==============================
+
+
+def _warm_front(session_factory, front: LibraryFront) -> tuple[bool, bool]:
+    """Fill the missing cache rows for one front through the regular lookup path
+    (dictionary / local corpus first, then the providers). Returns what got filled."""
+    db = session_factory()
+    try:
+        src_lang = db.get(models.Language, front.src_language_id)
+        tgt_lang = db.get(models.Language, front.tgt_language_id)
+        if src_lang is None or tgt_lang is None:
+            return False, False
+
+        translated = front.translation_cached or bool(
+            auto_content.get_translation_with_cache(
+                db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front.front
+            )
+        )
+        example = front.example_cached or bool(
+            auto_content.get_example_with_cache(
+                db, src_lang=src_lang, tgt_lang=tgt_lang, text_raw=front.front
+            )
+        )
+        db.commit()
+        return translated and not front.translation_cached, example and not front.example_cached
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _load_fronts(
+    session_factory, deck_id: Optional[int], front_norm: Optional[str] = None
+) -> list[LibraryFront]:
+    db = session_factory()
+    try:
+        return library_fronts(db, deck_id=deck_id, front_norm=front_norm)
+    finally:
+        db.close()
+
+
+async def warm_library_caches(
+    session_factory,
+    *,
+    deck_id: Optional[int] = None,
+    front_norm: Optional[str] = None,
+    concurrency: Optional[int] = None,
+) -> dict:
+    """Fill translation_cache / example_sentence_cache for library card fronts
+    (all of them, one deck's, or with ``front_norm`` just that front).
+
+    Fronts that already have both rows are skipped; the rest are looked up at
+    most ``concurrency`` at a time (default: settings.library_warmup_concurrency).
+    Returns coverage before and after plus what this run filled.
+    """
+    started = time.monotonic()
+    fronts = await asyncio.to_thread(_load_fronts, session_factory, deck_id, front_norm)
+    todo = [f for f in fronts if not (f.translation_cached and f.example_cached)]
+
+    sem = asyncio.Semaphore(max(1, concurrency or settings.library_warmup_concurrency))
+    filled = {"translation": 0, "example": 0}
+    failed = 0
+
+    async def warm(front: LibraryFront) -> None:
+        nonlocal failed
+        async with sem:
+            try:
+                tr, ex = await asyncio.to_thread(_warm_front, session_factory, front)
+            except Exception:
+                logger.exception("Cache warm-up failed for %r", front.front)
+                failed += 1
+                return
+        filled["translation"] += tr
+        filled["example"] += ex
+
+    await asyncio.gather(*(warm(f) for f in todo))
+
+    after = await asyncio.to_thread(_load_fronts, session_factory, deck_id, front_norm)
+    report = {
+        "deck_id": deck_id,
+        "skipped": len(fronts) - len(todo),
+        "attempted": len(todo),
+        "filled": filled,
+        "failed": failed,
+        "before": _coverage(fronts),
+        "after": _coverage(after),
+        "seconds": round(time.monotonic() - started, 3),
+    }
+    logger.info(
+        "Library cache warm-up: %d fronts, %d attempted, filled %s, %d failed in %.1fs",
+        len(fronts),
+        len(todo),
+        filled,
+        failed,
+        report["seconds"],
+    )
+    return report
+
+
+# Scopes (a deck id, or None for the whole library) with a warm-up queued or running
+# in this process. Asking again for one of them does not queue a second run.
+_pending: set[Optional[int]] = set()
+
+
+def queue_library_warmup(
+    background_tasks,
+    session_factory,
+    *,
+    deck_id: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> bool:
+    """Run ``warm_library_caches`` after the response; False when that scope is
+    already queued or running."""
+    if deck_id in _pending:
+        return False
+    _pending.add(deck_id)
+    background_tasks.add_task(_run_queued, session_factory, deck_id, concurrency)
+    return True
+
+
+async def _run_queued(session_factory, deck_id: Optional[int], concurrency: Optional[int]):
+    try:
+        await warm_library_caches(session_factory, deck_id=deck_id, concurrency=concurrency)
+    finally:
+        _pending.discard(deck_id)
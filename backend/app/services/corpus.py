@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Look at no more than this many matching sentences when picking the shortest one;
+# very common words match hundreds of thousands of rows.
+CANDIDATE_LIMIT = 200
+
+# One FTS lookup per query, all in one round trip: every query in the array gets
+# its own candidate scan (LATERAL), and queries without a match drop out.
+_EXAMPLES_SQL = text(
+    """
+    SELECT q.query, best.src_text, best.tgt_text
+    FROM unnest(CAST(:queries AS text[])) AS q(query)
+    CROSS JOIN LATERAL (
+        SELECT c.text AS src_text, t.text AS tgt_text
+        FROM (
+            SELECT s.id, s.text
+            FROM corpus_sentences s
+            WHERE to_tsvector('simple', s.text) @@ plainto_tsquery('simple', q.query)
+              AND s.lang = :src
+            LIMIT :candidates
+        ) c
+        LEFT JOIN LATERAL (
+            SELECT t.text
+            FROM corpus_links l
+            JOIN corpus_sentences t ON t.id = l.translation_id
+            WHERE l.sentence_id = c.id AND t.lang = :tgt
+            ORDER BY length(t.text)
+            LIMIT 1
+        ) t ON true
+        ORDER BY (t.text IS NULL), length(c.text), c.id
+        LIMIT 1
+    ) best
+    """
+)
+
+
+def find_local_examples(
+    db: Session, *, queries: list[str], src_code: str, tgt_code: str
+) -> dict[str, str]:
+    """Best local example for each of ``queries`` in one query: {query: example}.
+
+    ``src_code``/``tgt_code`` are Tatoeba (ISO 639-3) codes. Sentences with a
+    translation into ``tgt_code`` win; among those the shortest one is picked.
+    Examples use the remote API's format ("src\\ntgt", or src alone).
+    """
+    wanted = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if not wanted:
+        return {}
+
+    rows = db.execute(
+        _EXAMPLES_SQL,
+        {"queries": wanted, "src": src_code, "tgt": tgt_code, "candidates": CANDIDATE_LIMIT},
+    )
+    found: dict[str, str] = {}
+    for row in rows:
+        if row.tgt_text:
+            found[row.query] = f"{row.src_text}\n{row.tgt_text}".strip()
+        elif row.src_text:
+            found[row.query] = row.src_text
+    return found
+
+
+def find_local_example(
+    db: Session, *, query: str, src_code: str, tgt_code: str
+) -> Optional[str]:
+    """Best example for ``query`` from the local Tatoeba corpus (see find_local_examples)."""
+    query = (query or "").strip()
+    found = find_local_examples(db, queries=[query], src_code=src_code, tgt_code=tgt_code)
+    return found.get(query)
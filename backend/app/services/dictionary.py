@@ -0,0 +1,117 @@
+"""Offline bilingual dictionaries: memory-mapped, sorted, binary-searched.
+
+File layout (``<DICTIONARY_DIR>/<src>-<tgt>.fcdict``, built by app.tools.build_dictionary):
+
+    magic   8 bytes   b"FCDICT1\\n"
+    count   uint64    number of entries (little endian)
+    offsets count x uint64, offset of each entry relative to the data section
+    data    entries sorted by UTF-8 key bytes, each ``key \\t value \\n``
+
+Keys are ``auto_content.norm(headword)``. Lookups touch O(log n) pages of the
+mapped file and allocate nothing but the result, so a dictionary with millions of
+headwords costs no heap and is shared by all workers through the page cache.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import threading
+from typing import Optional
+
+from ..config import settings
+
+MAGIC = b"FCDICT1\n"
+HEADER = struct.Struct("<8sQ")
+OFFSET = struct.Struct("<Q")
+PROVIDER = "dictionary"
+
+logger = logging.getLogger(__name__)
+
+
+class MmapDictionary:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self._count = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path}: not a dictionary file")
+        self._offsets_at = HEADER.size
+        self._data_at = HEADER.size + self._count * OFFSET.size
+        if self._data_at > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path}: truncated dictionary file")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> tuple[int, int]:
+        """(start of key, end of key) of entry ``i`` in the mapped file."""
+        (offset,) = OFFSET.unpack_from(self._mm, self._offsets_at + i * OFFSET.size)
+        start = self._data_at + offset
+        return start, self._mm.find(b"\t", start)
+
+    def get(self, key: str) -> Optional[str]:
+        needle = key.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, tab = self._entry(mid)
+            current = self._mm[start:tab]
+            if current < needle:
+                lo = mid + 1
+            elif current > needle:
+                hi = mid
+            else:
+                end = self._mm.find(b"\n", tab)
+                return self._mm[tab + 1 : end].decode("utf-8")
+        return None
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+# Opened dictionaries by path; None remembers "no usable file" (rebuilds need a restart).
+_open: dict[str, Optional[MmapDictionary]] = {}
+_open_lock = threading.Lock()
+
+
+def dictionary_path(directory: str, src_code: str, tgt_code: str) -> str:
+    return os.path.join(directory, f"{src_code.lower()}-{tgt_code.lower()}.fcdict")
+
+
+def get_dictionary(src_code: str, tgt_code: str) -> Optional[MmapDictionary]:
+    if not settings.dictionary_dir or not src_code or not tgt_code:
+        return None
+    path = dictionary_path(settings.dictionary_dir, src_code, tgt_code)
+    with _open_lock:
+        if path not in _open:
+            d = None
+            if os.path.exists(path):
+                try:
+                    d = MmapDictionary(path)
+                except ValueError:
+                    # empty or corrupt file: the provider path still works without it
+                    logger.exception("Ignoring unreadable dictionary %s", path)
+            _open[path] = d
+        return _open[path]
+
+
+def close_dictionaries() -> None:
+    with _open_lock:
+        for d in _open.values():
+            if d is not None:
+                d.close()
+        _open.clear()
+
+
+def lookup(src_code: str, tgt_code: str, key: str) -> Optional[str]:
+    d = get_dictionary(src_code, tgt_code)
+    return d.get(key) if d is not None else None
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .. import crud, models
+from ..config import settings
+from ..core.ttl_cache import MISSING, TTLCache
+from . import user_archive
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """What most endpoints need to know about the caller, without the ORM ``User``.
+
+    Handlers that need more (e.g. ``/users/me``) load the row by ``id`` themselves.
+    """
+
+    id: int
+    username: str
+    daily_card_target: int
+    daily_new_target: int
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            daily_card_target=user.daily_card_target,
+            daily_new_target=user.daily_new_target,
+        )
+
+
+# user id -> CurrentUser; a hit answers an authenticated request without a query.
+# Per process: the invalidation below reaches only the worker that wrote the change,
+# so elsewhere an entry can be stale for up to identity_cache_ttl_seconds.
+identity_cache = TTLCache(
+    max_size=settings.identity_cache_max_entries,
+    ttl_seconds=settings.identity_cache_ttl_seconds,
+)
+
+
+def cached_current_user(claims: dict) -> Optional[CurrentUser]:
+    uid = claims.get("uid")
+    if uid is None:
+        return None
+    hit = identity_cache.get(uid)
+    # the username check guards against ids reused after a user was deleted
+    if hit is MISSING or hit.username != claims["sub"]:
+        return None
+    return hit
+
+
+def load_current_user(db: Session, claims: dict) -> Optional[CurrentUser]:
+    """Resolve access-token claims to a CurrentUser: by primary key when the token
+    has a ``uid`` claim, by username for tokens issued before it existed."""
+    uid = claims.get("uid")
+    if uid is not None:
+        user = db.get(models.User, uid)
+        if user is None or user.username != claims["sub"]:
+            return None
+    else:
+        user = crud.get_user_by_username(db, claims["sub"])
+        if user is None:
+            return None
+
+    if user.archived_at is not None:
+        # back from dormancy: their progress returns before the handler reads it
+        user_archive.restore_user(db, user.id)
+        db.commit()
+
+    current = CurrentUser.from_user(user)
+    identity_cache.set(user.id, current)
+    return current
+
+
+def invalidate_user(user_id: int) -> None:
+    identity_cache.invalidate(user_id)
+
+
+# ==============================
+# Invalidation on user changes
+# ==============================
+
+# Dropped at flush so the writing request sees its own change, and again after
+# commit so a concurrent request cannot keep a row read before the commit.
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _user_changed(mapper, connection, target: models.User) -> None:
+    invalidate_user(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("identity_changed", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop("identity_changed", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop("identity_changed", None)
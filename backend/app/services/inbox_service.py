@@ -136,6 +136,12 @@ def bulk_import(
     )
 
     lines = payload.text.splitlines()
+    parsed_lines = [_split_line(line, payload.delimiter) for line in lines]
+    # fronts come back stripped; normalized in one pass and reused below
+    norms = iter(crud.normalize_fronts(parsed[0] for parsed in parsed_lines if parsed))
+    front_norms = [next(norms) if parsed else None for parsed in parsed_lines]
+    # duplicates against the deck: one query up front instead of one per line
+    existing_norms = crud.existing_fronts_in_deck(db, deck.id, filter(None, front_norms))
     results: list[schemas.BulkItemResult] = []
     created_count = 0
     preview_count = 0
@@ -144,8 +150,7 @@ def bulk_import(
     failed_count = 0
     seen_norms: set[str] = set()
 
-    for idx, line in enumerate(lines):
-        parsed = _split_line(line, payload.delimiter)
+    for idx, (line, parsed, front_norm) in enumerate(zip(lines, parsed_lines, front_norms)):
         if not parsed:
             invalid_count += 1
             results.append(
@@ -175,7 +180,6 @@ def bulk_import(
             )
             continue
 
-        front_norm = crud.normalize_front(front)
         if front_norm in seen_norms:
             duplicate_count += 1
             results.append(
@@ -190,7 +194,7 @@ def bulk_import(
             continue
         seen_norms.add(front_norm)
 
-        if crud.card_exists_in_deck(db, deck.id, front):
+        if front_norm in existing_norms:
             duplicate_count += 1
             results.append(
                 schemas.BulkItemResult(
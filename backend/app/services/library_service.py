@@ -215,8 +215,20 @@ def import_selected_library_cards_to_main_deck(
         invalid_count = 0
         failed_count = 0
 
+        # one query each for the selected cards and for the duplicates among them
+        cards_by_id = crud.get_cards_for_library_import(db, card_ids)
+        library_cards = [card for card in cards_by_id.values() if card.deck_id == library_deck_id]
+        norms_by_id = dict(
+            zip(
+                (card.id for card in library_cards),
+                crud.normalize_fronts(card.front for card in library_cards),
+            )
+        )
+        existing_fronts = crud.existing_fronts_in_deck(db, target_deck.id, norms_by_id.values())
+
+        created_ids: list[int] = []
         for card_id in card_ids:
-            card = crud.get_card_for_library_import(db, card_id)
+            card = cards_by_id.get(card_id)
             if not card or card.deck_id != library_deck_id:
                 results.append(
                     {
@@ -231,7 +243,8 @@ def import_selected_library_cards_to_main_deck(
                 invalid_count += 1
                 continue
 
-            if crud.card_exists_in_deck(db, target_deck.id, card.front):
+            front_norm = norms_by_id[card_id]
+            if front_norm in existing_fronts:
                 results.append(
                     {
                         "library_card_id": card_id,
@@ -309,6 +322,8 @@ def import_selected_library_cards_to_main_deck(
                         "card": new_card,
                     }
                 )
+                existing_fronts.add(front_norm)
+                created_ids.append(new_card.id)
                 created_count += 1
             except ValueError as e:
                 msg = str(e)
@@ -344,6 +359,10 @@ def import_selected_library_cards_to_main_deck(
             db.rollback()
         else:
             db.commit()
+            if created_ids:
+                # the commit expired the new cards: reload them in one query instead
+                # of one per card while the response is serialized
+                db.query(models.Card).filter(models.Card.id.in_(created_ids)).all()
 
         return {
             "results": results,
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+# bcrypt is pure CPU (tens to hundreds of ms per call at cost 12) and holds the GIL
+# in the request threadpool, so a burst of logins starves every other request.
+# Hashing runs in a small process pool instead; the request thread only waits on
+# the result, which releases the GIL.
+
+
+@functools.lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # deprecated="auto": hashes with another cost count as needing an update
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# --- run in the worker processes (top-level, so they pickle) ---
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed: str, rounds: int) -> tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, hashed)
+
+
+# --- pool ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if settings.password_hash_workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers must not inherit the parent's DB connections or locks
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _run(fn, *args):
+    pool = _executor()
+    if pool is None:
+        return fn(*args)
+    return pool.submit(fn, *args).result()
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# --- public API (blocking: call from sync endpoints / the threadpool) ---
+
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password, settings.password_hash_rounds)
+
+
+def verify_and_update(password: str, hashed: str) -> tuple[bool, Optional[str]]:
+    """(matches, new_hash). ``new_hash`` is set when the password matched but the
+    stored hash uses another cost than ``password_hash_rounds``; store it."""
+    return _run(_verify_and_update, password, hashed, settings.password_hash_rounds)
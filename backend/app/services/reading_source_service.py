@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from datetime import datetime
 
-from sqlalchemy import func
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from app import models
@@ -96,71 +96,54 @@ def list_reading_sources_for_pair(
 
     source_ids = [item.id for item in items]
 
-    total_rows = (
-        db.query(models.Card.reading_source_id, func.count(models.Card.id))
-        .join(models.Deck, models.Deck.id == models.Card.deck_id)
-        .filter(models.Card.reading_source_id.in_(source_ids))
-        .filter(models.Deck.owner_id == user_id)
-        .filter(models.Deck.deck_type == models.DeckType.MAIN)
-        .group_by(models.Card.reading_source_id)
-        .all()
-    )
-    total_map = {sid: count for sid, count in total_rows}
-
-    due_rows = (
-        db.query(models.Card.reading_source_id, func.count(models.UserCardProgress.id))
-        .join(models.UserCardProgress, models.UserCardProgress.card_id == models.Card.id)
-        .join(models.Deck, models.Deck.id == models.Card.deck_id)
-        .filter(
-            models.Card.reading_source_id.in_(source_ids),
-            models.Deck.owner_id == user_id,
-            models.Deck.deck_type == models.DeckType.MAIN,
-            models.UserCardProgress.user_id == user_id,
-            models.UserCardProgress.due_at.isnot(None),
-            models.UserCardProgress.due_at <= datetime.utcnow(),
-        )
-        .group_by(models.Card.reading_source_id)
-        .all()
-    )
-    due_map = {sid: count for sid, count in due_rows}
-
     today_start_tz, today_end_tz = bishkek_day_bounds(bishkek_today())
     # Card.created_at is stored as naive datetime in current schema.
     today_start = today_start_tz.replace(tzinfo=None)
     today_end = today_end_tz.replace(tzinfo=None)
-    today_rows = (
-        db.query(models.Card.reading_source_id, func.count(models.Card.id))
+    added_today = and_(models.Card.created_at >= today_start, models.Card.created_at < today_end)
+
+    # card totals, today's additions and the latest addition in one pass over the cards
+    card_rows = (
+        db.query(
+            models.Card.reading_source_id,
+            func.count(models.Card.id),
+            func.count(models.Card.id).filter(added_today),
+            func.max(models.Card.created_at),
+        )
         .join(models.Deck, models.Deck.id == models.Card.deck_id)
         .filter(
             models.Card.reading_source_id.in_(source_ids),
             models.Deck.owner_id == user_id,
             models.Deck.deck_type == models.DeckType.MAIN,
-            models.Card.created_at >= today_start,
-            models.Card.created_at < today_end,
         )
         .group_by(models.Card.reading_source_id)
         .all()
     )
-    today_map = {sid: count for sid, count in today_rows}
+    card_stats = {sid: (total, today, last) for sid, total, today, last in card_rows}
 
-    last_added_rows = (
-        db.query(models.Card.reading_source_id, func.max(models.Card.created_at))
+    due_rows = (
+        db.query(models.Card.reading_source_id, func.count(models.UserCardProgress.id))
+        .join(models.UserCardProgress, models.UserCardProgress.card_id == models.Card.id)
         .join(models.Deck, models.Deck.id == models.Card.deck_id)
         .filter(
             models.Card.reading_source_id.in_(source_ids),
             models.Deck.owner_id == user_id,
             models.Deck.deck_type == models.DeckType.MAIN,
+            models.UserCardProgress.user_id == user_id,
+            models.UserCardProgress.due_at.isnot(None),
+            models.UserCardProgress.due_at <= datetime.utcnow(),
         )
         .group_by(models.Card.reading_source_id)
         .all()
     )
-    last_added_map = {sid: created_at for sid, created_at in last_added_rows}
+    due_map = {sid: count for sid, count in due_rows}
 
     for item in items:
-        setattr(item, "total_cards", int(total_map.get(item.id, 0) or 0))
+        total, today, last_added_at = card_stats.get(item.id, (0, 0, None))
+        setattr(item, "total_cards", int(total or 0))
         setattr(item, "due_cards", int(due_map.get(item.id, 0) or 0))
-        setattr(item, "added_today", int(today_map.get(item.id, 0) or 0))
-        setattr(item, "last_added_at", last_added_map.get(item.id))
+        setattr(item, "added_today", int(today or 0))
+        setattr(item, "last_added_at", last_added_at)
 
     return items
 
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+RefreshToken = models.RefreshToken
+
+
+# ==============================
+# Per-user cap
+# ==============================
+
+
+def revoke_excess_tokens(db: Session, *, user_id: int, keep: int) -> int:
+    """Revoke all but the ``keep`` newest active refresh tokens of a user.
+
+    Revoked rather than deleted: presenting one still reads as "revoked", and the
+    cleanup job removes it later. Returns the number of tokens revoked.
+    """
+    if keep <= 0:
+        return 0
+    newest = (
+        select(RefreshToken.id)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .order_by(RefreshToken.created_at.desc(), RefreshToken.id.desc())
+        .limit(keep)
+    )
+    result = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.id.not_in(newest.scalar_subquery()),
+        )
+        .values(revoked_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+# ==============================
+# Cleanup
+# ==============================
+
+
+def delete_stale_tokens(db: Session, *, batch_size: int, revoked_retention: timedelta) -> int:
+    """Delete expired tokens and tokens revoked longer than ``revoked_retention`` ago.
+
+    Works in chunks of ``batch_size``, committing after each, so no statement
+    holds many row locks or a long transaction. Rows locked by a concurrent
+    refresh/logout (or another worker's cleanup) are skipped, not waited on.
+    Returns the number of rows deleted.
+    """
+    stale = (
+        select(RefreshToken.id)
+        .where(
+            or_(
+                RefreshToken.expires_at < func.now(),
+                RefreshToken.revoked_at < func.now() - revoked_retention,
+            )
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    deleted = 0
+    while True:
+        n = db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(stale.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        deleted += n
+        if n < batch_size:
+            return deleted
+
+
+def cleanup_refresh_tokens(db: Session) -> int:
+    return delete_stale_tokens(
+        db,
+        batch_size=max(1, settings.refresh_token_cleanup_batch_size),
+        revoked_retention=timedelta(days=settings.refresh_token_revoked_retention_days),
+    )
+
+
+async def run_refresh_token_cleanup(session_factory, stop: asyncio.Event) -> None:
+    """Delete stale refresh tokens every ``refresh_token_cleanup_interval_seconds``."""
+    interval = max(1, settings.refresh_token_cleanup_interval_seconds)
+
+    def _run():
+        db = session_factory()
+        try:
+            return cleanup_refresh_tokens(db)
+        finally:
+            db.close()
+
+    while not stop.is_set():
+        try:
+            deleted = await asyncio.to_thread(_run)
+            if deleted:
+                logger.info("Deleted %d stale refresh tokens", deleted)
+        except Exception:
+            logger.exception("Refresh token cleanup failed")
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
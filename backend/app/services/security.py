@@ -4,11 +4,9 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services import password_hashing
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
@@ -18,7 +16,7 @@ REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hashing.hash_password(password)
 
 
 def hash_token(token: str) -> str:
@@ -26,10 +24,21 @@ def hash_token(token: str) -> str:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hashing.verify_and_update(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    return password_hashing.verify_and_update(plain_password, hashed_password)
 
 
-def create_access_token(subject: str, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES):
+def create_access_token(
+    subject: str,
+    expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES,
+    *,
+    user_id: Optional[int] = None,
+):
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expires_minutes)
 
@@ -40,6 +49,9 @@ def create_access_token(subject: str, expires_minutes: int = ACCESS_TOKEN_EXPIRE
         "jti": str(uuid.uuid4()),
         "exp": expire,
     }
+    if user_id is not None:
+        # lets get_current_user look the user up by primary key
+        payload["uid"] = user_id
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -51,11 +63,28 @@ def create_refresh_token(subject: str, expires_days: int = REFRESH_TOKEN_EXPIRE_
     return token, jti, expire
 
 
-def decode_token(token: str) -> Optional[str]:
+def decode_access_token(token: str) -> Optional[dict]:
+    """Claims of a valid access token (``sub`` always set), else None."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != "access":
-            return None
-        return payload.get("sub")
     except JWTError:
         return None
+    if payload.get("type") != "access" or not payload.get("sub"):
+        return None
+    return payload
+
+
+def bearer_user_id(authorization: str) -> Optional[int]:
+    """``uid`` of the access token in an ``Authorization: Bearer`` header value, if valid.
+
+    For request plumbing (rate-limit keys, read routing) that runs before, and
+    without, the user lookup.
+    """
+    scheme, _, token = authorization.partition(" ")
+    claims = decode_access_token(token) if scheme.lower() == "bearer" and token else None
+    return claims.get("uid") if claims else None
+
+
+def decode_token(token: str) -> Optional[str]:
+    payload = decode_access_token(token)
+    return payload["sub"] if payload else None
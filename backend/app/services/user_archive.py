@@ -0,0 +1,238 @@
+"""Archive dormant users' study rows out of the hot tables, and bring them back.
+
+A user who has not studied, logged in or refreshed a session for ``dormant_days``
+still owns every ``user_card_progress``, ``daily_progress`` and ``refresh_tokens``
+row they ever made. ``archive_user`` moves those rows into one compressed
+``user_archives`` blob and sets ``users.archived_at``; ``restore_user`` puts them
+back. Restores happen on the user's next authenticated request
+(``identity.load_current_user``) or login, so archiving is invisible to them.
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+import logging
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import Table, delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_TABLES: tuple[Table, ...] = (
+    models.UserCardProgress.__table__,
+    models.DailyProgress.__table__,
+    models.RefreshToken.__table__,
+)
+
+
+# ==============================
+# Payload
+# ==============================
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"cannot archive {type(value).__name__}")
+
+
+def _pack(tables: dict[str, dict]) -> bytes:
+    raw = json.dumps(tables, default=_json_default, separators=(",", ":"))
+    return zlib.compress(raw.encode(), 6)
+
+
+def _decoder(column) -> Callable:
+    python_type = column.type.python_type
+    if python_type in (datetime, date):
+        return python_type.fromisoformat
+    if issubclass(python_type, enum.Enum):
+        return python_type
+    return lambda value: value
+
+
+def _unpack(payload: bytes) -> dict[Table, list[dict]]:
+    """Rows per table as insertable dicts; columns dropped since archiving are skipped."""
+    tables = json.loads(zlib.decompress(payload))
+    rows_by_table = {}
+    for table in ARCHIVED_TABLES:
+        data = tables.get(table.name)
+        if not data:
+            continue
+        decoders = [
+            (i, name, _decoder(table.c[name]))
+            for i, name in enumerate(data["columns"])
+            if name in table.c
+        ]
+        rows_by_table[table] = [
+            {name: None if row[i] is None else decode(row[i]) for i, name, decode in decoders}
+            for row in data["rows"]
+        ]
+    return rows_by_table
+
+
+# ==============================
+# Archive / restore
+# ==============================
+
+
+def dormant_user_ids(
+    db: Session,
+    *,
+    cutoff: datetime,
+    after: int = 0,
+    limit: Optional[int] = None,
+    among: Optional[list[int]] = None,
+) -> list[int]:
+    """Ids above ``after`` of users with rows to archive and no study, login or
+    session refresh since ``cutoff``, in order."""
+    uid = models.User.id
+    progress = models.UserCardProgress
+    daily = models.DailyProgress
+    tokens = models.RefreshToken
+    q = (
+        select(uid)
+        .where(
+            uid > after,
+            models.User.archived_at.is_(None),
+            models.User.created_at < cutoff,
+            ~exists().where(daily.user_id == uid, daily.date >= cutoff.date()),
+            ~exists().where(tokens.user_id == uid, tokens.created_at >= cutoff),
+            ~exists().where(progress.user_id == uid, progress.last_review >= cutoff),
+            exists().where(progress.user_id == uid)
+            | exists().where(daily.user_id == uid)
+            | exists().where(tokens.user_id == uid),
+        )
+        .order_by(uid)
+        .limit(limit)
+    )
+    if among is not None:
+        q = q.where(uid.in_(among))
+    return list(db.execute(q).scalars())
+
+
+def archive_user(db: Session, user_id: int, *, cutoff: Optional[datetime] = None) -> int:
+    """Move the user's rows into ``user_archives``. Returns the rows moved (0 when the
+    user is already archived or, with ``cutoff``, was active since). Does not commit."""
+    user = db.query(models.User).filter(models.User.id == user_id).with_for_update().first()
+    if user is None or user.archived_at is not None:
+        return 0
+    # the lock keeps logins out from here on; one may have happened since the scan
+    if cutoff is not None and not dormant_user_ids(db, cutoff=cutoff, among=[user_id]):
+        return 0
+
+    tables, row_count = {}, 0
+    for table in ARCHIVED_TABLES:
+        # exactly the rows deleted, even if another transaction adds one meanwhile
+        rows = db.execute(
+            delete(table).where(table.c.user_id == user_id).returning(*table.c)
+        ).all()
+        if rows:
+            tables[table.name] = {
+                "columns": list(rows[0]._fields),
+                "rows": [list(row) for row in rows],
+            }
+            row_count += len(rows)
+    if not row_count:
+        return 0
+
+    db.add(models.UserArchive(user_id=user_id, payload=_pack(tables), row_count=row_count))
+    user.archived_at = datetime.utcnow()
+    db.flush()
+    return row_count
+
+
+def restore_user(db: Session, user_id: int) -> int:
+    """Put an archived user's rows back. Returns the rows restored; 0 when there was no
+    archive (e.g. a concurrent request restored it first). Does not commit."""
+    payload = db.execute(
+        delete(models.UserArchive)
+        .where(models.UserArchive.user_id == user_id)
+        .returning(models.UserArchive.payload)
+    ).scalar()
+    db.execute(
+        update(models.User).where(models.User.id == user_id).values(archived_at=None)
+    )
+    if payload is None:
+        return 0
+
+    restored = 0
+    for table, rows in _unpack(payload).items():
+        rows = _drop_orphans(db, table, rows)
+        if rows:
+            db.execute(pg_insert(table).on_conflict_do_nothing(), rows)
+            restored += len(rows)
+    logger.info("restored user %s: %s archived rows", user_id, restored)
+    return restored
+
+
+def _drop_orphans(db: Session, table: Table, rows: list[dict]) -> list[dict]:
+    """Rows whose referenced cards or learning pairs still exist (they may have been
+    deleted while the user was archived)."""
+    for fk in table.foreign_keys:
+        column, target = fk.parent.name, fk.column
+        if target.table.name == "users" or not rows:
+            continue
+        wanted = {row[column] for row in rows if row.get(column) is not None}
+        if not wanted:
+            continue
+        present = set(db.execute(select(target).where(target.in_(wanted))).scalars())
+        rows = [row for row in rows if row.get(column) is None or row[column] in present]
+    return rows
+
+
+def archive_dormant_users(
+    db: Session,
+    *,
+    dormant_days: int = 365,
+    limit: Optional[int] = None,
+    batch_size: int = 100,
+    dry_run: bool = False,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Archive the dormant users, committing per user; ``dry_run`` only counts them.
+    Returns the users and rows archived."""
+    cutoff = datetime.utcnow() - timedelta(days=dormant_days)
+    counts = {"users": 0, "rows": 0}
+    after = 0
+    while limit is None or counts["users"] < limit:
+        take = batch_size if limit is None else min(batch_size, limit - counts["users"])
+        user_ids = dormant_user_ids(db, cutoff=cutoff, after=after, limit=take)
+        if not user_ids:
+            break
+        after = user_ids[-1]
+        if dry_run:
+            counts["users"] += len(user_ids)
+            continue
+        for user_id in user_ids:
+            try:
+                moved = archive_user(db, user_id, cutoff=cutoff)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            if moved:
+                counts["users"] += 1
+                counts["rows"] += moved
+        log(f"archived {counts['users']} users, {counts['rows']} rows")
+    return counts
+
+
+def archive_sizes(db: Session) -> dict:
+    """Archived users, rows and compressed bytes."""
+    users, rows, size = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(models.UserArchive.row_count), 0),
+            func.coalesce(func.sum(func.octet_length(models.UserArchive.payload)), 0),
+        )
+    ).one()
+    return {"users": users, "rows": int(rows), "bytes": int(size)}
@@ -0,0 +1,78 @@
+"""Helpers shared by the bulk loaders in app.tools."""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import tarfile
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+
+@contextmanager
+def open_dump(path: str) -> Iterator[io.TextIOBase]:
+    """Open a dump for streaming text reads: plain, .gz, .bz2, or a single-file .tar.bz2/.tar.gz."""
+    if path.endswith((".tar.bz2", ".tar.gz", ".tbz2", ".tgz")):
+        with tarfile.open(path, mode="r|*") as tar:
+            for member in tar:
+                if member.isfile():
+                    raw = tar.extractfile(member)
+                    yield io.TextIOWrapper(raw, encoding="utf-8", newline="\n")
+                    return
+            raise ValueError(f"{path}: archive contains no files")
+    elif path.endswith(".bz2"):
+        with bz2.open(path, "rt", encoding="utf-8", newline="\n") as f:
+            yield f
+    elif path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8", newline="\n") as f:
+            yield f
+    else:
+        with open(path, "r", encoding="utf-8", newline="\n") as f:
+            yield f
+
+
+def copy_escape(value: str) -> str:
+    """Escape a value for PostgreSQL COPY text format."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_field(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return copy_escape(value)
+    # numbers, dates and booleans never contain tabs, newlines or backslashes
+    return str(value)
+
+
+def copy_rows(
+    cursor, table: str, columns: Iterable[str], rows: Iterable[tuple], *, batch_size: int
+) -> int:
+    """COPY ``rows`` into ``table`` in batches of ``batch_size``; returns the row count.
+
+    Only one batch is held in memory, so arbitrarily large generators are fine.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    buf = io.StringIO()
+    pending = 0
+    for row in rows:
+        buf.write("\t".join(map(_copy_field, row)))
+        buf.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            buf.seek(0)
+            cursor.copy_expert(sql, buf)
+            total += pending
+            buf, pending = io.StringIO(), 0
+    if pending:
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+        total += pending
+    return total
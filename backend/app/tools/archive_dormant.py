@@ -0,0 +1,54 @@
+"""Move dormant users' study rows out of the hot tables.
+
+Usage:
+    python -m app.tools.archive_dormant --dry-run
+    python -m app.tools.archive_dormant --days 365 --limit 10000
+
+A user is dormant when they have not studied, logged in or refreshed a session for
+``--days``. Their ``user_card_progress``, ``daily_progress`` and ``refresh_tokens``
+rows go into one compressed ``user_archives`` row each (see
+``app.services.user_archive``) and come back on their next request. Each user is
+archived in its own short transaction, so the job can run while the app serves
+traffic; schedule it daily or weekly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional
+
+from ..database import SessionLocal
+from ..services.user_archive import archive_dormant_users, archive_sizes
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=365, help="inactive this long = dormant")
+    parser.add_argument("--limit", type=int, help="archive at most this many users")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dry-run", action="store_true", help="only count the dormant users")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        counts = archive_dormant_users(
+            db,
+            dormant_days=args.days,
+            limit=args.limit,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+        sizes = archive_sizes(db)
+    if args.dry_run:
+        print(f"{counts['users']} dormant users")
+    else:
+        print(f"archived {counts['users']} users ({counts['rows']} rows)")
+    print(
+        f"archive: {sizes['users']} users, {sizes['rows']} rows,"
+        f" {sizes['bytes'] / 2**20:.1f} MB compressed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Build an offline dictionary file for app.services.dictionary.
+
+Usage:
+    python -m app.tools.build_dictionary --src en --tgt ru --format tsv en-ru.tsv
+    python -m app.tools.build_dictionary --src en --tgt ru --format stardict dict/en-ru.ifo
+
+Inputs:
+    tsv       headword<TAB>translation[<TAB>...] per line (Wiktionary extracts etc.),
+              plain/.gz/.bz2; lines starting with "#" are skipped
+    stardict  the .ifo file; the .idx and .dict/.dict.dz next to it are used
+
+Entries are streamed, sorted in bounded chunks on disk and merged, so the input
+never has to fit in memory. Up to ``--max-senses`` distinct translations of the
+same headword are kept, joined with "; ". The output is written to
+``<out>/<src>-<tgt>.fcdict`` (default ``DICTIONARY_DIR``) and swapped in atomically.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import heapq
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from contextlib import ExitStack
+from typing import Iterable, Iterator, Optional
+
+from ..config import settings
+from ..services.auto_content import clean_text, norm
+from ..services.dictionary import HEADER, MAGIC, dictionary_path
+from ._streams import open_dump
+
+DEFAULT_CHUNK_SIZE = 200_000
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+# ==============================
+# Readers
+# ==============================
+
+
+def iter_tsv(path: str) -> Iterator[tuple[str, str]]:
+    with open_dump(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2:
+                yield parts[0], parts[1]
+
+
+def _first_sense(definition: str) -> str:
+    for line in _TAG_RE.sub("\n", definition).splitlines():
+        line = line.strip()
+        if line:
+            return line
+    return ""
+
+
+def _read_ifo(path: str) -> dict[str, str]:
+    info = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if "=" in line:
+                k, v = line.rstrip("\n").split("=", 1)
+                info[k.strip()] = v.strip()
+    return info
+
+
+def _iter_stardict_idx(f, offset_bits: int) -> Iterator[tuple[bytes, int, int]]:
+    tail = struct.Struct(">QI" if offset_bits == 64 else ">II")
+    buf = b""
+    eof = False
+    pos = 0
+    while True:
+        end = buf.find(b"\0", pos)
+        if end == -1 or end + 1 + tail.size > len(buf):
+            if eof:
+                return
+            chunk = f.read(1 << 20)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        word = buf[pos:end]
+        offset, size = tail.unpack_from(buf, end + 1)
+        pos = end + 1 + tail.size
+        yield word, offset, size
+
+
+def iter_stardict(ifo_path: str) -> Iterator[tuple[str, str]]:
+    base = ifo_path[: -len(".ifo")] if ifo_path.endswith(".ifo") else ifo_path
+    info = _read_ifo(base + ".ifo")
+    offset_bits = int(info.get("idxoffsetbits", "32"))
+
+    with ExitStack() as stack:
+        if os.path.exists(base + ".idx"):
+            idx = stack.enter_context(open(base + ".idx", "rb"))
+        else:
+            idx = stack.enter_context(gzip.open(base + ".idx.gz", "rb"))
+
+        if os.path.exists(base + ".dict"):
+            data = stack.enter_context(open(base + ".dict", "rb"))
+        else:
+            # dictzip is gzip-compatible; unpack once so definitions can be read by offset
+            data = stack.enter_context(tempfile.TemporaryFile())
+            with gzip.open(base + ".dict.dz", "rb") as dz:
+                shutil.copyfileobj(dz, data, 1 << 20)
+
+        for word, offset, size in _iter_stardict_idx(idx, offset_bits):
+            data.seek(offset)
+            sense = _first_sense(data.read(size).decode("utf-8", errors="replace"))
+            if sense:
+                yield word.decode("utf-8", errors="replace"), sense
+
+
+# ==============================
+# Build (external sort + merge)
+# ==============================
+
+
+def _flat(value: str) -> str:
+    return clean_text(value.replace("\t", " ").replace("\n", " "))
+
+
+def _write_chunk(entries: list[tuple[bytes, bytes]], tmpdir: str) -> str:
+    entries.sort()
+    fd, path = tempfile.mkstemp(dir=tmpdir, suffix=".chunk")
+    with os.fdopen(fd, "wb") as f:
+        for key, value in entries:
+            f.write(key + b"\t" + value + b"\n")
+    return path
+
+
+def _chunk_lines(path: str) -> Iterator[tuple[bytes, bytes]]:
+    with open(path, "rb") as f:
+        for line in f:
+            key, value = line.rstrip(b"\n").split(b"\t", 1)
+            yield key, value
+
+
+def build_dictionary(
+    entries: Iterable[tuple[str, str]],
+    out_path: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_senses: int = 3,
+) -> int:
+    """Write ``entries`` (headword, translation) to ``out_path``; returns the headword count."""
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(out_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmpdir:
+        chunks: list[str] = []
+        pending: list[tuple[bytes, bytes]] = []
+        for headword, translation in entries:
+            key = norm(headword)
+            value = _flat(translation or "")
+            if not key or not value:
+                continue
+            pending.append((key.encode("utf-8"), value.encode("utf-8")))
+            if len(pending) >= chunk_size:
+                chunks.append(_write_chunk(pending, tmpdir))
+                pending = []
+        if pending:
+            chunks.append(_write_chunk(pending, tmpdir))
+
+        offsets = array("Q")
+        data_path = os.path.join(tmpdir, "data")
+        with open(data_path, "wb") as data:
+            merged = heapq.merge(*(_chunk_lines(p) for p in chunks), key=lambda kv: kv[0])
+            current: Optional[bytes] = None
+            senses: list[bytes] = []
+
+            def flush():
+                offsets.append(data.tell())
+                data.write(current + b"\t" + b"; ".join(senses) + b"\n")
+
+            for key, value in merged:
+                if key != current:
+                    if current is not None:
+                        flush()
+                    current, senses = key, []
+                if len(senses) < max_senses and value not in senses:
+                    senses.append(value)
+            if current is not None:
+                flush()
+
+        tmp_out = os.path.join(tmpdir, "out")
+        with open(tmp_out, "wb") as out, open(data_path, "rb") as data:
+            out.write(HEADER.pack(MAGIC, len(offsets)))
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            offsets.tofile(out)
+            shutil.copyfileobj(data, out, 1 << 20)
+        os.replace(tmp_out, out_path)
+
+    return len(offsets)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="TSV file or StarDict .ifo")
+    parser.add_argument("--src", required=True, help="source language code, e.g. en")
+    parser.add_argument("--tgt", required=True, help="target language code, e.g. ru")
+    parser.add_argument("--format", choices=("tsv", "stardict"), default="tsv")
+    parser.add_argument("--out", default=settings.dictionary_dir, help="output directory")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-senses", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if not args.out:
+        parser.error("--out is required when DICTIONARY_DIR is not set")
+
+    reader = iter_tsv if args.format == "tsv" else iter_stardict
+    out_path = dictionary_path(args.out, args.src, args.tgt)
+    started = time.monotonic()
+    count = build_dictionary(
+        reader(args.input), out_path, chunk_size=args.chunk_size, max_senses=args.max_senses
+    )
+    print(f"{out_path}: {count} headwords in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
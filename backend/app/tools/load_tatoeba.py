@@ -0,0 +1,153 @@
+"""Load Tatoeba sentence/link dumps into the local example corpus.
+
+Usage:
+    python -m app.tools.load_tatoeba --sentences sentences.tar.bz2 --links links.tar.bz2
+    python -m app.tools.load_tatoeba --sentences sentences.csv --links links.csv --langs eng,rus
+
+Dumps: https://tatoeba.org/en/downloads (``sentences.csv``: id<TAB>lang<TAB>text,
+``links.csv``: sentence_id<TAB>translation_id). Files are streamed and COPYed in
+batches, so multi-million-row dumps load in bounded memory.
+
+The load replaces the whole corpus in one transaction. ``TRUNCATE`` locks the
+tables until it commits, so run it off-peak or with ``EXAMPLE_CORPUS_MODE=remote``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Iterator, Optional
+
+from sqlalchemy.schema import CreateIndex
+
+from .. import models
+from ..database import engine
+from ..services.auto_content import ISO2_TO_TATOEBA
+from ._streams import copy_rows, open_dump
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def iter_sentences(path: str, langs: Optional[set[str]]) -> Iterator[tuple[int, str, str]]:
+    with open_dump(path) as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t", 2)
+            if len(parts) != 3:
+                continue
+            sid, lang, text = parts
+            if langs is not None and lang not in langs:
+                continue
+            text = text.strip()
+            if not sid.isdigit() or not text:
+                continue
+            yield int(sid), lang, text
+
+
+def iter_links(path: str) -> Iterator[tuple[int, int]]:
+    with open_dump(path) as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 2 or not parts[0].isdigit() or not parts[1].isdigit():
+                continue
+            yield int(parts[0]), int(parts[1])
+
+
+def load_corpus(
+    *,
+    sentences_path: str,
+    links_path: str,
+    langs: Optional[set[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    bind=None,
+    log=print,
+) -> dict[str, int]:
+    bind = bind or engine
+    sentences = models.CorpusSentence.__table__
+    links = models.CorpusLink.__table__
+
+    raw = bind.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("TRUNCATE corpus_links, corpus_sentences")
+        # building the GIN index once at the end is much cheaper than maintaining it per row
+        for index in sentences.indexes:
+            cur.execute(f"DROP INDEX IF EXISTS {index.name}")
+
+        started = time.monotonic()
+        n_sentences = copy_rows(
+            cur,
+            "corpus_sentences",
+            ("id", "lang", "text"),
+            iter_sentences(sentences_path, langs),
+            batch_size=batch_size,
+        )
+        log(f"sentences: {n_sentences} rows in {time.monotonic() - started:.1f}s")
+
+        started = time.monotonic()
+        cur.execute(
+            "CREATE TEMP TABLE corpus_links_stage "
+            "(sentence_id integer, translation_id integer) ON COMMIT DROP"
+        )
+        n_staged = copy_rows(
+            cur,
+            "corpus_links_stage",
+            ("sentence_id", "translation_id"),
+            iter_links(links_path),
+            batch_size=batch_size,
+        )
+        # keep only links whose both ends were loaded
+        cur.execute(
+            """
+            INSERT INTO corpus_links (sentence_id, translation_id)
+            SELECT DISTINCT l.sentence_id, l.translation_id
+            FROM corpus_links_stage l
+            JOIN corpus_sentences a ON a.id = l.sentence_id
+            JOIN corpus_sentences b ON b.id = l.translation_id
+            """
+        )
+        n_links = cur.rowcount
+        log(f"links: {n_links} of {n_staged} kept in {time.monotonic() - started:.1f}s")
+
+        started = time.monotonic()
+        for index in sentences.indexes:
+            cur.execute(str(CreateIndex(index).compile(dialect=bind.dialect)))
+        cur.execute(f"ANALYZE {sentences.name}")
+        cur.execute(f"ANALYZE {links.name}")
+        log(f"indexes: built in {time.monotonic() - started:.1f}s")
+
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    return {"sentences": n_sentences, "links": n_links}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sentences", required=True, help="sentences.csv (or .bz2/.tar.bz2)")
+    parser.add_argument("--links", required=True, help="links.csv (or .bz2/.tar.bz2)")
+    parser.add_argument(
+        "--langs",
+        default=",".join(sorted(set(ISO2_TO_TATOEBA.values()))),
+        help="comma-separated ISO 639-3 codes to keep, or 'all' (default: supported languages)",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    langs = None if args.langs == "all" else {x.strip() for x in args.langs.split(",") if x.strip()}
+    counts = load_corpus(
+        sentences_path=args.sentences,
+        links_path=args.links,
+        langs=langs,
+        batch_size=args.batch_size,
+    )
+    print(f"loaded {counts['sentences']} sentences, {counts['links']} links")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,645 @@
+"""Generate a synthetic dataset: users, pairs, decks, cards, study progress, history.
+
+Usage:
+    python -m app.tools.seed --seed 1 --users 2000 --cards-per-user 500
+    python -m app.tools.seed --seed 2 --users 50000 --cards-per-user 400 --jobs 8
+
+Rows are generated as streams and COPYed in batches, never through the ORM. Ids
+are assigned up front, so everything follows from ``SeedSpec``: the same spec
+against the same database yields the same rows (dates are relative to
+``--today``). Seeded users are ``seed<seed>-u<n>`` (light) and ``seed<seed>-h<n>``
+(heavy), all with the password ``SEED_PASSWORD``; library decks belong to
+``seed<seed>-admin``.
+
+By default the secondary indexes and the foreign-key/unique constraints of the
+seeded tables are dropped for the load and rebuilt at the end, as pg_restore
+does. That is far faster for large seeds but locks the tables: use it on a
+benchmark database, not one serving traffic (or pass ``--keep-indexes``). With
+``--jobs`` > 1 the users are split across processes that each commit their
+share, so a failed run leaves partial data behind.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, time, timedelta
+from time import monotonic
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, text
+
+from ..database import engine
+from ..services.security import hash_password
+from ._streams import copy_rows
+
+DEFAULT_BATCH_SIZE = 50_000
+SEED_PASSWORD = "seed-password"
+# tables whose ids the seed assigns itself (the others keep their sequence defaults)
+ASSIGNED_IDS = ("users", "user_learning_pairs", "decks", "reading_sources", "cards")
+
+# ==============================
+# Spec and layout
+# ==============================
+
+
+@dataclass
+class SeedSpec:
+    seed: int = 1
+    users: int = 1000  # light users
+    cards_per_user: int = 300  # light users: 0.5x..1.5x this many
+    heavy_users: int = 5
+    cards_per_heavy_user: int = 20_000
+    library_decks: int = 4
+    cards_per_library_deck: int = 500
+    progress_share: float = 0.8  # share of a user's cards that have been studied
+    history_days: int = 365
+    today: date = field(default_factory=date.today)
+
+    @property
+    def prefix(self) -> str:
+        return f"seed{self.seed}"
+
+
+@dataclass
+class _UserPlan:
+    user_id: int
+    username: str
+    heavy: bool
+    pair_id: int
+    main_deck_id: int
+    users_deck_id: Optional[int]
+    first_source_id: int
+    sources: int
+    first_card_id: int
+    cards: int  # main deck; the users deck (if any) follows with users_deck_cards
+    users_deck_cards: int
+
+
+@dataclass
+class _Layout:
+    src_lang_id: int
+    tgt_lang_id: int
+    admin_id: int
+    users: list[_UserPlan]
+    library_decks: list[tuple[int, int, int]]  # deck id, first card id, cards
+    shared: bool = True  # this share of the work also writes the admin and library rows
+
+
+def _rng(spec: SeedSpec, *parts) -> random.Random:
+    # str seeds hash deterministically (unlike hash() of tuples)
+    return random.Random(":".join(str(p) for p in (spec.seed, *parts)))
+
+
+def _next_id(conn, table: str) -> int:
+    return int(conn.execute(text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")).scalar())
+
+
+def _languages(conn) -> tuple[int, int]:
+    ids = []
+    for name, code in (("English", "en"), ("Russian", "ru")):
+        found = conn.execute(text("SELECT id FROM languages WHERE code = :c"), {"c": code})
+        lang_id = found.scalar()
+        if lang_id is None:
+            lang_id = conn.execute(
+                text("INSERT INTO languages (name, code) VALUES (:n, :c) RETURNING id"),
+                {"n": name, "c": code},
+            ).scalar()
+        ids.append(lang_id)
+    return ids[0], ids[1]
+
+
+def plan_layout(conn, spec: SeedSpec) -> _Layout:
+    """Assign every id up front, so the table streams can reference each other."""
+    src, tgt = _languages(conn)
+    ids = {t: _next_id(conn, t) for t in ASSIGNED_IDS}
+
+    def take(table: str, n: int = 1) -> int:
+        first = ids[table]
+        ids[table] += n
+        return first
+
+    admin_id = take("users")
+    plans = []
+    accounts = [(f"{spec.prefix}-h{i}", True) for i in range(spec.heavy_users)]
+    accounts += [(f"{spec.prefix}-u{i}", False) for i in range(spec.users)]
+    for username, heavy in accounts:
+        rng = _rng(spec, "user", username)
+        if heavy:
+            cards = spec.cards_per_heavy_user
+        else:
+            cards = max(1, int(spec.cards_per_user * rng.uniform(0.5, 1.5)))
+        sources = min(50, 1 + cards // 200)
+        has_users_deck = rng.random() < 0.3
+        users_deck_cards = max(1, cards // 10) if has_users_deck else 0
+        plans.append(
+            _UserPlan(
+                user_id=take("users"),
+                username=username,
+                heavy=heavy,
+                pair_id=take("user_learning_pairs"),
+                main_deck_id=take("decks"),
+                users_deck_id=take("decks") if has_users_deck else None,
+                first_source_id=take("reading_sources", sources),
+                sources=sources,
+                first_card_id=take("cards", cards + users_deck_cards),
+                cards=cards,
+                users_deck_cards=users_deck_cards,
+            )
+        )
+
+    library = [
+        (take("decks"), take("cards", spec.cards_per_library_deck), spec.cards_per_library_deck)
+        for _ in range(spec.library_decks)
+    ]
+    return _Layout(src, tgt, admin_id, plans, library)
+
+
+def _split(layout: _Layout, jobs: int) -> list[_Layout]:
+    # round-robin, so the heavy users (listed first) spread over the jobs
+    return [
+        replace(layout, users=layout.users[i::jobs], shared=i == 0)
+        for i in range(min(jobs, max(1, len(layout.users))))
+    ]
+
+
+# ==============================
+# Text
+# ==============================
+
+# consonant + vowel, all the same length: concatenations never collide
+_LATIN = [c + v for c in "bdfghklmnprstvwyz" for v in "aeiou"]
+_CYRILLIC = (
+    "ба ве ги до ель жи за ка ло ми но па ро сы ту фе ха це чи ша щу юн яр ст ность ние"
+).split()
+
+
+def _word(n: int) -> str:
+    """A distinct pronounceable word for every n >= 0 (bijective base-len(_LATIN))."""
+    out = []
+    n += 1
+    while n:
+        n, r = divmod(n - 1, len(_LATIN))
+        out.append(_LATIN[r])
+    return "".join(reversed(out))
+
+
+def _text_pools() -> tuple[list[str], list[str], list[tuple[str, str]]]:
+    # built once and indexed per card: composing text per row is what made large
+    # seeds slow. Fixed seed, so the pools are identical in every process.
+    rng = random.Random(0)
+
+    def words(lo: int, hi: int) -> str:
+        return " ".join(_word(rng.randrange(5000)) for _ in range(rng.randint(lo, hi)))
+
+    extra = [_word(rng.randrange(2000)) for _ in range(1024)]
+    backs = [
+        " ".join(
+            "".join(rng.choice(_CYRILLIC) for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(1, 3))
+        )
+        for _ in range(4096)
+    ]
+    # example sentences: "<head> <front> <tail>", 3-16 words in all
+    sentences = [
+        (words(1, 7).capitalize(), words(1, 8) + rng.choice(".!?.")) for _ in range(4096)
+    ]
+    return extra, backs, sentences
+
+
+_EXTRA_WORDS, _BACKS, _SENTENCES = _text_pools()
+
+
+def _recent(rng: random.Random, now: datetime, days: int) -> datetime:
+    """A moment in the last ``days`` days, weighted towards the recent end."""
+    return now - timedelta(seconds=int(min(days, rng.expovariate(3 / days)) * 86400))
+
+
+# ==============================
+# Row streams
+# ==============================
+
+
+def _users(spec, layout, password_hash, now) -> Iterator[tuple]:
+    if layout.shared:
+        yield (layout.admin_id, f"{spec.prefix}-admin", password_hash, False, now, 20, 7)
+    for p in layout.users:
+        rng = _rng(spec, "profile", p.username)
+        created = now - timedelta(days=rng.randint(1, spec.history_days))
+        target = rng.choice((10, 20, 30, 50))
+        yield (p.user_id, p.username, password_hash, False, created, target, 7)
+
+
+def _pairs(spec, layout, now) -> Iterator[tuple]:
+    for p in layout.users:
+        yield (p.pair_id, p.user_id, layout.src_lang_id, layout.tgt_lang_id, True, now)
+
+
+def _decks(spec, layout, now) -> Iterator[tuple]:
+    src, tgt = layout.src_lang_id, layout.tgt_lang_id
+    for p in layout.users:
+        yield (p.main_deck_id, "Main", p.user_id, False, "DRAFT", "MAIN", src, tgt)
+        if p.users_deck_id is not None:
+            yield (p.users_deck_id, "Saved words", p.user_id, False, "DRAFT", "USERS", src, tgt)
+    if layout.shared:
+        for i, (deck_id, _, _) in enumerate(layout.library_decks):
+            name = f"Library {i + 1}"
+            yield (deck_id, name, layout.admin_id, True, "PUBLISHED", "LIBRARY", src, tgt)
+
+
+def _deck_access(spec, layout, now) -> Iterator[tuple]:
+    for p in layout.users:
+        yield (p.main_deck_id, p.user_id, "OWNER")
+        if p.users_deck_id is not None:
+            yield (p.users_deck_id, p.user_id, "OWNER")
+    if layout.shared:
+        for deck_id, _, _ in layout.library_decks:
+            yield (deck_id, layout.admin_id, "OWNER")
+
+
+def _sources(spec, layout, now) -> Iterator[tuple]:
+    kinds = ("book", "book", "book", "article", "subtitles")
+    for p in layout.users:
+        rng = _rng(spec, "sources", p.username)
+        for i in range(p.sources):
+            title = " ".join(_word(rng.randrange(20000)) for _ in range(rng.randint(1, 5))).title()
+            author = f"{_word(rng.randrange(3000)).title()} {_word(rng.randrange(3000)).title()}"
+            # the index keeps (user, pair, title, author) unique
+            title = f"{title} {i + 1}"
+            created = _recent(rng, now, spec.history_days)
+            yield (
+                p.first_source_id + i, p.user_id, p.pair_id, title, title.lower(),
+                author, author.lower(), rng.choice(kinds), None, created, created,
+            )
+
+
+def _card_rows(rng, first_card_id, deck_id, count, now, days, sources=None) -> Iterator[tuple]:
+    """``sources``: (first source id, count) to link ~70% of the cards to."""
+    r = rng.random
+    offset = len(_LATIN)  # two syllables at least
+    for n in range(count):
+        front = _word(offset + n)
+        kind = "word"
+        if r() < 0.15:
+            front = f"{front} {_EXTRA_WORDS[int(r() * len(_EXTRA_WORDS))]}"
+            kind = "phrase"
+        example = None
+        if r() < 0.6:
+            head, tail = _SENTENCES[int(r() * len(_SENTENCES))]
+            example = f"{head} {front} {tail}"
+        source_id = source_title = sentence = None
+        if sources is not None and r() < 0.7:
+            source_id = sources[0] + int(r() * sources[1])
+            source_title = f"source {source_id}"
+            if r() < 0.3:
+                head, tail = _SENTENCES[int(r() * len(_SENTENCES))]
+                sentence = f"{head} {front} {tail}"
+        yield (
+            first_card_id + n, front, front, _BACKS[int(r() * len(_BACKS))], example, kind,
+            source_title, None, None, sentence, None, None, _recent(rng, now, days), deck_id,
+            source_id,
+        )
+
+
+def _cards(spec, layout, now) -> Iterator[tuple]:
+    days = spec.history_days
+    for p in layout.users:
+        rng = _rng(spec, "cards", p.username)
+        yield from _card_rows(
+            rng, p.first_card_id, p.main_deck_id, p.cards, now, days, (p.first_source_id, p.sources)
+        )
+        if p.users_deck_id is not None:
+            yield from _card_rows(
+                rng, p.first_card_id + p.cards, p.users_deck_id, p.users_deck_cards, now, days
+            )
+    if layout.shared:
+        for deck_id, first_card_id, cards in layout.library_decks:
+            rng = _rng(spec, "library", deck_id)
+            yield from _card_rows(rng, first_card_id, deck_id, cards, now, 1)
+
+
+def _progress(spec, layout, now) -> Iterator[tuple]:
+    """Studied main-deck cards: ~20% new (answered wrong before a first success),
+    ~50% learning (stages 1-5, skewed low, many due), ~30% mastered."""
+    hours = {1: 5 / 60, 2: 1, 3: 5, 4: 14, 5: 24}
+    intervals = {stage: timedelta(hours=h) for stage, h in hours.items()}
+    retry = timedelta(seconds=60)
+    share = spec.progress_share
+    for p in layout.users:
+        rng = _rng(spec, "progress", p.username)
+        r, randint = rng.random, rng.randint
+        for n in range(p.cards):
+            if r() >= share:
+                continue
+            last = _recent(rng, now, spec.history_days)
+            roll = r()
+            if roll < 0.2:
+                status, stage, due = "new", None, last + retry
+                seen, correct = randint(1, 3), 0
+            elif roll < 0.7:
+                stage = min(5, 1 + int(rng.expovariate(0.8)))
+                status, due = "learning", last + intervals[stage]
+                seen, correct = stage + randint(0, 6), stage
+            else:
+                status, stage, due = "mastered", 5, None
+                seen = 5 + randint(0, 8)
+                correct = 5 + randint(0, seen - 5)
+            yield (p.user_id, p.first_card_id + n, seen, correct, last, status, stage, due)
+
+
+def _daily(spec, layout, now) -> Iterator[tuple]:
+    for p in layout.users:
+        rng = _rng(spec, "daily", p.username)
+        active = 0.9 if p.heavy else 0.4
+        top = 80 if p.heavy else 30
+        for back in range(spec.history_days, -1, -1):
+            if rng.random() >= active:
+                continue
+            reviews, new = rng.randint(0, top), rng.randint(0, 10)
+            day = spec.today - timedelta(days=back)
+            yield (p.user_id, p.pair_id, day, reviews + new, reviews, new)
+
+
+# table -> (columns, row stream); parents first
+TABLES = {
+    "users": (
+        (
+            "id", "username", "hashed_password", "email_verified", "created_at",
+            "daily_card_target", "daily_new_target",
+        ),
+        _users,
+    ),
+    "user_learning_pairs": (
+        ("id", "user_id", "source_language_id", "target_language_id", "is_default", "created_at"),
+        _pairs,
+    ),
+    "decks": (
+        (
+            "id", "name", "owner_id", "is_public", "status", "deck_type",
+            "source_language_id", "target_language_id",
+        ),
+        _decks,
+    ),
+    "deck_access": (("deck_id", "user_id", "role"), _deck_access),
+    "reading_sources": (
+        (
+            "id", "user_id", "pair_id", "title", "title_norm", "author", "author_norm", "kind",
+            "reference", "created_at", "updated_at",
+        ),
+        _sources,
+    ),
+    "cards": (
+        (
+            "id", "front", "front_norm", "back", "example_sentence", "content_kind",
+            "source_title", "source_author", "source_reference", "source_sentence",
+            "source_page", "context_note", "created_at", "deck_id", "reading_source_id",
+        ),
+        _cards,
+    ),
+    "user_card_progress": (
+        (
+            "user_id", "card_id", "times_seen", "times_correct", "last_review", "status",
+            "stage", "due_at",
+        ),
+        _progress,
+    ),
+    "daily_progress": (
+        ("user_id", "learning_pair_id", "date", "cards_done", "reviews_done", "new_done"),
+        _daily,
+    ),
+}
+
+
+def iter_rows(
+    spec: SeedSpec, layout: _Layout, table: str, password_hash: str = ""
+) -> Iterator[tuple]:
+    now = datetime.combine(spec.today, time(12))
+    _, stream = TABLES[table]
+    if table == "users":
+        return stream(spec, layout, password_hash, now)
+    return stream(spec, layout, now)
+
+
+# ==============================
+# Deferred indexes and constraints
+# ==============================
+
+
+def _deferrable(cur, tables: list[str]) -> tuple[list[str], list[str]]:
+    """DROP and CREATE statements for the secondary indexes and FK/unique constraints."""
+    cur.execute(
+        """
+        SELECT c.conrelid::regclass::text, c.conname, pg_get_constraintdef(c.oid), c.contype
+        FROM pg_constraint c
+        WHERE c.conrelid = ANY(%(tables)s::regclass[]) AND c.contype IN ('f', 'u')
+        ORDER BY c.contype, c.conname
+        """,
+        {"tables": tables},
+    )
+    constraints = cur.fetchall()  # FKs ('f') sort first
+    cur.execute(
+        """
+        SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = ANY(%(tables)s::regclass[]) AND NOT i.indisprimary
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+        ORDER BY 1
+        """,
+        {"tables": tables},
+    )
+    indexes = cur.fetchall()
+
+    drops = [f"ALTER TABLE {t} DROP CONSTRAINT {name}" for t, name, _, _ in constraints]
+    drops += [f"DROP INDEX {name}" for name, _ in indexes]
+    # a partitioned table's index is defined ON ONLY the parent; without ONLY it is
+    # built on every partition again
+    creates = [ddl.replace(" ON ONLY ", " ON ", 1) for _, ddl in indexes]
+    creates += [
+        f"ALTER TABLE {t} ADD CONSTRAINT {name} {ddl}" for t, name, ddl, _ in reversed(constraints)
+    ]
+    return drops, creates
+
+
+def _run(cur, statements: list[str]) -> None:
+    for statement in statements:
+        cur.execute(statement)
+
+
+# ==============================
+# Load
+# ==============================
+
+
+def _load_share(url: str, spec: SeedSpec, layout: _Layout, password_hash: str, batch_size: int):
+    """One job: COPY every table for ``layout.users`` over its own connection."""
+    bind = create_engine(url, pool_size=1)
+    raw = bind.raw_connection()
+    try:
+        cur = raw.cursor()
+        counts = {}
+        for table, (columns, _) in TABLES.items():
+            rows = iter_rows(spec, layout, table, password_hash)
+            counts[table] = copy_rows(cur, table, columns, rows, batch_size=batch_size)
+        raw.commit()
+        return counts
+    finally:
+        raw.close()
+        bind.dispose()
+
+
+def seed_dataset(
+    spec: SeedSpec,
+    *,
+    bind=None,
+    jobs: int = 1,
+    defer_indexes: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    log=print,
+) -> dict[str, int]:
+    """COPY the dataset of ``spec`` into the (migrated) database; returns rows per table."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        if conn.execute(
+            text("SELECT 1 FROM users WHERE username = :u"), {"u": f"{spec.prefix}-admin"}
+        ).first():
+            raise ValueError(f"{spec.prefix} is already seeded; use another seed")
+        layout = plan_layout(conn, spec)
+    password_hash = hash_password(SEED_PASSWORD)
+    tables = list(TABLES)
+    counts = dict.fromkeys(tables, 0)
+
+    raw = bind.raw_connection()
+    try:
+        cur = raw.cursor()
+        drops, creates = _deferrable(cur, tables) if defer_indexes else ([], [])
+        _run(cur, drops)
+
+        if jobs <= 1:
+            # one transaction: a failed seed leaves nothing behind
+            for table, (columns, _) in TABLES.items():
+                started = monotonic()
+                rows = iter_rows(spec, layout, table, password_hash)
+                counts[table] = copy_rows(cur, table, columns, rows, batch_size=batch_size)
+                log(f"{table}: {counts[table]:,} rows in {monotonic() - started:.1f}s")
+        else:
+            raw.commit()  # the jobs load over their own connections
+            started = monotonic()
+            url = bind.url.render_as_string(hide_password=False)
+            shares = _split(layout, jobs)
+            try:
+                with ProcessPoolExecutor(len(shares)) as pool:
+                    futures = [
+                        pool.submit(_load_share, url, spec, share, password_hash, batch_size)
+                        for share in shares
+                    ]
+                    for future in futures:
+                        for table, n in future.result().items():
+                            counts[table] += n
+            except Exception:
+                log("load failed; restoring indexes and constraints")
+                _run(cur, creates)
+                raw.commit()
+                raise
+            elapsed = monotonic() - started
+            log(f"{sum(counts.values()):,} rows by {len(shares)} jobs in {elapsed:.1f}s")
+
+        started = monotonic()
+        cur.execute("SET maintenance_work_mem = '256MB'")
+        _run(cur, creates)
+        if creates:
+            log(f"{len(creates)} indexes and constraints rebuilt in {monotonic() - started:.1f}s")
+        # ids were assigned here, not by the sequences
+        for table in ASSIGNED_IDS:
+            cur.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT coalesce(max(id), 1) FROM {table}))"
+            )
+        cur.execute(f"ANALYZE {', '.join(tables)}")
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return counts
+
+
+def seeded_users(conn, spec_seed: int, *, heavy: Optional[bool] = None) -> list[dict]:
+    """Seeded users with their main deck and its seeded card id range, for load drivers.
+
+    Seeded cards have consecutive ids; cards added later (by a load run) do not, so
+    the range is the first run of consecutive ids in the deck.
+    """
+    pattern = {None: "%", True: "h%", False: "u%"}[heavy]
+    rows = conn.execute(
+        text(
+            """
+            WITH runs AS (
+                SELECT u.id AS user_id, u.username, d.id AS deck_id, c.id AS card_id,
+                       c.id - row_number() OVER (PARTITION BY d.id ORDER BY c.id) AS run
+                FROM users u
+                JOIN decks d ON d.owner_id = u.id AND d.deck_type = 'MAIN'
+                JOIN cards c ON c.deck_id = d.id
+                WHERE u.username LIKE :p
+            )
+            SELECT DISTINCT ON (user_id) user_id AS id, username, deck_id,
+                   min(card_id) AS first_card_id, max(card_id) AS last_card_id
+            FROM runs
+            GROUP BY user_id, username, deck_id, run
+            ORDER BY user_id, min(card_id)
+            """
+        ),
+        {"p": f"seed{spec_seed}-{pattern}"},
+    )
+    return [dict(r._mapping) for r in rows]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    defaults = SeedSpec()
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--users", type=int, default=defaults.users, help="light users")
+    parser.add_argument("--cards-per-user", type=int, default=defaults.cards_per_user)
+    parser.add_argument("--heavy-users", type=int, default=defaults.heavy_users)
+    parser.add_argument("--cards-per-heavy-user", type=int, default=defaults.cards_per_heavy_user)
+    parser.add_argument("--library-decks", type=int, default=defaults.library_decks)
+    parser.add_argument(
+        "--cards-per-library-deck", type=int, default=defaults.cards_per_library_deck
+    )
+    parser.add_argument("--progress-share", type=float, default=defaults.progress_share)
+    parser.add_argument("--history-days", type=int, default=defaults.history_days)
+    parser.add_argument(
+        "--today", type=date.fromisoformat, default=defaults.today, help="YYYY-MM-DD"
+    )
+    parser.add_argument("--jobs", type=int, default=1, help="parallel COPY processes")
+    parser.add_argument(
+        "--keep-indexes", action="store_true", help="maintain indexes and constraints while loading"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    spec = SeedSpec(
+        seed=args.seed,
+        users=args.users,
+        cards_per_user=args.cards_per_user,
+        heavy_users=args.heavy_users,
+        cards_per_heavy_user=args.cards_per_heavy_user,
+        library_decks=args.library_decks,
+        cards_per_library_deck=args.cards_per_library_deck,
+        progress_share=args.progress_share,
+        history_days=args.history_days,
+        today=args.today,
+    )
+    started = monotonic()
+    counts = seed_dataset(
+        spec, jobs=args.jobs, defer_indexes=not args.keep_indexes, batch_size=args.batch_size
+    )
+    print(f"seeded {sum(counts.values()):,} rows in {monotonic() - started:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
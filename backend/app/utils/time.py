@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 BISHKEK_TZ = ZoneInfo("Asia/Bishkek")
@@ -21,3 +21,15 @@ def bishkek_day_bounds(d: date) -> tuple[datetime, datetime]:
     start = datetime.combine(d, time.min, tzinfo=BISHKEK_TZ)
     end = start + timedelta(days=1)
     return start, end
+
+
+def bishkek_day_bounds_utc(d: date) -> tuple[datetime, datetime]:
+    """
+    ``bishkek_day_bounds`` as naive UTC datetimes, for comparing with naive UTC
+    columns (``created_at = datetime.utcnow()``) on any driver.
+    """
+    start, end = bishkek_day_bounds(d)
+    return (
+        start.astimezone(timezone.utc).replace(tzinfo=None),
+        end.astimezone(timezone.utc).replace(tzinfo=None),
+    )
@@ -0,0 +1 @@
+"""Standalone benchmarks: ``python -m benchmarks.<name> --help`` (run from backend/)."""
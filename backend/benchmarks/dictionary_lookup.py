@@ -0,0 +1,70 @@
+"""Lookup throughput of the memory-mapped offline dictionary.
+
+    python -m benchmarks.dictionary_lookup --entries 1000000 --lookups 200000
+
+Builds a synthetic dictionary with app.tools.build_dictionary (or uses ``--file``)
+and reports build time, file size and lookups per second for hits and misses.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from app.services.dictionary import MmapDictionary
+from app.tools.build_dictionary import build_dictionary
+
+
+def _word(rng: random.Random, i: int) -> str:
+    stem = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+    return f"{stem}{i}"
+
+
+def _measure(d: MmapDictionary, keys: list[str]) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        d.get(key)
+    return len(keys) / (time.perf_counter() - started)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--file", help="benchmark an existing .fcdict instead of building one")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            path = args.file
+            d = MmapDictionary(path)
+            # sample existing keys by walking the offset table
+            hit_keys = []
+            for i in (rng.randrange(len(d)) for _ in range(min(args.lookups, len(d)))):
+                start, tab = d._entry(i)
+                hit_keys.append(d._mm[start:tab].decode("utf-8"))
+        else:
+            path = os.path.join(tmp, "bench.fcdict")
+            words = [_word(rng, i) for i in range(args.entries)]
+            started = time.perf_counter()
+            build_dictionary(((w, f"tr-{w}") for w in words), path)
+            print(f"build: {args.entries} entries in {time.perf_counter() - started:.2f}s")
+            d = MmapDictionary(path)
+            hit_keys = [rng.choice(words) for _ in range(args.lookups)]
+
+        miss_keys = [f"zz-missing-{i}" for i in range(len(hit_keys))]
+        print(f"file: {os.path.getsize(path) / 1e6:.1f} MB, {len(d)} headwords")
+        print(f"hits:   {_measure(d, hit_keys):>12,.0f} lookups/s")
+        print(f"misses: {_measure(d, miss_keys):>12,.0f} lookups/s")
+        d.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
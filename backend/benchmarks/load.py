@@ -0,0 +1,295 @@
+"""Seeded load test: a realistic request mix over a production-sized dataset.
+
+    python -m benchmarks.load --seed 1 --users 2000 --cards-per-user 500 --seconds 60
+    python -m benchmarks.load --seed 1 --skip-seed --compare benchmarks/results/load-<...>.json
+
+Seeds ``--users`` light users (``--cards-per-user`` cards each, on average) and
+``--heavy-users`` users with ``--cards-per-heavy-user`` cards through
+``app.tools.seed`` (skipped when the seed is already present), starts
+``uvicorn app.main:app`` in a subprocess, then drives a weighted mix of study,
+answer, progress, deck, reading-source and bulk-import requests at
+``--concurrency`` for ``--seconds``. A tenth of the requests go to heavy users.
+
+Prints p50/p95/p99 and throughput per scenario and writes them, with the dataset
+spec and git commit, to ``benchmarks/results/load-<timestamp>.json``; ``--compare``
+prints the change against an earlier result file.
+
+Needs a migrated database at DATABASE_URL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+RESULTS_DIR = Path(__file__).parent / "results"
+HEAVY_SHARE = 0.1
+
+# name -> weight; roughly what the web client sends during a study session
+SCENARIOS = {
+    "study next": 30,
+    "study answer": 35,
+    "progress summary": 10,
+    "deck cards": 10,
+    "reading sources": 10,
+    "inbox bulk": 5,
+}
+
+
+# ==============================
+# Dataset
+# ==============================
+
+
+def _ensure_dataset(spec, skip_seed: bool, jobs: int) -> tuple[list[dict], list[dict]]:
+    from app.database import engine
+    from app.tools.seed import seed_dataset, seeded_users
+
+    with engine.connect() as conn:
+        light = seeded_users(conn, spec.seed, heavy=False)
+    if not light and not skip_seed:
+        started = time.perf_counter()
+        seed_dataset(spec, jobs=jobs)
+        print(f"seeded in {time.perf_counter() - started:.0f}s")
+    with engine.connect() as conn:
+        light = seeded_users(conn, spec.seed, heavy=False)
+        heavy = seeded_users(conn, spec.seed, heavy=True)
+    if not light:
+        raise SystemExit(f"seed {spec.seed} is not in the database; drop --skip-seed")
+    return light, heavy
+
+
+def _with_tokens(users: list[dict]) -> list[dict]:
+    from app.services.security import create_access_token
+
+    for u in users:
+        token = create_access_token(u["username"], expires_minutes=24 * 60, user_id=u["id"])
+        u["headers"] = {"Authorization": f"Bearer {token}"}
+    return users
+
+
+# ==============================
+# Requests
+# ==============================
+
+
+def _request(name: str, user: dict, rng: random.Random, tag: str) -> tuple[str, str, dict]:
+    deck_id = user["deck_id"]
+    if name == "study next":
+        return "GET", f"/api/v1/study/decks/{deck_id}/next", {}
+    if name == "study answer":
+        card_id = rng.randint(user["first_card_id"], user["last_card_id"])
+        return "POST", f"/api/v1/study/{card_id}", {"json": {"learned": rng.random() < 0.8}}
+    if name == "progress summary":
+        return "GET", "/api/v1/progress/summary", {}
+    if name == "deck cards":
+        return "GET", f"/api/v1/decks/{deck_id}/cards?limit=50&offset={rng.randrange(0, 200)}", {}
+    if name == "reading sources":
+        return "GET", "/api/v1/reading-sources?include_stats=true", {}
+    if name == "inbox bulk":
+        # ``tag`` is unique per request, so every line is a new card
+        lines = "\n".join(f"{tag}x{i} - перевод {i}" for i in range(20))
+        return "POST", "/api/v1/inbox/bulk", {"json": {"text": lines, "delimiter": "-"}}
+    raise ValueError(name)
+
+
+def _summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        if not latencies:
+            return 0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+    }
+
+
+async def _drive(
+    base: str,
+    light: list[dict],
+    heavy: list[dict],
+    scenarios: dict[str, int],
+    concurrency: int,
+    seconds: float,
+    seed: int,
+) -> dict[str, dict]:
+    latencies: dict[str, list[float]] = {name: [] for name in scenarios}
+    errors = dict.fromkeys(scenarios, 0)
+    names, weights = list(scenarios), list(scenarios.values())
+    run_tag = int(time.time())
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as c:
+
+        async def worker(n: int):
+            rng = random.Random(f"{seed}:{n}")
+            counter = 0
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                users = heavy if heavy and rng.random() < HEAVY_SHARE else light
+                user = rng.choice(users)
+                counter += 1
+                tag = f"load{run_tag}w{n}r{counter}"
+                method, path, kwargs = _request(name, user, rng, tag)
+                started = time.perf_counter()
+                try:
+                    r = await c.request(method, path, headers=user["headers"], **kwargs)
+                except httpx.TimeoutException:
+                    errors[name] += 1
+                    continue
+                if r.status_code < 400:
+                    latencies[name].append(time.perf_counter() - started)
+                else:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    results = {name: _summarize(latencies[name], errors[name], elapsed) for name in scenarios}
+    results["all"] = _summarize(
+        [x for values in latencies.values() for x in values], sum(errors.values()), elapsed
+    )
+    return results
+
+
+# ==============================
+# Reporting
+# ==============================
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _print_results(results: dict[str, dict], baseline: dict[str, dict] | None) -> None:
+    header = f"{'scenario':<18}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+    print(header + ("   vs baseline (p95, req/s)" if baseline else ""))
+    for name, r in results.items():
+        line = (
+            f"{name:<18}{r['rps']:>9.0f}{r['p50']:>9.1f}{r['p95']:>9.1f}"
+            f"{r['p99']:>9.1f}{r['errors']:>8}"
+        )
+        base = (baseline or {}).get(name)
+        if base and base["p95"] and base["rps"]:
+            line += (
+                f"   {(r['p95'] / base['p95'] - 1) * 100:+6.1f}%"
+                f" {(r['rps'] / base['rps'] - 1) * 100:+6.1f}%"
+            )
+        print(line)
+
+
+def main(argv=None) -> int:
+    from app.tools.seed import SeedSpec
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--cards-per-user", type=int, default=500)
+    parser.add_argument("--heavy-users", type=int, default=10)
+    parser.add_argument("--cards-per-heavy-user", type=int, default=20_000)
+    parser.add_argument("--skip-seed", action="store_true", help="fail instead of seeding")
+    parser.add_argument("--seed-jobs", type=int, default=1, help="parallel COPY processes")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="only these (repeatable)"
+    )
+    parser.add_argument("--compare", type=Path, help="an earlier results file")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    spec = SeedSpec(
+        seed=args.seed,
+        users=args.users,
+        cards_per_user=args.cards_per_user,
+        heavy_users=args.heavy_users,
+        cards_per_heavy_user=args.cards_per_heavy_user,
+    )
+    light, heavy = _ensure_dataset(spec, args.skip_seed, args.seed_jobs)
+    light, heavy = _with_tokens(light), _with_tokens(heavy)
+    scenarios = {name: SCENARIOS[name] for name in args.scenario or SCENARIOS}
+    baseline = json.loads(args.compare.read_text())["results"] if args.compare else None
+
+    base = f"http://127.0.0.1:{args.port}"
+    env = dict(
+        os.environ,
+        DEBUG="false",
+        CONTENT_CACHE_MAINTENANCE_ENABLED="false",
+        RATE_LIMIT_INBOX_BULK="1000000/minute",
+    )
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+            "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    try:
+        for _ in range(200):
+            try:
+                if httpx.get(f"{base}/api/v1/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise SystemExit("server did not start")
+
+        results = asyncio.run(
+            _drive(base, light, heavy, scenarios, args.concurrency, args.seconds, args.seed)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    _print_results(results, baseline)
+    output = args.output or RESULTS_DIR / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    spec_out = {k: str(v) if k == "today" else v for k, v in asdict(spec).items()}
+    run = {
+        "commit": _git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "spec": spec_out,
+        "args": {
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "seconds": args.seconds,
+            "light_users": len(light),
+            "heavy_users": len(heavy),
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(run, indent=2) + "\n")
+    print(f"results: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+"""Login throughput and collateral latency with bcrypt inline vs in the process pool.
+
+    python -m benchmarks.login_throughput --workers 0 2 --rounds 12 --concurrency 16 --seconds 10
+
+For every ``--workers`` value (PASSWORD_HASH_WORKERS; 0 = bcrypt in the request
+thread) a one-worker uvicorn is started, one user is registered, and
+``--concurrency`` clients log in back to back for ``--seconds`` while a single
+probe client polls /health. Reported: logins/s and the probe's latency, i.e. how
+much a login storm slows down everything else.
+
+Needs a migrated database at DATABASE_URL; a ``bench-*`` user is added per run.
+The server runs with APP_ENV=test so the per-IP login rate limit does not apply.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import secrets
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def _pct(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+async def _storm(base: str, username: str, concurrency: int, seconds: float) -> dict:
+    logins: list[float] = []
+    probes: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    creds = {"username": username, "password": "bench1234"}
+
+    async with httpx.AsyncClient(base_url=base, timeout=60) as c:
+
+        async def login_loop():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                r = await c.post("/api/v1/auth/login-json", json=creds)
+                if r.status_code == 200:
+                    logins.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await c.get("/api/v1/health")
+                probes.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        started = time.perf_counter()
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "logins_per_s": len(logins) / elapsed,
+        "login_p50": _pct(logins, 0.50),
+        "login_p99": _pct(logins, 0.99),
+        "probe_p50": _pct(probes, 0.50),
+        "probe_p99": _pct(probes, 0.99),
+        "errors": errors,
+    }
+
+
+def _run(args, workers: int) -> dict:
+    base = f"http://127.0.0.1:{args.port}"
+    env = dict(
+        os.environ,
+        APP_ENV="test",
+        DEBUG="false",
+        PASSWORD_HASH_WORKERS=str(workers),
+        PASSWORD_HASH_ROUNDS=str(args.rounds),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                if httpx.get(f"{base}/api/v1/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise SystemExit("server did not start")
+
+        username = f"bench-{secrets.token_hex(4)}"
+        httpx.post(
+            f"{base}/api/v1/auth/register",
+            json={"username": username, "password": "bench1234"},
+            timeout=60,
+        ).raise_for_status()
+        return asyncio.run(_storm(base, username, args.concurrency, args.seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'workers':>7}{'logins/s':>10}{'login p50':>11}{'login p99':>11}"
+        f"{'probe p50':>11}{'probe p99':>11}{'errors':>8}  (ms)"
+    )
+    for workers in args.workers:
+        r = _run(args, workers)
+        print(
+            f"{workers:>7}{r['logins_per_s']:>10.1f}{r['login_p50']:>11.0f}{r['login_p99']:>11.0f}"
+            f"{r['probe_p50']:>11.1f}{r['probe_p99']:>11.1f}{r['errors']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
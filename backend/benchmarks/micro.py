@@ -0,0 +1,105 @@
+"""Microbenchmarks for the pure functions on the per-request and per-line paths.
+
+    python -m benchmarks.micro                 # compare with benchmarks/baselines/micro.json
+    python -m benchmarks.micro --check         # exit 1 when a case is over the tolerance
+    python -m benchmarks.micro --save          # record the current timings as the baselines
+
+Each case is timed with ``timeit`` (best of ``--repeat`` rounds of at least 0.2 s)
+and reported in nanoseconds per call. Baselines are machine-specific: record them
+on the machine that checks them. Imports the app, so DATABASE_URL must be set
+(no connection is made).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+BASELINES = Path(__file__).parent / "baselines" / "micro.json"
+
+# a pasted word list: mixed delimiters, stray whitespace, comments and blanks
+PASTE_LINES = [
+    f"  Word{i}  \t{'—' if i % 3 else ':'}  слово {i}  " if i % 17 else "# section"
+    for i in range(1000)
+]
+PASTE_LINES[::50] = [""] * len(PASTE_LINES[::50])
+FRONTS = [f"  Some   Phrase {i}\tWith  Spaces " for i in range(1000)]
+
+
+def _cases() -> dict[str, Callable[[], object]]:
+    from app import crud, models
+    from app.routers.reading_sources import _memory_strength_from_progress
+    from app.services import auto_content, srs
+    from app.services.inbox_service import _split_line
+
+    now = datetime(2026, 1, 1)
+    learning = models.ProgressStatus.LEARNING
+    example = "  The cat   sleeps on the mat.  \n  Кот   спит на коврике. "
+    return {
+        "normalize_front": lambda: crud.normalize_front("  Some   Phrase\tWith Spaces "),
+        "normalize_front x1000": lambda: [crud.normalize_front(f) for f in FRONTS],
+        "normalize_fronts x1000": lambda: crud.normalize_fronts(FRONTS),
+        "auto_content.norm": lambda: auto_content.norm("  Some   Phrase\tWith Spaces "),
+        "clean_example": lambda: auto_content.clean_example(example),
+        "_split_line auto": lambda: _split_line("  apple — яблоко  ", None),
+        "_split_line fixed": lambda: _split_line("  apple ; яблоко  ", ";"),
+        "_split_line x1000": lambda: [_split_line(line, None) for line in PASTE_LINES],
+        "compute_next_review_state": lambda: srs.compute_next_review_state(
+            status=learning, stage=3, learned=True, now=now
+        ),
+        "compute_next_review_state str": lambda: srs.compute_next_review_state(
+            status="new", stage=None, learned=False, now=now
+        ),
+        "_memory_strength_from_progress": lambda: _memory_strength_from_progress("learning", 3),
+    }
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()  # enough calls for >= 0.2 s
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed slowdown factor")
+    parser.add_argument("--check", action="store_true", help="fail on a slowdown")
+    parser.add_argument("--save", action="store_true", help="record the baselines")
+    parser.add_argument("-k", dest="match", default="", help="only cases containing this")
+    args = parser.parse_args(argv)
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    results = {
+        name: _time(fn, args.repeat) for name, fn in _cases().items() if args.match in name
+    }
+
+    slower = []
+    print(f"{'case':<34}{'ns/call':>14}{'baseline':>14}{'ratio':>8}")
+    for name, ns in results.items():
+        base = baselines.get(name)
+        ratio = ns / base if base else None
+        if ratio is not None and ratio > args.tolerance:
+            slower.append(name)
+        print(
+            f"{name:<34}{ns:>14,.0f}"
+            + (f"{base:>14,.0f}{ratio:>8.2f}" if base else f"{'-':>14}{'-':>8}")
+        )
+
+    if args.save:
+        baselines.update({name: round(ns, 1) for name, ns in results.items()})
+        BASELINES.parent.mkdir(parents=True, exist_ok=True)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"baselines: {BASELINES}")
+    if args.check and slower:
+        print(f"slower than {args.tolerance}x baseline: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
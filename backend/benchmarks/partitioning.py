@@ -0,0 +1,315 @@
+"""user_card_progress at scale: one heap table against hash partitions by user_id.
+
+    python -m benchmarks.partitioning                       # 100M rows, 200k users
+    python -m benchmarks.partitioning --rows 2000000 --users 4000
+    python -m benchmarks.partitioning --skip-load --iterations 5000
+
+Builds two copies of ``user_card_progress`` with the production columns and
+indexes in the ``bench_partitioning`` schema: ``plain`` (one table) and ``hashed``
+(``--partitions`` hash partitions by user_id, as migration 8f3a6c2d9e14 builds
+it). Rows are interleaved across users the way answers arrive, so one user's rows
+are spread over the heap. Loading and indexing are timed per layout: the index
+build is the bulk of the migration's run time.
+
+Then runs the study queries for random users against both layouts, alternating
+between them, and prints p50/p95 per query, table and index sizes, and how many
+partitions each query plan reads with a literal user id and with a generic plan
+(as prepared statements get from asyncpg after five runs). Results go to
+``benchmarks/results/partitioning-<timestamp>.json``.
+
+At the default 100M rows the two layouts take about 40 GB of disk together;
+``--keep`` leaves the schema for later ``--skip-load`` runs. Needs a database at
+DATABASE_URL (the app's tables are not touched).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.load import _git_commit, _summarize
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SCHEMA = "bench_partitioning"
+LAYOUTS = ("plain", "hashed")
+
+COLUMNS = """
+    id integer NOT NULL,
+    user_id integer NOT NULL,
+    card_id integer NOT NULL,
+    times_seen integer,
+    times_correct integer,
+    last_review timestamp,
+    status varchar(8) NOT NULL,
+    stage integer,
+    due_at timestamp
+"""
+
+# the indexes and constraints of user_card_progress; {t} is the table
+INDEXES = [
+    "ALTER TABLE {t} ADD PRIMARY KEY ({pk})",
+    "ALTER TABLE {t} ADD UNIQUE (user_id, card_id)",
+    "CREATE INDEX ON {t} (card_id)",
+    "CREATE INDEX ON {t} (due_at)",
+    "CREATE INDEX ON {t} (id)",
+    "CREATE INDEX ON {t} (user_id, due_at)",
+    "CREATE INDEX ON {t} (user_id)",
+]
+
+# %(user)s / %(card)s are filled per iteration; writes are rolled back
+QUERIES = {
+    "due reviews": """
+        SELECT id, card_id, stage, due_at FROM {t}
+        WHERE user_id = %(user)s AND status = 'learning' AND due_at <= now()
+        ORDER BY due_at LIMIT 20
+    """,
+    "status counts": """
+        SELECT status, count(id) FROM {t} WHERE user_id = %(user)s GROUP BY status
+    """,
+    "next due": """
+        SELECT min(due_at) FROM {t}
+        WHERE user_id = %(user)s AND status = 'learning' AND due_at IS NOT NULL
+    """,
+    "progress row": """
+        SELECT * FROM {t} WHERE user_id = %(user)s AND card_id = %(card)s
+    """,
+    "answer": """
+        UPDATE {t} SET times_seen = times_seen + 1, last_review = now()
+        WHERE user_id = %(user)s AND card_id = %(card)s
+    """,
+}
+
+
+# ==============================
+# Dataset
+# ==============================
+
+
+def _table(layout: str) -> str:
+    return f"{SCHEMA}.{layout}"
+
+
+def _load(conn, layout: str, rows: int, users: int, partitions: int, chunk: int) -> dict:
+    """Create, fill and index one layout; returns the timings in seconds."""
+    t = _table(layout)
+    cur = conn.cursor()
+    cur.execute(f"DROP TABLE IF EXISTS {t}")
+    if layout == "hashed":
+        cur.execute(f"CREATE TABLE {t} ({COLUMNS}) PARTITION BY HASH (user_id)")
+        for remainder in range(partitions):
+            cur.execute(
+                f"CREATE TABLE {t}_p{remainder} PARTITION OF {t} "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+    else:
+        cur.execute(f"CREATE TABLE {t} ({COLUMNS})")
+    conn.commit()
+
+    started = time.perf_counter()
+    for lo in range(1, rows + 1, chunk):
+        hi = min(rows, lo + chunk - 1)
+        # g-th answer overall: users take turns; 70% learning, 20% mastered, 10% new
+        cur.execute(
+            f"""
+            INSERT INTO {t}
+            SELECT g, (g - 1) %% %(users)s + 1, g, 1 + g %% 9, g %% 7,
+                   now() - (g %% 500) * interval '1 day',
+                   CASE WHEN g %% 10 < 7 THEN 'learning' WHEN g %% 10 < 9 THEN 'mastered'
+                        ELSE 'new' END,
+                   CASE WHEN g %% 10 < 7 THEN 1 + g %% 5 END,
+                   CASE WHEN g %% 10 < 7
+                        THEN now() + ((g * 37) %% 20000 - 10000) * interval '1 minute'
+                        WHEN g %% 10 = 9 THEN now() END
+            FROM generate_series(%(lo)s, %(hi)s) g
+            """,
+            {"users": users, "lo": lo, "hi": hi},
+        )
+        conn.commit()
+        print(f"  {layout}: {hi:,} / {rows:,} rows", flush=True)
+    loaded = time.perf_counter()
+
+    cur.execute("SET maintenance_work_mem = '256MB'")
+    pk = "id, user_id" if layout == "hashed" else "id"
+    for ddl in INDEXES:
+        cur.execute(ddl.format(t=t, pk=pk))
+    cur.execute(f"ANALYZE {t}")
+    conn.commit()
+    indexed = time.perf_counter()
+    return {"load_s": loaded - started, "index_s": indexed - loaded}
+
+
+def _sizes(conn, layout: str) -> dict:
+    """Table and index bytes over the layout's relations, and its largest single index."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        WITH rels AS (
+            SELECT %(t)s::regclass AS rel
+            UNION ALL
+            SELECT inhrelid FROM pg_inherits WHERE inhparent = %(t)s::regclass
+        )
+        SELECT coalesce(sum(pg_table_size(r.rel)), 0)::bigint,
+               coalesce(sum(pg_indexes_size(r.rel)), 0)::bigint,
+               (SELECT max(pg_relation_size(i.indexrelid))
+                FROM pg_index i JOIN rels ON i.indrelid = rels.rel)
+        FROM rels r
+        """,
+        {"t": _table(layout)},
+    )
+    table, indexes, largest = cur.fetchone()
+    return {"table_bytes": table, "index_bytes": indexes, "largest_index_bytes": largest}
+
+
+# ==============================
+# Queries
+# ==============================
+
+
+def _partitions_read(conn, sql: str, params: dict, generic: bool) -> int:
+    """Partitions the plan of ``sql`` reads; ``generic``: those left after run-time pruning."""
+    cur = conn.cursor()
+    if not generic:
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cur.fetchone()[0][0]["Plan"]
+    else:
+        cur.execute("SET plan_cache_mode = force_generic_plan")
+        cur.execute(
+            "PREPARE bench_q AS " + sql.replace("%(user)s", "$1").replace("%(card)s", "$2::int")
+        )
+        cur.execute(
+            "EXPLAIN (ANALYZE, FORMAT JSON) EXECUTE bench_q (%(user)s"
+            + (", %(card)s)" if "%(card)s" in sql else ")"),
+            params,
+        )
+        plan = cur.fetchone()[0][0]["Plan"]
+        cur.execute("DEALLOCATE bench_q")
+        cur.execute("RESET plan_cache_mode")
+    conn.rollback()
+
+    def relations(node):
+        if node.get("Relation Name") and node["Node Type"] != "ModifyTable":
+            yield node["Relation Name"]
+        for child in node.get("Plans", ()):
+            yield from relations(child)
+
+    return len(set(relations(plan)))
+
+
+def _run_queries(conn, users: int, rows: int, iterations: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    cur = conn.cursor()
+    latencies = {(q, layout): [] for q in QUERIES for layout in LAYOUTS}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        user = rng.randint(1, users)
+        # card ids of a user are user, user + users, user + 2 * users, ...
+        card = user + users * rng.randrange(max(1, rows // users))
+        params = {"user": user, "card": card}
+        for name, sql in QUERIES.items():
+            for layout in LAYOUTS if rng.random() < 0.5 else reversed(LAYOUTS):
+                t0 = time.perf_counter()
+                cur.execute(sql.format(t=_table(layout)), params)
+                if cur.description:
+                    cur.fetchall()
+                conn.rollback()
+                latencies[name, layout].append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for name, sql in QUERIES.items():
+        params = {"user": 1, "card": 1}
+        for layout in LAYOUTS:
+            r = _summarize(latencies[name, layout], 0, elapsed)
+            del r["errors"], r["rps"]  # one connection, queries alternate: no throughput
+            r["partitions"] = _partitions_read(conn, sql.format(t=_table(layout)), params, False)
+            r["partitions_generic"] = _partitions_read(
+                conn, sql.format(t=_table(layout)), params, True
+            )
+            results[f"{name} [{layout}]"] = r
+    return results
+
+
+# ==============================
+# Reporting
+# ==============================
+
+
+def _print_results(results: dict[str, dict], build: dict[str, dict]) -> None:
+    print(
+        f"{'layout':<8}{'load s':>9}{'index s':>9}{'table GB':>10}{'index GB':>10}"
+        f"{'max index MB':>14}"
+    )
+    for layout, b in build.items():
+        print(
+            f"{layout:<8}{b.get('load_s', 0):>9.0f}{b.get('index_s', 0):>9.0f}"
+            f"{b['table_bytes'] / 2**30:>10.2f}{b['index_bytes'] / 2**30:>10.2f}"
+            f"{b['largest_index_bytes'] / 2**20:>14.0f}"
+        )
+    print()
+    print(f"{'query':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'partitions':>12}{'generic':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<24}{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}"
+            f"{r['partitions']:>12}{r['partitions_generic']:>9}"
+        )
+
+
+def main(argv=None) -> int:
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000_000)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--chunk", type=int, default=5_000_000, help="rows per INSERT")
+    parser.add_argument("--iterations", type=int, default=2000, help="random users per query")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the kept tables")
+    parser.add_argument("--keep", action="store_true", help="do not drop the schema at the end")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        build: dict[str, dict] = {}
+        if not args.skip_load:
+            cur.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+            conn.commit()
+            for layout in LAYOUTS:
+                build[layout] = _load(
+                    conn, layout, args.rows, args.users, args.partitions, args.chunk
+                )
+        for layout in LAYOUTS:
+            build.setdefault(layout, {}).update(_sizes(conn, layout))
+        conn.commit()
+
+        results = _run_queries(conn, args.users, args.rows, args.iterations, args.seed)
+        if not args.keep:
+            cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+            conn.commit()
+    finally:
+        conn.close()
+        engine.dispose()
+
+    _print_results(results, build)
+    output = args.output or RESULTS_DIR / f"partitioning-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    run = {
+        "commit": _git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "args": {k: v for k, v in vars(args).items() if k != "output"},
+        "build": build,
+        "results": results,
+    }
+    output.write_text(json.dumps(run, indent=2) + "\n")
+    print(f"results: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
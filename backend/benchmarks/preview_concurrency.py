@@ -0,0 +1,113 @@
+"""Event-loop responsiveness of /auto/preview under a slow database.
+
+    python -m benchmarks.preview_concurrency --previews 200 --concurrency 50 --query-ms 20
+
+Runs ``get_preview_no_save_async`` for many distinct fronts at once, with every
+SQL statement delayed by ``--query-ms`` (a stand-in for a loaded Postgres) and
+providers answering after ``--provider-ms``. A ticker coroutine measures how
+late the event loop wakes it up. Two modes are compared:
+
+    inline      cache/corpus lookups run on the event loop (the old behaviour)
+    threadpool  they run through run_in_threadpool (current code)
+
+Needs a migrated database at DATABASE_URL; nothing is written to it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.services import auto_content
+
+TICK = 0.005
+
+
+async def _inline(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+async def _ticker(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def _run(engine, args, mode: str) -> dict:
+    auto_content.clear_memory_caches()
+    auto_content.reset_provider_breakers()
+    en = models.Language(id=10**9, name="English", code="en")
+    ru = models.Language(id=10**9 + 1, name="Russian", code="ru")
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int):
+        async with sem:
+            with Session(bind=engine) as db:
+                await auto_content.get_preview_no_save_async(
+                    db, src_lang=en, tgt_lang=ru, text_raw=f"{mode}-front-{i}"
+                )
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.ensure_future(_ticker(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.previews)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    lags.sort()
+    return {
+        "previews_per_s": args.previews / elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--previews", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=20.0)
+    parser.add_argument("--provider-ms", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(
+        settings.resolved_database_url, pool_size=args.concurrency, max_overflow=0
+    )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _slow_query(*_):
+        time.sleep(args.query_ms / 1000)
+
+    async def provider(**kwargs):
+        await asyncio.sleep(args.provider_ms / 1000)
+        return "ok"
+
+    auto_content.fetch_mymemory_translation_async = provider
+    auto_content.fetch_tatoeba_example_async = provider
+
+    real_offload = auto_content.run_in_threadpool
+    print(f"{'mode':<11}{'previews/s':>12}{'lag p50':>10}{'lag p99':>10}{'lag max':>10}  (ms)")
+    for mode in ("inline", "threadpool"):
+        auto_content.run_in_threadpool = _inline if mode == "inline" else real_offload
+        r = asyncio.run(_run(engine, args, mode))
+        print(
+            f"{mode:<11}{r['previews_per_s']:>12.1f}{r['lag_p50_ms']:>10.1f}"
+            f"{r['lag_p99_ms']:>10.1f}{r['lag_max_ms']:>10.1f}"
+        )
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
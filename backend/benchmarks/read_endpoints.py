@@ -0,0 +1,218 @@
+"""Requests/sec of one uvicorn worker: async-session reads vs the old sync handlers.
+
+    python -m benchmarks.read_endpoints --cards 200 --concurrency 64 --seconds 10
+
+Starts ``uvicorn app.main:app`` (one worker) in a subprocess with sync twins of
+the ported read endpoints mounted under ``/bench/sync`` (the handlers as they were
+before: ``def`` + ``get_db``, i.e. one threadpool thread per request), seeds one
+user with a main deck of ``--cards`` cards, then drives each endpoint at
+``--concurrency`` for ``--seconds`` and prints throughput and latency percentiles.
+
+Needs a migrated database at DATABASE_URL; a ``bench-*`` user is added to it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import secrets
+import subprocess
+import sys
+import time
+
+import httpx
+
+SYNC_PREFIX = "/bench/sync"
+
+
+# ==============================
+# Server side
+# ==============================
+
+
+def _serve(port: int) -> None:
+    import uvicorn
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+
+    from app import crud, schemas
+    from app.database import get_db
+    from app.deps import get_current_user
+    from app.main import app
+    from app.services.progress_service import build_progress_summary
+    from app.services.study_service import status_for_main_deck
+
+    @app.get(f"{SYNC_PREFIX}/progress/summary")
+    def sync_summary(
+        deck_id: int | None = None,
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db),
+    ):
+        return build_progress_summary(db, current_user, deck_id=deck_id)
+
+    @app.get(f"{SYNC_PREFIX}/study/decks/{{deck_id}}/status")
+    def sync_status(
+        deck_id: int, current_user=Depends(get_current_user), db: Session = Depends(get_db)
+    ):
+        return status_for_main_deck(
+            db,
+            user_id=current_user.id,
+            deck_id=deck_id,
+            max_new_per_day=10,
+            max_reviews_per_day=100,
+        )
+
+    @app.get(
+        f"{SYNC_PREFIX}/decks/{{deck_id}}/cards",
+        response_model=schemas.Page[schemas.CardWithStatusOut],
+    )
+    def sync_cards(
+        deck_id: int,
+        limit: int = 50,
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db),
+    ):
+        items, total = crud.list_deck_cards(db, deck_id, current_user.id, limit=limit, offset=0)
+        return {
+            "items": items,
+            "meta": {"limit": limit, "offset": 0, "total": total, "has_more": limit < total},
+        }
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", workers=1)
+
+
+# ==============================
+# Client side
+# ==============================
+
+
+def _seed(base: str, cards: int) -> tuple[dict, int]:
+    from app import models
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        ids = []
+        for name, code in (("English", "en"), ("Russian", "ru")):
+            lang = db.query(models.Language).filter_by(code=code).first()
+            if lang is None:
+                lang = models.Language(name=name, code=code)
+                db.add(lang)
+                db.flush()
+            ids.append(lang.id)
+        db.commit()
+
+    with httpx.Client(base_url=base, timeout=30) as c:
+        username = f"bench-{secrets.token_hex(4)}"
+        r = c.post("/api/v1/auth/register", json={"username": username, "password": "bench1234"})
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        c.put(
+            "/api/v1/users/me/languages",
+            json={"default_source_language_id": ids[0], "default_target_language_id": ids[1]},
+            headers=headers,
+        ).raise_for_status()
+        decks = c.get("/api/v1/decks", headers=headers).json()["items"]
+        deck_id = next(d["id"] for d in decks if d["deck_type"] == "main")
+        for i in range(cards):
+            r = c.post(
+                f"/api/v1/decks/{deck_id}/cards",
+                json={"front": f"word{i}", "back": f"слово{i}", "example_sentence": f"ex {i}"},
+                headers=headers,
+            )
+            assert r.status_code == 201, r.text
+    return headers, deck_id
+
+
+async def _drive(base: str, path: str, headers: dict, concurrency: int, seconds: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base, headers=headers, limits=limits, timeout=10) as c:
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    r = await c.get(path)
+                except httpx.TimeoutException:
+                    errors += 1
+                    continue
+                if r.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "errors": errors,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        _serve(args.port)
+        return 0
+
+    base = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, DEBUG="false", CONTENT_CACHE_MAINTENANCE_ENABLED="false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.read_endpoints", "--serve", "--port", str(args.port)],
+        env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                if httpx.get(f"{base}/api/v1/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise SystemExit("server did not start")
+
+        headers, deck_id = _seed(base, args.cards)
+        endpoints = [
+            ("progress summary", f"/progress/summary?deck_id={deck_id}"),
+            ("study status", f"/study/decks/{deck_id}/status"),
+            ("deck cards", f"/decks/{deck_id}/cards?limit=50"),
+        ]
+        print(f"{'endpoint':<18}{'stack':<7}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for name, path in endpoints:
+            for stack, prefix in (("sync", SYNC_PREFIX), ("async", "/api/v1")):
+                r = asyncio.run(
+                    _drive(base, prefix + path, headers, args.concurrency, args.seconds)
+                )
+                print(
+                    f"{name:<18}{stack:<7}{r['rps']:>9.0f}{r['p50']:>9.1f}"
+                    f"{r['p99']:>9.1f}{r['errors']:>8}"
+                )
+    finally:
+        server.terminate()
+        server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
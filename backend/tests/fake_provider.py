@@ -0,0 +1,71 @@
+"""A local stand-in for MyMemory and Tatoeba with injectable latency and errors."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeProvider:
+    def __init__(self):
+        self.latency = 0.0
+        self.status = 200
+        self.translation = "кот"
+        self.example = ("The cat sleeps.", "Кот спит.")
+        self.calls = 0
+        self._lock = threading.Lock()
+
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with provider._lock:
+                    provider.calls += 1
+                if provider.latency:
+                    time.sleep(provider.latency)
+
+                if provider.status != 200:
+                    self.send_response(provider.status)
+                    self.end_headers()
+                    return
+
+                path = urlparse(self.path).path
+                query = parse_qs(urlparse(self.path).query)
+                if path == "/mymemory/get":
+                    body = {"responseData": {"translatedText": provider.translation}}
+                else:
+                    src, tgt = provider.example
+                    body = {
+                        "results": [
+                            {"text": src, "translations": [{"text": tgt}]}
+                        ]
+                        if query.get("query")
+                        else []
+                    }
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
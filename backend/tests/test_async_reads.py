@@ -0,0 +1,53 @@
+from datetime import date, datetime
+
+from app.database import get_db
+from app.main import app
+from app.utils.time import bishkek_day_bounds_utc
+
+
+def test_read_endpoints_run_on_the_async_session(client, make_deck_with_cards, token_headers):
+    deck_id, _ = make_deck_with_cards(n=3)
+
+    def no_sync_db():
+        raise AssertionError("read endpoint used the sync session")
+        yield
+
+    app.dependency_overrides[get_db] = no_sync_db
+
+    for url in (
+        "/api/v1/decks",
+        f"/api/v1/decks/{deck_id}/cards",
+        f"/api/v1/study/decks/{deck_id}/status",
+        f"/api/v1/progress/summary?deck_id={deck_id}",
+        "/api/v1/library/decks",
+    ):
+        r = client.get(url, headers=token_headers)
+        assert r.status_code == 200, (url, r.text)
+
+    cards = client.get(f"/api/v1/decks/{deck_id}/cards", headers=token_headers).json()
+    assert cards["meta"]["total"] == 3
+    assert {c["status"] for c in cards["items"]} == {"new"}
+
+    summary = client.get(
+        f"/api/v1/progress/summary?deck_id={deck_id}", headers=token_headers
+    ).json()
+    assert summary["today_added_cards"] == 3
+    assert summary["new_available_count"] == 3
+
+
+def test_read_endpoint_errors_keep_their_status_codes(client, make_deck_with_cards, token_headers):
+    make_deck_with_cards(n=1)
+
+    assert client.get("/api/v1/decks/999999/cards", headers=token_headers).status_code == 403
+    assert (
+        client.get("/api/v1/study/decks/999999/status", headers=token_headers).status_code == 404
+    )
+    assert client.get("/api/v1/decks", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+
+def test_bishkek_day_bounds_utc_are_naive_utc():
+    start, end = bishkek_day_bounds_utc(date(2026, 3, 1))
+    # Asia/Bishkek is UTC+6
+    assert start == datetime(2026, 2, 28, 18, 0)
+    assert end == datetime(2026, 3, 1, 18, 0)
+    assert start.tzinfo is None
@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 
 from app import models
+from app.config import settings
 from app.services import auto_content
 from tests.conftest import (
     admin_create_language,
@@ -120,3 +123,141 @@ def test_auto_preview_allows_missing_example(client, monkeypatch, setup_user_pai
 
     assert data["suggested_back"] == "перевод"
     assert data["suggested_example_sentence"] is None
+
+
+def test_auto_preview_batch_uses_cache_and_fetches_misses(
+    client, db_session, monkeypatch, setup_user_pair
+):
+    en_id, ru_id, token = setup_user_pair
+    db_session.add(
+        models.TranslationCache(
+            src_language_id=en_id,
+            tgt_language_id=ru_id,
+            source_text="dog",
+            source_text_norm="dog",
+            translated_text="собака",
+            provider="dictionary",
+        )
+    )
+    db_session.commit()
+
+    seen = []
+
+    async def fake_tr_async(*, text: str, src_code: str, tgt_code: str):
+        seen.append(text)
+        return {"cat": "кот", "bird": "птица"}.get(text.lower())
+
+    async def fake_ex_async(*, query: str, src_code: str, tgt_code: str):
+        return None
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation_async", fake_tr_async)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example_async", fake_ex_async)
+
+    r = client.post(
+        "/api/v1/auto/preview/batch",
+        json={
+            "fronts": ["dog", "cat", "", "Cat", "bird"],
+            "source_language_id": en_id,
+            "target_language_id": ru_id,
+        },
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert data["timed_out"] is False
+    assert [i["front"] for i in data["items"]] == ["dog", "cat", "Cat", "bird"]
+    assert [i["suggested_back"] for i in data["items"]] == ["собака", "кот", "кот", "птица"]
+    assert data["items"][0]["cached"]["translation"] is True
+    assert data["items"][1]["cached"]["translation"] is False
+    # the provider is the one that produced the text, cached or not
+    assert [i["provider"]["translation"] for i in data["items"]] == [
+        "dictionary",
+        "mymemory",
+        "mymemory",
+        "mymemory",
+    ]
+    assert [i["provider"]["example"] for i in data["items"]] == [None] * 4
+    assert all(i["complete"] for i in data["items"])
+    # cached front skipped, duplicates fetched once
+    assert sorted(seen) == ["bird", "cat"]
+    assert db_session.query(models.TranslationCache).count() == 1
+
+
+def test_auto_preview_batch_returns_partial_results_after_deadline(
+    client, monkeypatch, setup_user_pair
+):
+    en_id, ru_id, token = setup_user_pair
+
+    async def fake_tr_async(*, text: str, src_code: str, tgt_code: str):
+        if text == "slow":
+            await asyncio.sleep(5)
+        return f"tr:{text}"
+
+    async def fake_ex_async(*, query: str, src_code: str, tgt_code: str):
+        return None
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation_async", fake_tr_async)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example_async", fake_ex_async)
+    monkeypatch.setattr(settings, "auto_preview_batch_deadline_seconds", 0.2)
+
+    r = client.post(
+        "/api/v1/auto/preview/batch",
+        json={"fronts": ["fast", "slow"], "source_language_id": en_id, "target_language_id": ru_id},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert data["timed_out"] is True
+    fast, slow = data["items"]
+    assert fast["suggested_back"] == "tr:fast" and fast["complete"] is True
+    assert slow["suggested_back"] is None and slow["complete"] is False
+    # an unfinished lookup is not remembered as a miss
+    assert not auto_content.is_known_translation_miss(
+        src_lang_id=en_id, tgt_lang_id=ru_id, text_raw="slow"
+    )
+
+
+def test_auto_preview_batch_limits_concurrency(client, monkeypatch, setup_user_pair):
+    en_id, ru_id, token = setup_user_pair
+    state = {"running": 0, "peak": 0}
+
+    async def fake_tr_async(*, text: str, src_code: str, tgt_code: str):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return text
+
+    async def fake_ex_async(*, query: str, src_code: str, tgt_code: str):
+        return None
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation_async", fake_tr_async)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example_async", fake_ex_async)
+    monkeypatch.setattr(settings, "auto_preview_batch_concurrency", 3)
+
+    r = client.post(
+        "/api/v1/auto/preview/batch",
+        json={
+            "fronts": [f"word{i}" for i in range(12)],
+            "source_language_id": en_id,
+            "target_language_id": ru_id,
+        },
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert len(r.json()["items"]) == 12
+    assert state["peak"] <= 3
+
+
+def test_auto_preview_batch_rejects_too_many_fronts(client, monkeypatch, setup_user_pair):
+    en_id, ru_id, token = setup_user_pair
+    monkeypatch.setattr(settings, "auto_preview_batch_max_items", 2)
+
+    r = client.post(
+        "/api/v1/auto/preview/batch",
+        json={"fronts": ["a", "b", "c"], "source_language_id": en_id, "target_language_id": ru_id},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 422
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app import models
+from app.config import settings
+from app.services import auto_content, cache_maintenance
+from tests.conftest import auth_headers, create_user_and_token
+
+
+def _langs(db_session):
+    en = models.Language(name="English", code="en")
+    ru = models.Language(name="Russian", code="ru")
+    db_session.add_all([en, ru])
+    db_session.commit()
+    return en, ru
+
+
+def _translation(en, ru, text, *, hits=0, age_days=0):
+    ts = datetime.utcnow() - timedelta(days=age_days)
+    return models.TranslationCache(
+        src_language_id=en.id,
+        tgt_language_id=ru.id,
+        source_text=text,
+        source_text_norm=text,
+        translated_text=f"ru:{text}",
+        hits=hits,
+        created_at=ts,
+        updated_at=ts,
+    )
+
+
+def test_hits_are_aggregated_and_flushed_in_one_batch(client, db_session):
+    en, ru = _langs(db_session)
+    db_session.add(_translation(en, ru, "cat"))
+    db_session.commit()
+
+    for _ in range(3):
+        assert (
+            auto_content.find_cached_translation(
+                db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="Cat"
+            )
+            == "ru:cat"
+        )
+    auto_content.find_cached_translation(
+        db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="dog"
+    )
+
+    row = db_session.query(models.TranslationCache).one()
+    assert row.hits == 0  # nothing written yet
+    assert auto_content.translation_hits.stats()["hit_ratio"] == 0.75
+
+    assert cache_maintenance.flush_cache_hits(db_session) == 1
+    db_session.refresh(row)
+    assert row.hits == 3
+    assert auto_content.translation_hits.pending() == 0
+
+
+def test_prune_evicts_coldest_rows_over_budget(client, db_session, monkeypatch):
+    en, ru = _langs(db_session)
+    db_session.add_all(
+        [
+            _translation(en, ru, "hot", hits=50, age_days=30),
+            _translation(en, ru, "warm", hits=5, age_days=1),
+            _translation(en, ru, "stale", hits=0, age_days=30),
+            _translation(en, ru, "fresh", hits=0, age_days=0),
+        ]
+    )
+    db_session.commit()
+    monkeypatch.setattr(settings, "content_cache_max_rows", 2)
+
+    deleted = cache_maintenance.prune_content_caches(db_session)
+
+    assert deleted == {"translation": 2, "example": 0}
+    left = {r.source_text_norm for r in db_session.query(models.TranslationCache).all()}
+    assert left == {"hot", "warm"}
+
+
+def test_prune_respects_size_budget(client, db_session):
+    en, ru = _langs(db_session)
+    db_session.add_all([_translation(en, ru, f"w{i:02d}", hits=i) for i in range(20)])
+    db_session.commit()
+
+    deleted = cache_maintenance.prune_cache_table(
+        db_session, models.TranslationCache, max_rows=0, max_bytes=1
+    )
+
+    assert deleted == 20
+
+
+def test_prune_size_budget_is_stable_across_runs(client, db_session):
+    en, ru = _langs(db_session)
+    db_session.add_all([_translation(en, ru, f"w{i:02d}", hits=i) for i in range(20)])
+    db_session.commit()
+    row_bytes = db_session.execute(
+        text("SELECT max(pg_column_size(t.*)) FROM translation_cache t")
+    ).scalar()
+
+    first = cache_maintenance.prune_cache_table(
+        db_session, models.TranslationCache, max_rows=0, max_bytes=row_bytes * 10
+    )
+    # dead tuples still occupy the relation; they must not count against the budget
+    second = cache_maintenance.prune_cache_table(
+        db_session, models.TranslationCache, max_rows=0, max_bytes=row_bytes * 10
+    )
+
+    assert first == 10
+    assert second == 0
+    left = {r.source_text_norm for r in db_session.query(models.TranslationCache).all()}
+    assert left == {f"w{i:02d}" for i in range(10, 20)}
+
+
+def test_admin_cache_stats(client, db_session):
+    _, admin_token = create_user_and_token(client, "admin")
+    _, user_token = create_user_and_token(client, "user")
+    en, ru = _langs(db_session)
+    db_session.add(_translation(en, ru, "cat", hits=4))
+    db_session.commit()
+    auto_content.find_cached_translation(
+        db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="cat"
+    )
+
+    assert client.get("/api/v1/admin/cache/stats", headers=auth_headers(user_token)).status_code == 403
+
+    r = client.get("/api/v1/admin/cache/stats", headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["translation"]["rows"] == 1
+    assert data["translation"]["stored_hits"] == 4
+    assert data["translation"]["total_bytes"] > 0
+    assert data["translation"]["lookups"]["hit_ratio"] == 1.0
+    assert data["example"]["rows"] == 0
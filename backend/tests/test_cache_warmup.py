@@ -0,0 +1,134 @@
+import asyncio
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import auto_content, cache_warmup
+from tests.conftest import admin_create_language, auth_headers, create_user_and_token
+
+
+def _library_deck(client, admin_token: str, fronts: list[str]) -> tuple[int, int, int]:
+    en_id = admin_create_language(client, admin_token, "English", "en")
+    ru_id = admin_create_language(client, admin_token, "Russian", "ru")
+    r = client.post(
+        "/api/v1/library/admin/decks",
+        json={"name": "A1", "source_language_id": en_id, "target_language_id": ru_id},
+        headers=auth_headers(admin_token),
+    )
+    assert r.status_code == 200, r.text
+    deck_id = r.json()["id"]
+    for front in fronts:
+        r = client.post(
+            f"/api/v1/decks/{deck_id}/cards",
+            json={"front": front, "back": "x", "example_sentence": "y"},
+            headers=auth_headers(admin_token),
+        )
+        assert r.status_code == 201, r.text
+    return deck_id, en_id, ru_id
+
+
+def _fake_providers(monkeypatch) -> list[str]:
+    calls: list[str] = []
+
+    def fake_tr(*, text, src_code, tgt_code):
+        calls.append(f"tr:{text}")
+        return f"{text}-ru"
+
+    def fake_ex(*, query, src_code, tgt_code):
+        calls.append(f"ex:{query}")
+        return f"A {query} here."
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation", fake_tr)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example", fake_ex)
+    return calls
+
+
+def test_warmup_fills_missing_rows_and_skips_cached(client, db_session, monkeypatch):
+    _, admin_token = create_user_and_token(client, "admin")
+    deck_id, en_id, ru_id = _library_deck(client, admin_token, ["cat", "dog", "Sun"])
+    auto_content.save_translation_cache(
+        db_session, src_lang_id=en_id, tgt_lang_id=ru_id, text_raw="cat", translation="кот"
+    )
+    auto_content.save_example_cache(
+        db_session, src_lang_id=en_id, tgt_lang_id=ru_id, text_raw="cat", example_text="A cat."
+    )
+    db_session.commit()
+    calls = _fake_providers(monkeypatch)
+
+    r = client.post("/api/v1/admin/cache/library/warm", headers=auth_headers(admin_token))
+    assert r.status_code == 202, r.text
+    body = r.json()
+    assert body["queued"] is True
+    assert body["before"]["translation"] == {"cached": 1, "ratio": 0.3333}
+    # TestClient runs background tasks before returning the response
+    assert sorted(calls) == ["ex:Sun", "ex:dog", "tr:Sun", "tr:dog"]
+    coverage = client.get(
+        "/api/v1/admin/cache/library/coverage", headers=auth_headers(admin_token)
+    ).json()
+    assert coverage["translation"] == {"cached": 3, "ratio": 1.0}
+    assert coverage["example"]["ratio"] == 1.0
+
+    rows = db_session.query(models.TranslationCache.source_text_norm).all()
+    assert sorted(n for (n,) in rows) == ["cat", "dog", "sun"]
+
+    # everything cached now: a second run touches no provider
+    calls.clear()
+    report = asyncio.run(cache_warmup.warm_library_caches(SessionLocal, deck_id=deck_id))
+    assert report["attempted"] == 0 and report["skipped"] == 3
+    assert report["filled"] == {"translation": 0, "example": 0}
+    assert calls == []
+
+
+def test_warmup_already_queued_is_not_queued_again(client, monkeypatch):
+    _, admin_token = create_user_and_token(client, "admin")
+    deck_id, _, _ = _library_deck(client, admin_token, ["cat"])
+    calls = _fake_providers(monkeypatch)
+    monkeypatch.setattr(cache_warmup, "_pending", {deck_id})
+
+    r = client.post(
+        f"/api/v1/admin/cache/library/warm?deck_id={deck_id}", headers=auth_headers(admin_token)
+    )
+    assert r.status_code == 202, r.text
+    assert r.json()["queued"] is False
+    assert calls == []
+
+    # other scopes still queue, and release their slot when done
+    r = client.post("/api/v1/admin/cache/library/warm", headers=auth_headers(admin_token))
+    assert r.json()["queued"] is True
+    assert sorted(calls) == ["ex:cat", "tr:cat"]
+    assert cache_warmup._pending == {deck_id}
+
+
+def test_library_card_write_warms_only_that_front(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "library_warmup_on_change", True)
+    calls = _fake_providers(monkeypatch)
+    _, admin_token = create_user_and_token(client, "admin")
+
+    deck_id, _, _ = _library_deck(client, admin_token, ["apple"])
+    assert sorted(calls) == ["ex:apple", "tr:apple"]
+
+    # a front that skipped the API stays cold: writing another card does not rescan the deck
+    db_session.add(models.Card(deck_id=deck_id, front="pear", front_norm="pear", back="x"))
+    db_session.commit()
+    calls.clear()
+    r = client.post(
+        f"/api/v1/decks/{deck_id}/cards",
+        json={"front": "Plum", "back": "x", "example_sentence": "y"},
+        headers=auth_headers(admin_token),
+    )
+    assert r.status_code == 201, r.text
+    assert sorted(calls) == ["ex:Plum", "tr:Plum"]
+
+    coverage = client.get(
+        f"/api/v1/admin/cache/library/coverage?deck_id={deck_id}",
+        headers=auth_headers(admin_token),
+    ).json()
+    assert coverage["fronts"] == 3
+    assert coverage["translation"]["cached"] == 2
+
+
+def test_warmup_endpoints_are_admin_only(client):
+    _, token = create_user_and_token(client, "user")
+    headers = auth_headers(token)
+    assert client.post("/api/v1/admin/cache/library/warm", headers=headers).status_code == 403
+    assert client.get("/api/v1/admin/cache/library/coverage", headers=headers).status_code == 403
@@ -0,0 +1,170 @@
+from datetime import datetime
+
+from app import models
+from app.core.ttl_cache import MISSING, TTLCache
+from app.services import auto_content, dictionary
+from tests.conftest import create_languages
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_negative_entries_expire_sooner():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=100, negative_ttl_seconds=5, clock=clock)
+    cache.set("hit", "value")
+    cache.set_negative("miss")
+
+    assert cache.get("miss") is None
+    clock.now = 6
+    assert cache.get("miss") is MISSING
+    assert cache.get("hit") == "value"
+    clock.now = 101
+    assert cache.get("hit") is MISSING
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["negative_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_translation_provider_miss_is_remembered(client, db_session, monkeypatch):
+    en, ru = create_languages(db_session)
+    calls = {"tr": 0}
+
+    def fake_tr(*, text: str, src_code: str, tgt_code: str):
+        calls["tr"] += 1
+        return None
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation", fake_tr)
+
+    for _ in range(3):
+        out = auto_content.get_translation_with_cache(
+            db_session, src_lang=en, tgt_lang=ru, text_raw="Qwertyuiop"
+        )
+        assert out is None
+
+    assert calls["tr"] == 1
+
+
+def test_saved_translation_is_served_from_memory(client, db_session, monkeypatch):
+    en, ru = create_languages(db_session)
+
+    monkeypatch.setattr(
+        auto_content,
+        "fetch_mymemory_translation",
+        lambda *, text, src_code, tgt_code: "кот",
+    )
+    assert (
+        auto_content.get_translation_with_cache(db_session, src_lang=en, tgt_lang=ru, text_raw="Cat")
+        == "кот"
+    )
+    db_session.commit()
+
+    before = auto_content.translation_memory.stats()["hits"]
+    # same normalized key -> memory tier hit, no DB query needed
+    assert (
+        auto_content.find_cached_translation(
+            db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="  cat "
+        )
+        == "кот"
+    )
+    assert auto_content.translation_memory.stats()["hits"] == before + 1
+
+
+def test_negative_entry_answers_without_db(client, db_session):
+    en, ru = create_languages(db_session)
+    auto_content.translation_memory.set_negative((en.id, ru.id, "dog"))
+
+    # a row that bypassed save_translation_cache is not seen until the entry expires
+    db_session.add(
+        models.TranslationCache(
+            src_language_id=en.id,
+            tgt_language_id=ru.id,
+            source_text="dog",
+            source_text_norm="dog",
+            translated_text="собака",
+        )
+    )
+    db_session.commit()
+    assert (
+        auto_content.find_cached_translation(
+            db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="dog"
+        )
+        is None
+    )
+
+    # saving through the cache API replaces the negative entry
+    auto_content.save_translation_cache(
+        db_session,
+        src_lang_id=en.id,
+        tgt_lang_id=ru.id,
+        text_raw="Dog",
+        translation="пёс",
+        provider="manual",
+    )
+    assert (
+        auto_content.find_cached_translation(
+            db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="dog"
+        )
+        == "пёс"
+    )
+
+
+def test_lookups_prefer_the_curated_provider_over_newer_rows(client, db_session):
+    en, ru = create_languages(db_session)
+    old, new = datetime(2024, 1, 1), datetime(2025, 1, 1)
+
+    def row(text, translated, provider, updated_at):
+        return models.TranslationCache(
+            src_language_id=en.id,
+            tgt_language_id=ru.id,
+            source_text=text,
+            source_text_norm=text,
+            translated_text=translated,
+            provider=provider,
+            updated_at=updated_at,
+        )
+
+    db_session.add_all(
+        [
+            row("cat", "кошка", "mymemory", new),
+            row("cat", "кот", dictionary.PROVIDER, old),
+            # neither provider is ranked: the most recently updated row wins
+            row("dog", "пёс", "manual", old),
+            row("dog", "собака", "import", new),
+        ]
+    )
+    db_session.commit()
+
+    auto_content.clear_memory_caches()
+    assert auto_content.find_cached_translation(
+        db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="Cat"
+    ) == "кот"
+    assert auto_content.find_cached_translation(
+        db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="dog"
+    ) == "собака"
+
+    auto_content.clear_memory_caches()
+    assert auto_content.find_cached_translations_bulk(
+        db_session, src_lang_id=en.id, tgt_lang_id=ru.id, texts=["cat", "Dog"]
+    ) == {"cat": ("кот", dictionary.PROVIDER), "dog": ("собака", "import")}
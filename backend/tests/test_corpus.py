@@ -0,0 +1,179 @@
+import asyncio
+import bz2
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.services import auto_content, corpus
+from app.tools.load_tatoeba import load_corpus
+from tests.conftest import create_languages
+
+SENTENCES = [
+    (1, "eng", "The cat sleeps."),
+    (2, "rus", "Кот спит."),
+    (3, "eng", "My neighbour's cat is very fat and lazy."),
+    (4, "rus", "Кот моего соседа очень толстый и ленивый."),
+    (5, "eng", "A cat."),  # shortest, but no Russian translation
+    (6, "deu", "Die Katze schläft."),
+    (7, "eng", "Back\\slash and a tab-free line about dogs."),
+]
+LINKS = [(1, 2), (2, 1), (3, 4), (4, 3), (1, 6), (6, 1), (1, 999)]
+
+
+@pytest.fixture()
+def corpus_files(tmp_path):
+    sentences = tmp_path / "sentences.csv.bz2"
+    with bz2.open(sentences, "wt", encoding="utf-8") as f:
+        for sid, lang, text in SENTENCES:
+            f.write(f"{sid}\t{lang}\t{text}\n")
+        f.write("broken line\n")
+    links = tmp_path / "links.csv"
+    links.write_text("".join(f"{a}\t{b}\n" for a, b in LINKS), encoding="utf-8")
+    return str(sentences), str(links)
+
+
+@pytest.fixture()
+def loaded_corpus(db_session, corpus_files):
+    sentences, links = corpus_files
+    return load_corpus(
+        sentences_path=sentences,
+        links_path=links,
+        langs={"eng", "rus"},
+        batch_size=2,
+        bind=db_session.get_bind(),
+        log=lambda msg: None,
+    )
+
+
+def test_loader_streams_filters_and_keeps_only_complete_links(db_session, loaded_corpus):
+    assert loaded_corpus == {"sentences": 6, "links": 4}
+    assert db_session.query(models.CorpusSentence).filter_by(lang="deu").count() == 0
+    row = db_session.get(models.CorpusSentence, 7)
+    assert row.text == "Back\\slash and a tab-free line about dogs."
+
+
+def test_local_example_prefers_translated_then_shortest(db_session, loaded_corpus):
+    assert (
+        corpus.find_local_example(db_session, query="Cat", src_code="eng", tgt_code="rus")
+        == "The cat sleeps.\nКот спит."
+    )
+    assert (
+        corpus.find_local_example(db_session, query="cat", src_code="eng", tgt_code="deu")
+        == "A cat."
+    )
+    assert (
+        corpus.find_local_example(db_session, query="zebra", src_code="eng", tgt_code="rus")
+        is None
+    )
+
+
+def test_prefer_local_skips_network_and_records_provider(
+    client, db_session, loaded_corpus, monkeypatch
+):
+    en, ru = create_languages(db_session)
+    monkeypatch.setattr(settings, "example_corpus_mode", "prefer_local")
+
+    def no_network(**kwargs):
+        raise AssertionError("remote provider must not be called")
+
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example", no_network)
+
+    ex = auto_content.get_example_with_cache(db_session, src_lang=en, tgt_lang=ru, text_raw="lazy")
+    assert ex.startswith("My neighbour's cat is very fat and lazy.\nКот моего соседа")
+    row = db_session.query(models.ExampleSentenceCache).one()
+    assert row.provider == auto_content.LOCAL_CORPUS_PROVIDER
+
+
+def test_prefer_local_falls_back_to_remote(client, db_session, loaded_corpus, monkeypatch):
+    en, ru = create_languages(db_session)
+    monkeypatch.setattr(settings, "example_corpus_mode", "prefer_local")
+    monkeypatch.setattr(
+        auto_content, "fetch_tatoeba_example", lambda **kw: "Zebras run.\nЗебры бегут."
+    )
+
+    ex = auto_content.get_example_with_cache(db_session, src_lang=en, tgt_lang=ru, text_raw="zebra")
+    assert ex == "Zebras run.\nЗебры бегут."
+
+
+def test_local_only_never_calls_remote(client, db_session, loaded_corpus, monkeypatch):
+    en, ru = create_languages(db_session)
+    monkeypatch.setattr(settings, "example_corpus_mode", "local_only")
+    calls = {"n": 0}
+
+    async def fake_ex_async(**kwargs):
+        calls["n"] += 1
+        return "remote"
+
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example_async", fake_ex_async)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example", lambda **kw: "remote")
+
+    ex = auto_content.get_example_with_cache(db_session, src_lang=en, tgt_lang=ru, text_raw="zebra")
+    assert ex is None
+
+    async def fake_tr_async(**kwargs):
+        return None
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation_async", fake_tr_async)
+
+    result = asyncio.run(
+        auto_content.get_preview_no_save_async(
+            db_session, src_lang=en, tgt_lang=ru, text_raw="cat"
+        )
+    )
+    assert result["example"] == "The cat sleeps.\nКот спит."
+    assert result["example_provider"] == auto_content.LOCAL_CORPUS_PROVIDER
+    assert result["example_cached"] is False
+    assert calls["n"] == 0
+
+
+def test_local_examples_bulk_lookup(db_session, loaded_corpus):
+    found = corpus.find_local_examples(
+        db_session, queries=["cat", "lazy", "zebra", " cat ", ""], src_code="eng", tgt_code="rus"
+    )
+    assert found == {
+        "cat": "The cat sleeps.\nКот спит.",
+        "lazy": (
+            "My neighbour's cat is very fat and lazy.\nКот моего соседа очень толстый и ленивый."
+        ),
+    }
+
+
+def test_known_miss_skips_local_search(client, db_session, loaded_corpus, monkeypatch):
+    en, ru = create_languages(db_session)
+    monkeypatch.setattr(settings, "example_corpus_mode", "prefer_local")
+    auto_content.example_memory.set_negative((en.id, ru.id, "zebra"))
+    searched = []
+    real = corpus.find_local_examples
+
+    def spy(db, *, queries, src_code, tgt_code):
+        searched.append(list(queries))
+        return real(db, queries=queries, src_code=src_code, tgt_code=tgt_code)
+
+    monkeypatch.setattr(corpus, "find_local_examples", spy)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example", lambda **kw: None)
+
+    assert (
+        auto_content.get_example_with_cache(db_session, src_lang=en, tgt_lang=ru, text_raw="zebra")
+        is None
+    )
+    assert searched == []
+
+    async def fake_tr_async(**kwargs):
+        return None
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation_async", fake_tr_async)
+    results, _ = asyncio.run(
+        auto_content.get_preview_batch_no_save_async(
+            db_session,
+            src_lang=en,
+            tgt_lang=ru,
+            texts=["zebra", "cat", "lazy"],
+            concurrency=4,
+            deadline_seconds=5,
+        )
+    )
+    # one corpus query for the whole batch, without the known miss
+    assert searched == [["cat", "lazy"]]
+    assert results["cat"]["example"] == "The cat sleeps.\nКот спит."
+    assert results["zebra"]["example"] is None
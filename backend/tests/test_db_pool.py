@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError
+
+from app import database
+from app.config import settings
+from app.core.pool_metrics import TimedQueuePool, pool_stats
+from tests.conftest import auth_headers, create_user_and_token
+
+
+def test_pool_stats_record_waits_and_timeouts():
+    engine = create_engine(
+        os.environ["DATABASE_URL"],
+        poolclass=TimedQueuePool,
+        pool_logging_name="test-timeouts",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    try:
+        with engine.connect():
+            with pytest.raises(TimeoutError):
+                engine.connect()
+            stats = pool_stats(engine)
+            assert stats["checked_out"] == 1
+            assert stats["overflow"] == 0
+            assert stats["checkouts"] == 1
+            assert stats["timeouts"] == 1
+            assert stats["wait_seconds_max"] >= 0.2
+    finally:
+        engine.dispose()
+
+
+def test_engine_uses_pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+    monkeypatch.setattr(settings, "db_max_overflow", 1)
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 100)
+    engine = database.create_db_engine()
+    try:
+        stats = pool_stats(engine)
+        assert (stats["size"], stats["max_overflow"]) == (3, 1)
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "100ms"
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        engine.dispose()
+
+
+def test_admin_pool_endpoint(client):
+    _, admin_token = create_user_and_token(client, "admin")
+    _, user_token = create_user_and_token(client, "user")
+
+    r = client.get("/api/v1/admin/db/pool", headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert set(body["pools"]) == {"primary", "async"}
+    assert body["pools"]["primary"]["size"] == settings.db_pool_size
+    assert body["threadpool_size"] > 0
+    assert body["max_connections"] > 0
+
+    r = client.get("/api/v1/admin/db/pool", headers=auth_headers(user_token))
+    assert r.status_code == 403
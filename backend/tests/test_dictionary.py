@@ -0,0 +1,105 @@
+import gzip
+import struct
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.services import auto_content, dictionary
+from app.tools.build_dictionary import build_dictionary, iter_stardict, iter_tsv
+
+
+@pytest.fixture()
+def dict_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "dictionary_dir", str(tmp_path))
+    yield tmp_path
+    dictionary.close_dictionaries()
+
+
+def _write_stardict(base, entries):
+    data = b""
+    idx = b""
+    for word, definition in sorted(entries):
+        raw = definition.encode("utf-8")
+        idx += word.encode("utf-8") + b"\0" + struct.pack(">II", len(data), len(raw))
+        data += raw
+    (base.parent / (base.name + ".ifo")).write_text(
+        f"StarDict's dict ifo file\nversion=2.4.2\nwordcount={len(entries)}\n", encoding="utf-8"
+    )
+    (base.parent / (base.name + ".idx")).write_bytes(idx)
+    with gzip.open(base.parent / (base.name + ".dict.dz"), "wb") as f:
+        f.write(data)
+
+
+def test_build_and_lookup_merges_senses_and_normalizes_keys(tmp_path):
+    src = tmp_path / "en-ru.tsv"
+    src.write_text(
+        "# comment\n"
+        "Cat\tкот\n"
+        "cat\tкошка\n"
+        "cat\tкот\n"
+        "ice  cream\tмороженое\n"
+        "naïve\tнаивный\n"
+        "broken line\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / "en-ru.fcdict"
+
+    count = build_dictionary(iter_tsv(str(src)), str(out), chunk_size=2)
+
+    assert count == 3
+    d = dictionary.MmapDictionary(str(out))
+    assert d.get("cat") == "кот; кошка"
+    assert d.get("ice cream") == "мороженое"
+    assert d.get("naïve") == "наивный"
+    assert d.get("dog") is None
+    assert d.get("") is None
+    d.close()
+
+
+def test_stardict_reader(tmp_path):
+    base = tmp_path / "en-ru"
+    _write_stardict(base, [("dog", "<b>собака</b>\nпёс"), ("house", "дом")])
+
+    assert list(iter_stardict(str(base) + ".ifo")) == [("dog", "собака"), ("house", "дом")]
+
+
+def test_translation_uses_dictionary_before_network(client, db_session, dict_dir, monkeypatch):
+    build_dictionary([("cat", "кот")], str(dict_dir / "en-ru.fcdict"))
+    en = models.Language(name="English", code="en")
+    ru = models.Language(name="Russian", code="ru")
+    db_session.add_all([en, ru])
+    db_session.commit()
+
+    def no_network(**kwargs):
+        raise AssertionError("MyMemory must not be called")
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation", no_network)
+
+    tr = auto_content.get_translation_with_cache(
+        db_session, src_lang=en, tgt_lang=ru, text_raw=" Cat"
+    )
+    assert tr == "кот"
+    row = db_session.query(models.TranslationCache).one()
+    assert row.provider == dictionary.PROVIDER
+
+    # pairs without a dictionary file still go to the provider
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation", lambda **kw: "кот")
+    de = models.Language(name="German", code="de")
+    db_session.add(de)
+    db_session.commit()
+    tr = auto_content.get_translation_with_cache(
+        db_session, src_lang=de, tgt_lang=ru, text_raw="Katze"
+    )
+    assert tr == "кот"
+
+
+def test_unreadable_dictionary_is_ignored_once(dict_dir, caplog):
+    (dict_dir / "en-ru.fcdict").write_bytes(b"")
+    (dict_dir / "en-de.fcdict").write_bytes(dictionary.MAGIC + struct.pack("<Q", 10**6))
+
+    assert dictionary.lookup("en", "ru", "cat") is None
+    assert dictionary.lookup("en", "de", "cat") is None
+    assert dictionary.lookup("en", "ru", "dog") is None
+    # logged when first opened, then remembered as missing
+    assert len([r for r in caplog.records if "unreadable dictionary" in r.getMessage()]) == 2
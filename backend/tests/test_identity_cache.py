@@ -0,0 +1,74 @@
+from jose import jwt
+from sqlalchemy import event
+
+from app.config import settings
+from app.core.ttl_cache import MISSING
+from app.services.identity import CurrentUser, identity_cache
+from app.services.security import create_access_token
+from tests.conftest import auth_headers, create_user_and_token
+
+
+def _users_queries(db_session):
+    seen: list[str] = []
+
+    def before(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            seen.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", before)
+    return seen
+
+
+def test_access_token_carries_user_id(client):
+    me, token = create_user_and_token(client, "user")
+    claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    assert claims["uid"] == me["id"]
+    assert claims["sub"] == "user"
+
+
+def test_cached_identity_skips_the_users_query(client, db_session):
+    me, token = create_user_and_token(client, "user")
+    seen = _users_queries(db_session)
+
+    for _ in range(3):
+        r = client.get("/api/v1/users/me/learning-pairs", headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+
+    assert seen == []
+    assert identity_cache.peek(me["id"]) == CurrentUser(
+        id=me["id"], username="user", daily_card_target=20, daily_new_target=7
+    )
+
+
+def test_user_change_invalidates_cached_identity(client):
+    me, token = create_user_and_token(client, "user")
+    assert identity_cache.peek(me["id"]) is not MISSING
+
+    r = client.put(
+        "/api/v1/users/me/goals",
+        json={"daily_card_target": 42, "daily_new_target": 5},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert identity_cache.peek(me["id"]) is MISSING
+
+    client.get("/api/v1/users/me/learning-pairs", headers=auth_headers(token))
+    assert identity_cache.peek(me["id"]).daily_card_target == 42
+
+
+def test_legacy_token_without_user_id_still_works(client):
+    create_user_and_token(client, "user")
+    legacy = create_access_token(subject="user")
+
+    r = client.get("/api/v1/users/me", headers=auth_headers(legacy))
+    assert r.status_code == 200, r.text
+    assert r.json()["username"] == "user"
+
+
+def test_user_id_must_match_username(client):
+    alice, _ = create_user_and_token(client, "alice")
+    create_user_and_token(client, "bob")
+    forged = create_access_token(subject="bob", user_id=alice["id"])
+
+    r = client.get("/api/v1/users/me/learning-pairs", headers=auth_headers(forged))
+    assert r.status_code == 401
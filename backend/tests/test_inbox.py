@@ -1,3 +1,8 @@
+import re
+import sys
+
+from app import crud
+from app.services import auto_content
 from tests.conftest import (
     admin_create_language,
     auth_headers,
@@ -259,3 +264,17 @@ def test_inbox_quick_add_accepts_source_metadata(client):
     assert card["source_page"] == "p. 9"
     assert card["context_note"] == "First appearance in opening scene"
     assert card["reading_source_id"] is not None
+
+
+def test_front_normalization_matches_the_whitespace_regex():
+    # normalize_front used re.sub(r"\s+", " ", ...); str.split() must agree on every code point
+    spaces = re.compile(r"\s+")
+    samples = [None, "", "  ", "Word", "  Some \t Phrase\n", "ΟΔΟΣ  Σ", "İstanbul　X"]
+    samples += [f"a{chr(c)}B{chr(c)}" for c in range(sys.maxunicode + 1) if chr(c).isspace()]
+    samples += [f"x{chr(c)}y" for c in range(0x3000)]
+
+    expected = [spaces.sub(" ", (s or "").strip()).lower() for s in samples]
+    assert [crud.normalize_front(s) for s in samples] == expected
+    assert crud.normalize_fronts(samples) == expected
+    assert [auto_content.norm(s) for s in samples] == expected
+    assert auto_content.clean_example(" A  b \n  C\td ") == "A b\nC d"
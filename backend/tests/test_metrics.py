@@ -0,0 +1,101 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.config import settings
+from app.services import auto_content
+from tests.conftest import auth_headers
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_by_route_template(client, make_deck_with_cards, token_headers):
+    deck_id, _ = make_deck_with_cards(n=2)
+    route = "/api/v1/decks/{deck_id}/cards"
+    before = _sample(
+        "http_request_duration_seconds_count", method="GET", route=route, status="200"
+    )
+
+    r = client.get(f"/api/v1/decks/{deck_id}/cards", headers=token_headers)
+    assert r.status_code == 200, r.text
+
+    assert _sample(
+        "http_request_duration_seconds_count", method="GET", route=route, status="200"
+    ) == before + 1
+    body = client.get("/metrics").text
+    assert f'route="/api/v1/decks/{deck_id}/cards"' not in body
+    assert client.get("/no/such/path").status_code == 404
+    assert _sample(
+        "http_request_duration_seconds_count", method="GET", route="unmatched", status="404"
+    ) >= 1
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/v1/decks/{deck_id}", "/api/v1/decks/{deck_id}/cards"]
+)  # sync handler, async handler
+def test_sql_statements_are_counted_per_request(client, make_deck_with_cards, token_headers, path):
+    deck_id, _ = make_deck_with_cards(n=1)
+    labels = {"method": "GET", "route": path}
+    count = _sample("http_request_sql_statements_count", **labels)
+    statements = _sample("http_request_sql_statements_sum", **labels)
+
+    r = client.get(path.format(deck_id=deck_id), headers=token_headers)
+    assert r.status_code == 200, r.text
+
+    assert _sample("http_request_sql_statements_count", **labels) == count + 1
+    assert _sample("http_request_sql_statements_sum", **labels) > statements
+    assert _sample("http_request_sql_seconds_sum", **labels) > 0
+
+
+def test_pool_threadpool_and_provider_metrics(client):
+    before = _sample(
+        "content_provider_request_duration_seconds_count", provider="mymemory", outcome="error"
+    )
+    with pytest.raises(auto_content.ProviderUnavailable):
+        with auto_content._guarded_call("mymemory"):
+            raise ConnectionError("down")
+    assert _sample(
+        "content_provider_request_duration_seconds_count", provider="mymemory", outcome="error"
+    ) == before + 1
+
+    body = client.get("/metrics").text
+    assert 'db_pool_checked_out{pool="primary"}' in body
+    assert 'db_pool_checkouts_total{pool="async"}' in body
+    assert "threadpool_queue_depth " in body
+    assert 'content_provider_request_duration_seconds_bucket{le="0.05",outcome="error"' in body
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_bearer_token", "scrape-me")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=auth_headers("wrong")).status_code == 401
+    assert client.get("/metrics", headers=auth_headers("scrape-me")).status_code == 200
+
+
+def test_fingerprint_ignores_parameters():
+    from app.core.query_recorder import fingerprint
+
+    a = fingerprint("SELECT * FROM cards WHERE id = %(id_1)s AND front = 'cat'")
+    b = fingerprint("SELECT *\n  FROM cards WHERE id = %(id_1)s AND front = 'dog'")
+    assert a == b == "SELECT * FROM cards WHERE id = ? AND front = ?"
+    assert fingerprint("SELECT id FROM t WHERE id IN ($1, $2, $3)") == (
+        "SELECT id FROM t WHERE id IN (?, ...)"
+    )
+
+
+def test_repeated_statements_are_flagged(
+    client, make_deck_with_cards, token_headers, monkeypatch, caplog
+):
+    deck_id, _ = make_deck_with_cards(n=1)
+    route = "/api/v1/study/decks/{deck_id}/next"
+    before = _sample("http_request_repeated_sql_total", method="GET", route=route)
+
+    # next-batch checks deck access twice (due reviews, new cards)
+    monkeypatch.setattr(settings, "sql_repeated_statement_threshold", 2)
+    with caplog.at_level("WARNING", logger="app.core.metrics"):
+        r = client.get(f"/api/v1/study/decks/{deck_id}/next", headers=token_headers)
+    assert r.status_code == 200, r.text
+
+    assert _sample("http_request_repeated_sql_total", method="GET", route=route) == before + 1
+    assert any("Possible N+1 in GET " + route in rec.getMessage() for rec in caplog.records)
@@ -0,0 +1,45 @@
+import os
+
+from app import models
+from app.config import settings
+from app.services import password_hashing
+from tests.conftest import register
+
+
+def _stored_hash(db_session, username: str) -> str:
+    db_session.expire_all()
+    return db_session.query(models.User).filter_by(username=username).one().hashed_password
+
+
+def test_login_rehashes_when_cost_changes(client, db_session, monkeypatch):
+    register(client, "user", "pass1234")
+    assert _stored_hash(db_session, "user").startswith("$2b$04$")
+
+    monkeypatch.setattr(settings, "password_hash_rounds", 5)
+    r = client.post("/api/v1/auth/login-json", json={"username": "user", "password": "pass1234"})
+    assert r.status_code == 200, r.text
+    assert _stored_hash(db_session, "user").startswith("$2b$05$")
+
+    r = client.post("/api/v1/auth/login", data={"username": "user", "password": "pass1234"})
+    assert r.status_code == 200, r.text
+
+
+def test_failed_login_keeps_the_old_hash(client, db_session, monkeypatch):
+    register(client, "user", "pass1234")
+    before = _stored_hash(db_session, "user")
+
+    monkeypatch.setattr(settings, "password_hash_rounds", 5)
+    r = client.post("/api/v1/auth/login-json", json={"username": "user", "password": "wrong123"})
+    assert r.status_code == 400
+    assert _stored_hash(db_session, "user") == before
+
+
+def test_hashing_runs_in_worker_processes(monkeypatch):
+    monkeypatch.setattr(settings, "password_hash_workers", 1)
+    try:
+        hashed = password_hashing.hash_password("pass1234")
+        assert password_hashing.verify_and_update("pass1234", hashed) == (True, None)
+        assert password_hashing.verify_and_update("nope", hashed)[0] is False
+        assert password_hashing._executor().submit(os.getpid).result() != os.getpid()
+    finally:
+        password_hashing.shutdown_pool()
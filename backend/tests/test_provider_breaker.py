@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.services import auto_content
+from tests.conftest import auth_headers, create_user_and_token
+from tests.fake_provider import FakeProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def fake_provider(monkeypatch):
+    provider = FakeProvider().start()
+    monkeypatch.setattr(settings, "mymemory_api_url", f"{provider.base_url}/mymemory/get")
+    monkeypatch.setattr(settings, "tatoeba_api_url", f"{provider.base_url}/tatoeba/search")
+    monkeypatch.setattr(settings, "content_provider_timeout_seconds", 0.5)
+    yield provider
+    provider.stop()
+
+
+@pytest.fixture()
+def langs(client, db_session):
+    en = models.Language(name="English", code="en")
+    ru = models.Language(name="Russian", code="ru")
+    db_session.add_all([en, ru])
+    db_session.commit()
+    return en, ru
+
+
+def test_breaker_opens_on_error_ratio_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "p", window_size=4, min_calls=4, failure_ratio=0.5, open_seconds=10, clock=clock
+    )
+
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        (breaker.record_success if ok else breaker.record_failure)(0.01)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["short_circuited"] == 1
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_success(0.01)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker("p", window_size=5, min_calls=5, slow_call_seconds=1.0, slow_ratio=0.6)
+    for latency in (0.1, 1.5, 2.0, 1.2, 0.2):
+        breaker.record_success(latency)
+    assert breaker.state == OPEN
+
+
+def test_real_fetchers_talk_to_fake_provider(fake_provider):
+    tr = auto_content.fetch_mymemory_translation(text="cat", src_code="en", tgt_code="ru")
+    assert tr == "кот"
+    assert auto_content.fetch_tatoeba_example(query="cat", src_code="eng", tgt_code="rus") == (
+        "The cat sleeps.\nКот спит."
+    )
+    stats = auto_content.provider_stats()
+    assert stats["mymemory"]["calls"] == 1 and stats["tatoeba"]["calls"] == 1
+
+
+def test_outage_opens_circuit_and_then_fails_fast(fake_provider, langs, db_session, monkeypatch):
+    en, ru = langs
+    fake_provider.status = 503
+    breaker = auto_content.provider_breakers["mymemory"]
+    monkeypatch.setattr(breaker, "min_calls", 3)
+
+    for i in range(3):
+        assert (
+            auto_content.get_translation_with_cache(
+                db_session, src_lang=en, tgt_lang=ru, text_raw=f"word{i}"
+            )
+            is None
+        )
+    assert breaker.state == OPEN
+    calls_before = fake_provider.calls
+
+    started = time.monotonic()
+    tr = auto_content.get_translation_with_cache(
+        db_session, src_lang=en, tgt_lang=ru, text_raw="cat"
+    )
+    assert tr is None
+    assert time.monotonic() - started < 0.1
+    assert fake_provider.calls == calls_before
+    # an outage is not a "no translation" answer
+    assert not auto_content.is_known_translation_miss(
+        src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="cat"
+    )
+
+
+def test_timeouts_count_against_the_breaker(fake_provider, monkeypatch):
+    fake_provider.latency = 0.8  # > content_provider_timeout_seconds
+    breaker = auto_content.provider_breakers["tatoeba"]
+    monkeypatch.setattr(breaker, "min_calls", 2)
+
+    for _ in range(2):
+        with pytest.raises(auto_content.ProviderUnavailable):
+            auto_content.fetch_tatoeba_example(query="cat", src_code="eng", tgt_code="rus")
+
+    assert breaker.state == OPEN
+    assert auto_content.provider_stats()["tatoeba"]["failures"] == 2
+
+
+def test_request_budget_caps_total_provider_time(fake_provider, langs, db_session, monkeypatch):
+    en, ru = langs
+    fake_provider.latency = 0.4
+    monkeypatch.setattr(settings, "content_provider_timeout_seconds", 2.0)
+
+    started = time.monotonic()
+    with auto_content.provider_budget(0.5):
+        tr = auto_content.get_translation_with_cache(
+            db_session, src_lang=en, tgt_lang=ru, text_raw="cat"
+        )
+        ex = auto_content.get_example_with_cache(
+            db_session, src_lang=en, tgt_lang=ru, text_raw="cat"
+        )
+    elapsed = time.monotonic() - started
+
+    assert tr == "кот"
+    assert ex is None  # cut off by the budget
+    assert elapsed < 0.9
+    # running out of budget is not the provider's fault
+    assert auto_content.provider_breakers["tatoeba"].stats()["failures"] == 0
+
+
+def test_preview_survives_provider_outage(fake_provider, client):
+    _, admin_token = create_user_and_token(client, "admin")
+    _, user_token = create_user_and_token(client, "user")
+    ids = []
+    for name, code in (("English", "en"), ("Russian", "ru")):
+        r = client.post(
+            "/api/v1/admin/languages",
+            json={"name": name, "code": code},
+            headers=auth_headers(admin_token),
+        )
+        ids.append(r.json()["id"])
+    fake_provider.status = 500
+
+    r = client.post(
+        "/api/v1/auto/preview",
+        json={"front": "cat", "source_language_id": ids[0], "target_language_id": ids[1]},
+        headers=auth_headers(user_token),
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["suggested_back"] is None
+
+    r = client.get("/api/v1/admin/providers/stats", headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    assert r.json()["mymemory"]["failures"] == 1
+
+
+def test_async_fetch_fails_fast_while_open(fake_provider):
+    breaker = auto_content.provider_breakers["mymemory"]
+    breaker._open()
+
+    with pytest.raises(auto_content.ProviderUnavailable):
+        asyncio.run(
+            auto_content.fetch_mymemory_translation_async(text="cat", src_code="en", tgt_code="ru")
+        )
+    assert fake_provider.calls == 0
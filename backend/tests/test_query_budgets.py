@@ -0,0 +1,167 @@
+"""SQL statement budgets for the hot endpoints.
+
+Budgets are the current count plus a little headroom: a failure here means a
+change added queries to a request (often one per item, an N+1). Each scenario
+uses more items than the per-item budget allows, so per-item queries cannot hide
+inside the headroom.
+"""
+
+import pytest
+
+from tests.conftest import (
+    add_card,
+    admin_create_language,
+    auth_headers,
+    create_user_and_token,
+    get_main_deck_id,
+)
+
+N = 12  # items per list; more than any max_repeats below
+
+
+@pytest.fixture()
+def world(client):
+    _, admin_token = create_user_and_token(client, "admin")
+    me, token = create_user_and_token(client, "reader")
+    en_id = admin_create_language(client, admin_token, "English", "en")
+    ru_id = admin_create_language(client, admin_token, "Russian", "ru")
+    deck_id = get_main_deck_id(client, token, en_id, ru_id)
+    headers = auth_headers(token)
+    pair_id = client.get("/api/v1/users/me/default-learning-pair", headers=headers).json()["id"]
+
+    source_ids = []
+    for i in range(N):
+        r = client.post(
+            "/api/v1/reading-sources",
+            json={"pair_id": pair_id, "title": f"Book {i}", "kind": "book"},
+            headers=headers,
+        )
+        assert r.status_code == 201, r.text
+        source_ids.append(r.json()["id"])
+
+    cards = []
+    for i in range(N):
+        r = client.post(
+            f"/api/v1/decks/{deck_id}/cards",
+            json={
+                "front": f"word{i}",
+                "back": f"слово{i}",
+                "example_sentence": f"A word{i}.",  # filled in: no provider lookups
+                "reading_source_id": source_ids[i],
+            },
+            headers=headers,
+        )
+        assert r.status_code == 201, r.text
+        cards.append(r.json())
+
+    r = client.post(
+        "/api/v1/library/admin/decks",
+        json={"name": "A1", "source_language_id": en_id, "target_language_id": ru_id},
+        headers=auth_headers(admin_token),
+    )
+    assert r.status_code == 200, r.text
+    library_deck_id = r.json()["id"]
+    library_cards = [
+        add_card(client, admin_token, library_deck_id, f"lib{i}", f"биб{i}", f"A lib{i}.")["id"]
+        for i in range(N)
+    ]
+
+    return {
+        "headers": headers,
+        "deck_id": deck_id,
+        "pair_id": pair_id,
+        "cards": cards,
+        "source_ids": source_ids,
+        "library_deck_id": library_deck_id,
+        "library_cards": library_cards,
+        "en_id": en_id,
+        "ru_id": ru_id,
+    }
+
+
+def _ok(r):
+    assert r.status_code < 300, r.text
+    return r
+
+
+@pytest.mark.parametrize(
+    "path, budget",
+    [
+        ("/api/v1/users/me", 2),
+        ("/api/v1/decks", 3),
+        ("/api/v1/decks/{deck_id}", 2),
+        ("/api/v1/decks/{deck_id}/cards", 6),
+        ("/api/v1/study/decks/{deck_id}/next", 15),
+        ("/api/v1/study/decks/{deck_id}/status", 8),
+        ("/api/v1/progress/summary", 14),
+        ("/api/v1/reading-sources?include_stats=true", 4),
+        ("/api/v1/reading-sources/{source_id}/detail", 9),
+        ("/api/v1/library/decks", 4),
+        ("/api/v1/library/decks/{library_deck_id}/cards", 4),
+    ],
+)
+def test_read_endpoint_budgets(client, world, query_budget, path, budget):
+    url = path.format(
+        deck_id=world["deck_id"],
+        source_id=world["source_ids"][0],
+        library_deck_id=world["library_deck_id"],
+    )
+    # every list above has N items: a per-item query would repeat N times
+    with query_budget(budget, max_repeats=2):
+        _ok(client.get(url, headers=world["headers"]))
+
+
+def test_study_answer_budget(client, world, query_budget):
+    card_id = world["cards"][0]["id"]
+    with query_budget(13, max_repeats=2):
+        _ok(client.post(f"/api/v1/study/{card_id}", json={"learned": True}, headers=world["headers"]))
+
+
+def test_login_budget(client, world, query_budget):
+    with query_budget(4, max_repeats=1):
+        _ok(client.post("/api/v1/auth/login", data={"username": "reader", "password": "pass1234"}))
+
+
+# Writes that create one card per item pay a fixed cost per card (access check,
+# duplicate check, INSERT, reload, SAVEPOINT/RELEASE); nothing may run more than
+# once per item.
+PER_CARD = 6
+
+
+def test_inbox_bulk_budget(client, world, query_budget):
+    text = "\n".join(f"bulk{i} - перевод{i}" for i in range(N))
+    text += "\nword0 - already in the deck"
+    with query_budget(8 + PER_CARD * N, max_repeats=N):
+        r = _ok(
+            client.post(
+                "/api/v1/inbox/bulk",
+                json={"text": text, "delimiter": "-"},
+                headers=world["headers"],
+            )
+        )
+    body = r.json()
+    assert body["created_count"] == N
+    assert body["duplicate_count"] == 1
+
+
+def test_library_import_selected_budget(client, world, query_budget):
+    with query_budget(20 + PER_CARD * N, max_repeats=N):
+        r = _ok(
+            client.post(
+                f"/api/v1/library/decks/{world['library_deck_id']}/import-selected",
+                json={"card_ids": world["library_cards"]},
+                headers=world["headers"],
+            )
+        )
+    assert r.json()["created_count"] == N
+
+    # everything is a duplicate the second time, found by one query
+    with query_budget(10, max_repeats=1):
+        r = _ok(
+            client.post(
+                f"/api/v1/library/decks/{world['library_deck_id']}/import-selected",
+                json={"card_ids": world["library_cards"]},
+                headers=world["headers"],
+            )
+        )
+    assert r.json()["duplicate_count"] == N
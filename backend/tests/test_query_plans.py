@@ -0,0 +1,165 @@
+"""Query-plan regression tests for the study and progress queries (``pytest --plans``).
+
+Seeds a dataset large enough for the planner to prefer indexes over scans, runs
+each crud function, and EXPLAINs every SELECT it issued. A test fails when a plan
+sequentially scans ``cards`` or ``user_card_progress``, reads more than one
+partition of ``user_card_progress``, or when its estimated total cost exceeds
+the recorded baseline (query_plan_baselines.json) by more than COST_TOLERANCE.
+After an intended change, re-record the baselines with
+``pytest --plans --update-plan-baselines tests/test_query_plans.py``.
+"""
+
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base
+from app.tools.seed import SeedSpec, seed_dataset, seeded_users
+
+pytestmark = pytest.mark.plans
+
+BASELINES = Path(__file__).with_name("query_plan_baselines.json")
+# estimates move with ANALYZE's sampling; a real regression is usually far larger
+COST_TOLERANCE = 1.5
+NO_SEQ_SCAN = {"cards", "user_card_progress"}
+PARTITION_RE = re.compile(r"^(user_card_progress)_p\d+$")
+
+# every user is a small share of the tables, as in production
+SPEC = SeedSpec(
+    seed=47,
+    users=1500,
+    cards_per_user=120,
+    heavy_users=1,
+    cards_per_heavy_user=4000,
+    library_decks=1,
+    cards_per_library_deck=200,
+    history_days=60,
+    today=date.today(),  # due dates are relative to now
+)
+
+CASES = {
+    "get_due_reviews": lambda db, u: crud.get_due_reviews(db, u["deck_id"], u["id"], 20, 0),
+    "get_new_cards": lambda db, u: crud.get_new_cards(db, u["deck_id"], u["id"], None, 20, 0),
+    "count_due_reviews": lambda db, u: crud.count_due_reviews(db, u["id"], deck_id=u["deck_id"]),
+    "count_due_reviews_pair": lambda db, u: crud.count_due_reviews(
+        db, u["id"], pair_id=u["pair_id"]
+    ),
+    "count_new_available": lambda db, u: crud.count_new_available(
+        db, u["id"], deck_id=u["deck_id"]
+    ),
+    "count_new_available_pair": lambda db, u: crud.count_new_available(
+        db, u["id"], pair_id=u["pair_id"]
+    ),
+    "get_next_due_at": lambda db, u: crud.get_next_due_at(db, u["id"], deck_id=u["deck_id"]),
+    "count_progress_statuses": lambda db, u: crud.count_progress_statuses(
+        db, u["id"], deck_id=u["deck_id"]
+    ),
+    "count_progress_statuses_pair": lambda db, u: crud.count_progress_statuses(
+        db, u["id"], pair_id=u["pair_id"]
+    ),
+    "list_deck_cards": lambda db, u: crud.list_deck_cards(db, u["deck_id"], u["id"], 50, 100),
+    # srs reads and updates the answered card's row through this
+    "get_user_card_progress": lambda db, u: crud.get_user_card_progress(
+        db, u["id"], u["first_card_id"]
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    try:
+        seed_dataset(SPEC, bind=engine, log=lambda msg: None)
+        with engine.connect() as conn:
+            users = {
+                "light": seeded_users(conn, SPEC.seed, heavy=False)[0],
+                "heavy": seeded_users(conn, SPEC.seed, heavy=True)[0],
+            }
+            for user in users.values():
+                user["pair_id"] = conn.execute(
+                    text("SELECT id FROM user_learning_pairs WHERE user_id = :u"),
+                    {"u": user["id"]},
+                ).scalar()
+        yield engine, users
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@contextmanager
+def _statements(engine):
+    captured = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _relation(node: dict) -> str | None:
+    """The table a scan node reads; partitions are reported as their parent."""
+    name = node.get("Relation Name")
+    return PARTITION_RE.sub(r"\1", name) if name else None
+
+
+def _explain(db: Session, statement: str, parameters) -> dict:
+    result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    return result.scalar()[0]["Plan"]
+
+
+@pytest.mark.parametrize("kind", ["light", "heavy"])
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_plan(seeded, case, kind, request):
+    engine, users = seeded
+    with Session(engine) as db:
+        with _statements(engine) as captured:
+            CASES[case](db, users[kind])
+        selects = [(s, p) for s, p in captured if s.lstrip().upper().startswith("SELECT")]
+        plans = [(s, _explain(db, s, p)) for s, p in selects]
+    assert plans
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    costs = {f"{case}[{kind}]#{i}": plan["Total Cost"] for i, (_, plan) in enumerate(plans)}
+    if request.config.getoption("--update-plan-baselines"):
+        baselines = {k: v for k, v in baselines.items() if not k.startswith(f"{case}[{kind}]#")}
+        baselines.update({k: round(v, 2) for k, v in costs.items()})
+        BASELINES.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+
+    for (statement, plan), (key, cost) in zip(plans, costs.items()):
+        scans = {
+            _relation(node)
+            for node in _nodes(plan)
+            if node["Node Type"] == "Seq Scan" and _relation(node) in NO_SEQ_SCAN
+        }
+        assert not scans, f"{key}: sequential scan on {scans}\n{statement}\n{json.dumps(plan)}"
+        partitions = {
+            node["Relation Name"]
+            for node in _nodes(plan)
+            if PARTITION_RE.match(node.get("Relation Name") or "")
+        }
+        assert len(partitions) <= 1, f"{key}: not pruned, reads {sorted(partitions)}\n{statement}"
+        assert key in baselines, f"{key}: no baseline (record with --update-plan-baselines)"
+        assert cost <= baselines[key] * COST_TOLERANCE, (
+            f"{key}: estimated cost {cost:.0f} > baseline {baselines[key]:.0f}"
+            f" x {COST_TOLERANCE}\n{statement}"
+        )
@@ -0,0 +1,154 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+import slowapi.extension
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from limits.storage import MemoryStorage
+from prometheus_client import REGISTRY
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from starlette.requests import Request
+
+from app.config import settings
+from app.core.rate_limit import build_limiter, limiter, user_key
+from app.services.security import create_access_token
+from tests.conftest import (
+    admin_create_language,
+    auth_headers,
+    create_user_and_token,
+    set_default_languages,
+)
+
+
+@pytest.fixture()
+def real_keys(monkeypatch):
+    # the test env randomizes limiter keys so limits never trip; turn that off here
+    monkeypatch.setattr(settings, "app_env", "development")
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+def _request(headers: dict) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw, "client": ("10.0.0.7", 1234)})
+
+
+def test_user_key_prefers_token_user_id(real_keys):
+    token = create_access_token(subject="alice", user_id=42)
+    assert user_key(_request({"Authorization": f"Bearer {token}"})) == "user:42"
+    assert user_key(_request({"Authorization": "Bearer nonsense"})) == "10.0.0.7"
+    assert user_key(_request({})) == "10.0.0.7"
+
+
+def test_limiter_uses_configured_strategy():
+    assert settings.rate_limit_strategy == "moving-window"
+    assert type(limiter.limiter).__name__ == "MovingWindowRateLimiter"
+
+
+def test_bulk_import_is_limited_per_user(client, real_keys, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_inbox_bulk", "2/minute")
+    _, admin_token = create_user_and_token(client, "admin")
+    en_id = admin_create_language(client, admin_token, "English", "en")
+    ru_id = admin_create_language(client, admin_token, "Russian", "ru")
+    tokens = {}
+    for name in ("alice", "bob"):
+        _, tokens[name] = create_user_and_token(client, name)
+        set_default_languages(client, tokens[name], en_id, ru_id)
+
+    def bulk(name):
+        return client.post(
+            "/api/v1/inbox/bulk",
+            json={"text": "cat - кот", "dry_run": True},
+            headers=auth_headers(tokens[name]),
+        ).status_code
+
+    # same client IP for everyone: only the per-user key tells them apart
+    assert [bulk("alice") for _ in range(3)] == [201, 201, 429]
+    assert bulk("bob") == 201
+
+
+class StandInStorage(MemoryStorage):
+    """A shared store for the tests: in memory, but it can be taken down."""
+
+    STORAGE_SCHEME = ["standin"]
+
+    def __init__(self, uri: str, **options):
+        super().__init__(uri, **options)
+        self.down = False
+        self.calls = 0
+
+    def _reachable(self):
+        if self.down:
+            raise ConnectionError("stand-in store is down")
+        self.calls += 1
+
+    def acquire_entry(self, *args, **kwargs):
+        self._reachable()
+        return super().acquire_entry(*args, **kwargs)
+
+    def get_moving_window(self, *args, **kwargs):
+        self._reachable()
+        return super().get_moving_window(*args, **kwargs)
+
+    def check(self):
+        return not self.down
+
+
+def _limited_app(memory_fallback: bool) -> tuple[TestClient, StandInStorage]:
+    app_limiter = build_limiter(
+        "standin://", strategy="moving-window", memory_fallback=memory_fallback
+    )
+    app = FastAPI()
+    app.state.limiter = app_limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.get("/ping")
+    @app_limiter.limit("2/minute")
+    def ping(request: Request):
+        return {"ok": True}
+
+    return TestClient(app, raise_server_exceptions=False), app_limiter._storage
+
+
+def _logged(caplog) -> list[tuple[str, str]]:
+    return [
+        (r.levelname, r.getMessage()) for r in caplog.records if r.name == "app.core.rate_limit"
+    ]
+
+
+def _fallbacks() -> float:
+    return REGISTRY.get_sample_value("rate_limit_storage_fallbacks_total") or 0.0
+
+
+def test_shared_store_fallback_is_logged_counted_and_recovers(real_keys, monkeypatch, caplog):
+    client, store = _limited_app(memory_fallback=True)
+    assert isinstance(store, StandInStorage)
+    assert [client.get("/ping").status_code for _ in range(3)] == [200, 200, 429]
+    assert store.calls > 0
+
+    store.down = True
+    before = _fallbacks()
+    with caplog.at_level(logging.WARNING):
+        # a fresh per-process window: the two hits on the shared store are not seen
+        assert [client.get("/ping").status_code for _ in range(3)] == [200, 200, 429]
+    assert _fallbacks() == before + 1
+    assert [level for level, _ in _logged(caplog)] == ["ERROR"]
+
+    # slowapi probes the store again with a backoff; jump past it
+    store.down = False
+    monkeypatch.setattr(slowapi.extension, "time", SimpleNamespace(time=lambda: 1e12))
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        assert client.get("/ping").status_code == 429  # the shared window again
+    assert _logged(caplog) == [("WARNING", "Rate limit storage recovered")]
+
+
+def test_without_memory_fallback_an_unreachable_store_fails_requests(real_keys):
+    client, store = _limited_app(memory_fallback=False)
+    store.down = True
+    before = _fallbacks()
+    assert client.get("/ping").status_code == 500
+    assert _fallbacks() == before
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from sqlalchemy import text
+from starlette.requests import Request
+
+from app import database
+from app.config import settings
+from app.core import read_routing
+from app.services.security import create_access_token
+from tests.conftest import auth_headers, create_user_and_token
+
+
+@pytest.fixture()
+def with_replica(monkeypatch):
+    # only the routing decision is under test; no replica engine is created
+    monkeypatch.setattr(settings, "database_replica_url", "postgresql://replica/deeplex")
+
+
+def _request(headers: dict | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_read_sessions_are_read_only():
+    gen = database.get_read_db(_request())
+    db = next(gen)
+    try:
+        assert db.execute(text("SHOW transaction_read_only")).scalar() == "on"
+    finally:
+        gen.close()
+
+    # the primary session on the same pool is not affected
+    with database.SessionLocal() as db:
+        assert db.execute(text("SHOW transaction_read_only")).scalar() == "off"
+
+
+def test_recent_writers_read_from_primary(with_replica, monkeypatch):
+    token = create_access_token(subject="alice", user_id=7)
+    alice = _request({"Authorization": f"Bearer {token}"})
+
+    assert read_routing.use_replica(alice)
+    read_routing.note_write(7)
+    assert not read_routing.use_replica(alice)
+    assert read_routing.use_replica(_request())
+
+    later = time.monotonic() + settings.db_read_your_writes_seconds + 1
+    monkeypatch.setattr(read_routing._recent_writers, "_clock", lambda: later)
+    assert read_routing.use_replica(alice)
+
+
+def test_no_replica_means_primary():
+    assert not read_routing.use_replica(_request())
+
+
+def test_successful_writes_are_tracked(client, with_replica):
+    me, token = create_user_and_token(client, "writer")
+    # registration carries no bearer token; reads alone do not count
+    assert not read_routing.wrote_recently(me["id"])
+
+    r = client.put(
+        "/api/v1/users/me/goals",
+        json={"daily_card_target": 0, "daily_new_target": 5},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 422, r.text
+    assert not read_routing.wrote_recently(me["id"])
+
+    r = client.put(
+        "/api/v1/users/me/goals",
+        json={"daily_card_target": 25, "daily_new_target": 5},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    assert read_routing.wrote_recently(me["id"])
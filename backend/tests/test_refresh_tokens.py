@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app import models
+from app.config import settings
+from app.services.refresh_tokens import delete_stale_tokens
+from tests.conftest import register
+
+
+def _login(client, username="user", password="pass1234") -> dict:
+    r = client.post("/api/v1/auth/login-json", json={"username": username, "password": password})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _tokens(db_session):
+    db_session.expire_all()
+    return db_session.query(models.RefreshToken).order_by(models.RefreshToken.id).all()
+
+
+def test_active_tokens_are_capped_per_user(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "refresh_token_max_active_per_user", 3)
+    register(client, "user")
+    logins = [_login(client) for _ in range(4)]
+
+    tokens = _tokens(db_session)
+    assert len(tokens) == 5
+    assert [t.revoked_at is None for t in tokens] == [False, False, True, True, True]
+
+    # the capped-out sessions can no longer refresh; the newest still can
+    r = client.post("/api/v1/auth/refresh", json={"refresh_token": logins[0]["refresh_token"]})
+    assert r.status_code == 401
+    assert r.json()["detail"] == "Refresh token revoked"
+    r = client.post("/api/v1/auth/refresh", json={"refresh_token": logins[-1]["refresh_token"]})
+    assert r.status_code == 200, r.text
+    assert sum(t.revoked_at is None for t in _tokens(db_session)) == 3
+
+
+def test_cleanup_deletes_expired_and_old_revoked_in_batches(client, db_session):
+    register(client, "user")
+    user = db_session.query(models.User).filter_by(username="user").one()
+    now = datetime.now(timezone.utc)
+    rows = (
+        [("expired", now - timedelta(days=1), None)] * 7
+        + [("old-revoked", now + timedelta(days=1), now - timedelta(days=30))] * 3
+        + [("fresh-revoked", now + timedelta(days=1), now - timedelta(hours=1))] * 2
+    )
+    for n, (kind, expires_at, revoked_at) in enumerate(rows):
+        db_session.add(
+            models.RefreshToken(
+                user_id=user.id,
+                jti=f"{kind}-{n}",
+                token_hash=f"{n:064d}",
+                expires_at=expires_at,
+                revoked_at=revoked_at,
+            )
+        )
+    db_session.commit()
+
+    deleted = delete_stale_tokens(db_session, batch_size=4, revoked_retention=timedelta(days=7))
+    assert deleted == 10
+
+    # the registration token and the recently revoked rows stay
+    left = _tokens(db_session)
+    assert len(left) == 3
+    assert sum(t.jti.startswith("fresh-revoked-") for t in left) == 2
+
+
+def test_active_token_indexes_are_partial(db_session):
+    defs = dict(
+        db_session.execute(
+            text("SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'refresh_tokens'")
+        ).all()
+    )
+    for name in ("ix_refresh_tokens_active_token_hash", "ix_refresh_tokens_active_user_created"):
+        assert defs[name].endswith("WHERE (revoked_at IS NULL)"), defs[name]
+    assert "ix_refresh_tokens_token_hash" not in defs
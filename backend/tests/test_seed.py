@@ -0,0 +1,81 @@
+from dataclasses import replace
+from datetime import date
+
+from sqlalchemy import text
+
+from app.tools.seed import (
+    SEED_PASSWORD,
+    SeedSpec,
+    iter_rows,
+    plan_layout,
+    seed_dataset,
+    seeded_users,
+)
+from tests.conftest import auth_headers, login
+
+SPEC = SeedSpec(
+    seed=7,
+    users=6,
+    cards_per_user=40,
+    heavy_users=1,
+    cards_per_heavy_user=120,
+    library_decks=1,
+    cards_per_library_deck=10,
+    history_days=30,
+    today=date(2026, 1, 15),
+)
+
+CONSTRAINTS_AND_INDEXES = """
+    SELECT (SELECT count(*) FROM pg_constraint WHERE connamespace = current_schema()::regnamespace)
+         + (SELECT count(*) FROM pg_indexes WHERE schemaname = current_schema())
+"""
+
+
+def _rows(conn, spec):
+    layout = plan_layout(conn, spec)
+    tables = ("cards", "user_card_progress", "daily_progress")
+    return {table: list(iter_rows(spec, layout, table, "hash")) for table in tables}
+
+
+def test_rows_are_deterministic_per_seed(db_session):
+    with db_session.get_bind().connect() as conn:
+        first = _rows(conn, SPEC)
+        again = _rows(conn, SPEC)
+        other = _rows(conn, replace(SPEC, seed=8))
+
+    assert first == again
+    assert first["cards"] != other["cards"]
+    statuses = {row[5] for row in first["user_card_progress"]}
+    assert statuses == {"new", "learning", "mastered"}
+
+
+def test_seed_loads_a_usable_dataset(client, db_session):
+    bind = db_session.get_bind()
+    with bind.connect() as conn:
+        before = conn.execute(text(CONSTRAINTS_AND_INDEXES)).scalar()
+
+    counts = seed_dataset(SPEC, bind=bind, batch_size=50, log=lambda msg: None)
+
+    assert counts["users"] == 1 + SPEC.users + SPEC.heavy_users
+    assert counts["cards"] > SPEC.users * SPEC.cards_per_user // 2
+    with bind.connect() as conn:
+        # deferred indexes and constraints are all back
+        assert conn.execute(text(CONSTRAINTS_AND_INDEXES)).scalar() == before
+        users = seeded_users(conn, SPEC.seed)
+    assert len(users) == SPEC.users + SPEC.heavy_users
+
+    heavy = next(u for u in users if u["username"] == "seed7-h0")
+    assert heavy["last_card_id"] - heavy["first_card_id"] + 1 == SPEC.cards_per_heavy_user
+    token = login(client, "seed7-h0", SEED_PASSWORD)
+    r = client.get(f"/api/v1/study/decks/{heavy['deck_id']}/next", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert r.json()["cards"]
+
+    # sequences continue after the seeded ids
+    r = client.post(
+        f"/api/v1/decks/{heavy['deck_id']}/cards",
+        json={"front": "fresh", "back": "новое", "example_sentence": "A fresh card."},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 201, r.text
+    assert r.json()["id"] > heavy["last_card_id"]
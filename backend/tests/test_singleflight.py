@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.singleflight import AsyncSingleFlight, SingleFlight
+from app.services import auto_content
+
+
+def test_singleflight_threads_share_one_call():
+    flight = SingleFlight()
+    calls = {"n": 0}
+    results = []
+    start = threading.Barrier(8)
+
+    def slow():
+        calls["n"] += 1
+        time.sleep(0.2)
+        return "кот"
+
+    def worker():
+        start.wait()
+        results.append(flight.do(("en", "ru", "cat"), slow))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls["n"] == 1
+    assert results == ["кот"] * 8
+    assert flight.in_flight() == 0
+
+
+def test_singleflight_propagates_errors_to_waiters():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    # nothing is remembered after the call completes
+    assert flight.do("k", lambda: 42) == 42
+
+
+def test_async_singleflight_coalesces_concurrent_coroutines():
+    flight = AsyncSingleFlight()
+    calls = {"n": 0}
+
+    async def slow():
+        calls["n"] += 1
+        await asyncio.sleep(0.05)
+        return "кот"
+
+    async def run():
+        return await asyncio.gather(*[flight.do("cat", slow) for _ in range(10)])
+
+    assert asyncio.run(run()) == ["кот"] * 10
+    assert calls["n"] == 1
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_previews_share_provider_call(client, db_session, monkeypatch):
+    en = models.Language(name="English", code="en")
+    ru = models.Language(name="Russian", code="ru")
+    db_session.add_all([en, ru])
+    db_session.commit()
+
+    calls = {"tr": 0, "ex": 0}
+
+    async def fake_tr_async(*, text: str, src_code: str, tgt_code: str):
+        calls["tr"] += 1
+        await asyncio.sleep(0.05)
+        return "кот"
+
+    async def fake_ex_async(*, query: str, src_code: str, tgt_code: str):
+        calls["ex"] += 1
+        await asyncio.sleep(0.05)
+        return "The cat.\nКот."
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation_async", fake_tr_async)
+    monkeypatch.setattr(auto_content, "fetch_tatoeba_example_async", fake_ex_async)
+
+    # cache lookups run in worker threads, so each preview gets its own session
+    db_session.refresh(en)
+    db_session.refresh(ru)
+    sessions = [Session(bind=db_session.get_bind()) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                auto_content.get_preview_no_save_async(
+                    session, src_lang=en, tgt_lang=ru, text_raw=text
+                )
+                for session, text in zip(sessions, ("cat", "Cat", " cat "))
+            ]
+        )
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        for session in sessions:
+            session.close()
+
+    assert calls == {"tr": 1, "ex": 1}
+    assert all(r["translation"] == "кот" for r in results)
+
+
+def test_sync_flight_leader_saves_and_waiters_warm_memory(client, db_session, monkeypatch):
+    en = models.Language(name="English", code="en")
+    ru = models.Language(name="Russian", code="ru")
+    db_session.add_all([en, ru])
+    db_session.commit()
+
+    calls = {"tr": 0}
+    start = threading.Barrier(4)
+
+    def slow_tr(*, text: str, src_code: str, tgt_code: str):
+        calls["tr"] += 1
+        time.sleep(0.2)
+        return "кот"
+
+    monkeypatch.setattr(auto_content, "fetch_mymemory_translation", slow_tr)
+    db_session.refresh(en)  # load attributes here, not concurrently from the workers
+    db_session.refresh(ru)
+    results = []
+
+    def worker(text):
+        with Session(bind=db_session.get_bind()) as db:
+            start.wait()
+            results.append(
+                auto_content.get_translation_with_cache(db, src_lang=en, tgt_lang=ru, text_raw=text)
+            )
+            db.commit()
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in ("cat", "Cat", " cat", "CAT")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls["tr"] == 1
+    assert results == ["кот"] * 4
+    assert db_session.query(models.TranslationCache).count() == 1
+    # no waiter invalidated the leader's entry
+    assert auto_content.translation_memory.peek((en.id, ru.id, "cat")) == ("кот", "mymemory")
+
+
+def test_save_translation_cache_is_an_upsert(client, db_session):
+    en = models.Language(name="English", code="en")
+    ru = models.Language(name="Russian", code="ru")
+    db_session.add_all([en, ru])
+    db_session.commit()
+
+    for translation in ("кот", "кошка"):
+        auto_content.save_translation_cache(
+            db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="cat", translation=translation
+        )
+    db_session.commit()
+
+    rows = db_session.query(models.TranslationCache).all()
+    assert len(rows) == 1
+    assert rows[0].translated_text == "кот"
+    assert (
+        auto_content.find_cached_translation(
+            db_session, src_lang_id=en.id, tgt_lang_id=ru.id, text_raw="cat"
+        )
+        == "кот"
+    )
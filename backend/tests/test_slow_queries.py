@@ -0,0 +1,76 @@
+import os
+
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.core.slow_queries import SlowQueryLog, _explain, slow_query_log
+from tests.conftest import admin_create_language, auth_headers, create_user_and_token
+
+
+def test_log_keeps_the_slowest_fingerprints(monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_log_size", 2)
+    log = SlowQueryLog()
+    log.record("SELECT * FROM a WHERE id = 1", "(1,)", "GET /a", 5.0)
+    log.record("SELECT * FROM b WHERE id = 1", "(1,)", "GET /b", 10.0)
+    assert log.record("SELECT * FROM c", "()", None, 1.0) is None  # faster than both
+
+    log.record("SELECT * FROM a WHERE id = 2", "(2,)", "GET /a2", 30.0)  # same fingerprint
+    log.record("SELECT * FROM d", "()", None, 20.0)  # evicts b
+
+    entries = log.entries()
+    assert [e.max_ms for e in entries] == [30.0, 20.0]
+    a = entries[0]
+    assert a.fingerprint == "SELECT * FROM a WHERE id = ?"
+    assert (a.count, a.total_ms, a.route, a.parameters) == (2, 35.0, "GET /a2", "(2,)")
+
+
+def test_slow_statements_of_requests_are_captured_with_plans(client, monkeypatch):
+    _, admin_token = create_user_and_token(client, "admin")
+    _, token = create_user_and_token(client, "slowpoke")
+    en_id = admin_create_language(client, admin_token, "English", "en")
+    ru_id = admin_create_language(client, admin_token, "Russian", "ru")
+    client.put(
+        "/api/v1/users/me/languages",
+        json={"default_source_language_id": en_id, "default_target_language_id": ru_id},
+        headers=auth_headers(token),
+    )
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.001)
+    monkeypatch.setattr(settings, "slow_query_explain", True)
+
+    # an async (asyncpg) and a sync (psycopg2) endpoint
+    assert client.get("/api/v1/progress/summary", headers=auth_headers(token)).status_code == 200
+    assert client.get("/api/v1/decks", headers=auth_headers(token)).status_code == 200
+    create_user_and_token(client, "late-joiner", "secret-pass")
+
+    entries = slow_query_log.entries()
+    routes = {e.route for e in entries}
+    assert {"GET /api/v1/progress/summary", "GET /api/v1/decks"} <= routes
+    selects = [e for e in entries if e.statement.lstrip().upper().startswith("SELECT")]
+    assert selects and all(e.plan and "Plan" in e.plan[0] for e in selects)
+    insert = next(e for e in entries if e.statement.startswith("INSERT INTO users"))
+    assert "'***'" in insert.parameters and "$2b$" not in insert.parameters
+
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    r = client.get("/api/v1/admin/db/slow-queries", headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert len(body) == len(entries)
+    assert body[0]["max_ms"] >= body[-1]["max_ms"]
+    assert client.get(
+        "/api/v1/admin/db/slow-queries", headers=auth_headers(token)
+    ).status_code == 403
+
+    r = client.delete("/api/v1/admin/db/slow-queries", headers=auth_headers(admin_token))
+    assert r.status_code == 204
+    assert slow_query_log.entries() == []
+
+
+def test_failed_explain_leaves_the_transaction_usable(db_session):
+    engine = create_engine(os.environ["DATABASE_URL"])
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+            assert _explain(conn, "SELECT * FROM no_such_table", {}) is None
+            assert conn.execute(text("SELECT 2")).scalar() == 2
+    finally:
+        engine.dispose()
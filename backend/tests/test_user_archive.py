@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+
+from app import models
+from app.services.user_archive import ARCHIVED_TABLES, archive_dormant_users
+from tests.conftest import auth_headers, login
+
+
+def _study(client, token, cards, learned=True):
+    for card in cards:
+        r = client.post(
+            f"/api/v1/study/{card['id']}", json={"learned": learned}, headers=auth_headers(token)
+        )
+        assert r.status_code == 200, r.text
+
+
+def _make_dormant(db, user_id: int, days: int = 400) -> None:
+    then = datetime.utcnow() - timedelta(days=days)
+    params = {"u": user_id, "then": then}
+    db.execute(text("UPDATE users SET created_at = :then WHERE id = :u"), params)
+    db.execute(text("UPDATE user_card_progress SET last_review = :then WHERE user_id = :u"), params)
+    db.execute(text("UPDATE daily_progress SET date = :then WHERE user_id = :u"), params)
+    db.execute(text("UPDATE refresh_tokens SET created_at = :then WHERE user_id = :u"), params)
+    db.commit()
+
+
+def _rows(db, user_id: int) -> dict:
+    return {
+        table.name: db.execute(
+            select(table).where(table.c.user_id == user_id).order_by(table.c.id)
+        ).all()
+        for table in ARCHIVED_TABLES
+    }
+
+
+def test_dormant_rows_are_archived_and_restored_on_the_next_request(
+    client, db_session, make_deck_with_cards, user_token
+):
+    deck_id, cards = make_deck_with_cards(n=3)
+    _study(client, user_token, cards)
+    user_id = db_session.execute(text("SELECT id FROM users WHERE username = 'user'")).scalar()
+    _make_dormant(db_session, user_id)
+    before = _rows(db_session, user_id)
+    assert all(before.values())
+
+    counts = archive_dormant_users(db_session, dormant_days=365, log=lambda msg: None)
+    assert counts == {"users": 1, "rows": sum(len(rows) for rows in before.values())}
+    assert not any(_rows(db_session, user_id).values())
+    archive = db_session.get(models.UserArchive, user_id)
+    assert archive.row_count == counts["rows"]
+    # the admin is not dormant
+    assert db_session.execute(text("SELECT count(*) FROM user_archives")).scalar() == 1
+
+    # an async endpoint (get_current_user_async) brings everything back unchanged
+    r = client.get("/api/v1/progress/summary", headers=auth_headers(user_token))
+    assert r.status_code == 200, r.text
+    db_session.expire_all()
+    assert _rows(db_session, user_id) == before
+    assert db_session.get(models.UserArchive, user_id) is None
+    assert db_session.get(models.User, user_id).archived_at is None
+
+    # restoring is not activity: without a study or login since, the user is dormant again
+    assert archive_dormant_users(db_session, dormant_days=365, log=lambda msg: None)["users"] == 1
+
+    # a card deleted while the user was archived loses its progress row on restore
+    db_session.execute(text("DELETE FROM cards WHERE id = :c"), {"c": cards[0]["id"]})
+    db_session.commit()
+    r = client.get(f"/api/v1/study/decks/{deck_id}/status", headers=auth_headers(user_token))
+    assert r.status_code == 200, r.text
+    db_session.expire_all()
+    progress = _rows(db_session, user_id)["user_card_progress"]
+    assert sorted(p.card_id for p in progress) == sorted(c["id"] for c in cards[1:])
+
+
+def test_login_restores_and_active_users_stay(client, db_session):
+    r = client.post("/api/v1/auth/register", json={"username": "sleeper", "password": "1234"})
+    assert r.status_code == 201, r.text
+    r = client.post("/api/v1/auth/register", json={"username": "regular", "password": "1234"})
+    assert r.status_code == 201, r.text
+    sleeper = db_session.execute(text("SELECT id FROM users WHERE username = 'sleeper'")).scalar()
+    _make_dormant(db_session, sleeper)
+    regular = db_session.execute(text("SELECT id FROM users WHERE username = 'regular'")).scalar()
+    db_session.execute(
+        text("UPDATE users SET created_at = :then WHERE id = :u"),
+        {"u": regular, "then": datetime.utcnow() - timedelta(days=400)},
+    )
+    db_session.commit()
+
+    counts = archive_dormant_users(db_session, dormant_days=365, log=lambda msg: None)
+    assert counts == {"users": 1, "rows": 1}  # the sleeper's refresh token
+    db_session.expire_all()
+
+    login(client, "sleeper")
+    db_session.expire_all()
+    assert db_session.get(models.User, sleeper).archived_at is None
+    assert db_session.execute(
+        text("SELECT count(*) FROM refresh_tokens WHERE user_id = :u"), {"u": sleeper}
+    ).scalar() == 2